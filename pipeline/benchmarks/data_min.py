@@ -0,0 +1,60 @@
+"""
+Compare dist/<vendor>/data.json with its columnar data.min.json:
+file size and json.loads time, plus a decode round-trip check.
+
+Run from pipeline/ after `main.py dist`:
+
+    uv run python -m benchmarks.data_min
+"""
+
+import json
+import time
+from pathlib import Path
+
+import click
+
+from utils.blob_store import HASHES
+from utils.columnar import decode
+
+DIST_DIR = Path(__file__).parent.parent.parent / "dist"
+
+
+def _best_load(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option("--repeat", type=int, default=7, show_default=True)
+def main(repeat: int):
+    """
+    Print size and parse-time ratios of data.json vs data.min.json per vendor.
+    """
+    click.echo(
+        f"{'vendor':<16} {'data.json':>10} {'min':>9} {'size':>6} "
+        f"{'parse ms':>9} {'min ms':>7} {'parse':>6}"
+    )
+    # The table data.min.json blob indexes point into (`dist --dedupe` only)
+    hashes_path = DIST_DIR / "blobs" / HASHES
+    blob_table = json.loads(hashes_path.read_text()) if hashes_path.exists() else None
+    for full_path in sorted(DIST_DIR.glob("*/data.json")):
+        min_path = full_path.with_name("data.min.json")
+        if not min_path.exists():
+            continue
+        full, mini = full_path.read_text(), min_path.read_text()
+        if decode(json.loads(mini), blob_table) != json.loads(full):
+            click.echo(f"{full_path.parent.name}: data.min.json does not decode to data.json", err=True)
+        t_full, t_min = _best_load(full, repeat), _best_load(mini, repeat)
+        click.echo(
+            f"{full_path.parent.name:<16} {len(full):>10} {len(mini):>9} "
+            f"{len(full) / len(mini):>5.1f}x {t_full * 1e3:>9.2f} {t_min * 1e3:>7.2f} "
+            f"{t_full / t_min:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compare `DistCatalog` (utils/dist_catalog.py) with loading every
+dist/<vendor>/data.json through `json.load`: load time and memory kept
+(tracemalloc) for all vendors, the cost of touching one vendor, and lookups by
+name and properties. Every entry is checked against data.json.
+
+Run from pipeline/ after `main.py dist`:
+
+    uv run python -m benchmarks.dist_catalog
+"""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+
+from utils.dist_catalog import DistCatalog
+
+DIST_DIR = Path(__file__).parent.parent.parent / "dist"
+
+
+def _measure(load):
+    """
+    (result, seconds, bytes still allocated afterwards); memory is traced in a
+    second run so tracemalloc does not slow down the timed one.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, kept
+
+
+def _naive():
+    packages = {}
+    for path in sorted(DIST_DIR.glob("*/data.json")):
+        with open(path) as f:
+            packages[path.parent.name] = json.load(f)
+    return packages
+
+
+def _catalog(vendors=None):
+    catalog = DistCatalog(DIST_DIR)
+    for vendor in vendors or catalog.vendors:
+        catalog[vendor]
+    return catalog
+
+
+@click.command()
+@click.option("--lookups", type=int, default=2000, show_default=True)
+@click.option("--seed", type=int, default=0)
+def main(lookups: int, seed: int):
+    """
+    Print load time and retained memory of both approaches; exit 1 if any
+    catalog entry differs from data.json.
+    """
+    packages, t_naive, m_naive = _measure(_naive)
+    if not packages:
+        raise click.ClickException(f"No data.json under {DIST_DIR}; run `main.py dist` first.")
+    catalog, t_cat, m_cat = _measure(_catalog)
+    _, t_one, m_one = _measure(lambda: _catalog(["heroicons"]))
+    files = sum(len(pkg["files"]) for pkg in packages.values())
+    click.echo(f"{files} files in {len(packages)} vendors")
+    click.echo(f"{'':<22} {'load ms':>9} {'kept MiB':>9}")
+    click.echo(f"{'json.load data.json':<22} {t_naive * 1e3:>9.1f} {m_naive / 2**20:>9.2f}")
+    click.echo(f"{'DistCatalog (all)':<22} {t_cat * 1e3:>9.1f} {m_cat / 2**20:>9.2f}")
+    click.echo(f"{'DistCatalog (heroicons)':<22} {t_one * 1e3:>9.1f} {m_one / 2**20:>9.2f}")
+
+    wrong = 0
+    for vendor, pkg in packages.items():
+        expected = [{k: v for k, v in e.items() if k != "geometry"} for e in pkg["files"]]
+        if [e.as_dict() for e in catalog[vendor]] != expected:
+            wrong += 1
+            click.echo(f"{vendor}: entries differ from data.json", err=True)
+
+    rng = random.Random(seed)
+    sample = [
+        (vendor, rng.choice(pkg["files"]))
+        for vendor, pkg in rng.choices(list(packages.items()), k=lookups)
+        if pkg["files"]
+    ]
+    start = time.perf_counter()
+    for vendor, entry in sample:
+        found = next(
+            e for e in packages[vendor]["files"]
+            if e["name"] == entry["name"] and e["properties"] == entry["properties"]
+        )
+    t_scan = time.perf_counter() - start
+    start = time.perf_counter()
+    for vendor, entry in sample:
+        found = catalog.get(vendor, entry["name"], **entry["properties"])
+    t_get = time.perf_counter() - start
+    assert found is not None
+    click.echo(
+        f"{len(sample)} lookups by name and properties: list scan {t_scan / len(sample) * 1e6:.1f} us, "
+        f"DistCatalog.get {t_get / len(sample) * 1e6:.1f} us"
+    )
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Check and time the phosphor `icons.ts` parser (`vendor_phosphor_icons._parse_icons_ts`)
+against the regex parser it replaced, on a synthetic file or a real checkout:
+
+    uv run python -m benchmarks.icons_ts --entries 50000
+    uv run python -m benchmarks.icons_ts --file ../vendor/phosphor-icons/src/icons.ts
+
+Every entry must match the legacy output, except where the legacy parser was
+wrong: it cut entries short at the `}` of a nested `alias: { ... }` (losing the
+fields after it) and split quoted tags on commas. Those are counted separately;
+any other difference exits 1. Before timing, a small fixture with both cases is
+parsed and must give exactly `FIXTURE_RECORDS`, otherwise this exits 1 as well.
+"""
+
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import click
+
+from benchmarks.synthetic import icon_names, phosphor_icons_ts
+from vendor_phosphor_icons import _parse_icons_ts
+
+
+FIXTURE = """\
+import { IconCategory } from "./types";
+
+export const icons = <const>[
+  {
+    name: "address-book",
+    alias: { name: "contacts", pascal_name: "Contacts" },
+    categories: [IconCategory.COMMUNICATION, IconCategory.OFFICE],
+    tags: ["contacts", "roladex"],
+    codepoint: 59914,
+    published_in: 1.0,
+    updated_in: 2.0,
+  },
+  {
+    name: "arrow-u-up-left",
+    categories: [IconCategory.ARROWS],
+    // A tag that is itself a comma-separated phrase
+    tags: ["directional", "undo, return", 'pointer'],
+    codepoint: 60244,
+    published_in: 1.0,
+    updated_in: 1.4,
+  },
+];
+"""
+
+FIXTURE_RECORDS = {
+    "address-book": {
+        "name": "address-book",
+        "tags": ["contacts", "roladex"],
+        "categories": ["communication", "office"],
+        "alias": "contacts",
+        "codepoint": 59914,
+        "published_in": 1.0,
+        "updated_in": 2.0,
+    },
+    "arrow-u-up-left": {
+        "name": "arrow-u-up-left",
+        "tags": ["directional", "undo, return", "pointer"],
+        "categories": ["arrows"],
+        "codepoint": 60244,
+        "published_in": 1.0,
+        "updated_in": 1.4,
+    },
+}
+
+
+def _check_fixture(tmp: Path) -> bool:
+    """
+    Parse `FIXTURE` and report every record that differs from `FIXTURE_RECORDS`.
+    """
+    ts_file = tmp / "fixture.ts"
+    ts_file.write_text(FIXTURE)
+    parsed = _parse_icons_ts(ts_file)
+    ok = True
+    for name in sorted(set(parsed) | set(FIXTURE_RECORDS)):
+        if parsed.get(name) != FIXTURE_RECORDS.get(name):
+            ok = False
+            click.echo(
+                f"fixture {name}: expected {FIXTURE_RECORDS.get(name)}, got {parsed.get(name)}",
+                err=True,
+            )
+    return ok
+
+
+def _legacy_parse(text: str) -> Dict[str, Dict]:
+    """
+    The previous regex implementation of _parse_icons_ts, kept for comparison.
+    """
+    start = text.find("export const icons =")
+    if start == -1:
+        return {}
+    segment = text[start:]
+    entries: Dict[str, Dict] = {}
+    pattern = re.compile(r"\{\s*name:\s*\"(?P<name>[^\"]+)\".*?\}", re.DOTALL)
+    for match in pattern.finditer(segment):
+        block = match.group(0)
+        name = match.group("name")
+        record: Dict[str, Any] = {"name": name}
+        tags_match = re.search(r"tags:\s*\[([^\]]*)\]", block, re.DOTALL)
+        if tags_match:
+            record["tags"] = [
+                t.strip().strip('"') for t in tags_match.group(1).split(",") if t.strip().strip('"')
+            ]
+        cat_match = re.search(r"categories:\s*\[([^\]]*)\]", block, re.DOTALL)
+        if cat_match:
+            record["categories"] = [
+                c.strip().replace("IconCategory.", "").lower()
+                for c in cat_match.group(1).split(",")
+                if c.strip().startswith("IconCategory.")
+            ]
+        alias_match = re.search(r"alias:\s*\{\s*name:\s*\"([^\"]+)\"", block)
+        if alias_match:
+            record["alias"] = alias_match.group(1)
+        code_match = re.search(r"codepoint:\s*([0-9]+)", block)
+        if code_match:
+            record["codepoint"] = int(code_match.group(1))
+        pub_match = re.search(r"published_in:\s*([0-9.]+)", block)
+        if pub_match:
+            record["published_in"] = float(pub_match.group(1))
+        upd_match = re.search(r"updated_in:\s*([0-9.]+)", block)
+        if upd_match:
+            record["updated_in"] = float(upd_match.group(1))
+        entries[name] = record
+    return entries
+
+
+def _legacy_defect(old: Dict, new: Dict) -> str | None:
+    """
+    Name the known legacy bug that explains old != new, or None.
+    """
+    if "alias" in new and all(new.get(k) == v for k, v in old.items()):
+        return "nested alias"
+    split_tags = [p.strip() for t in new.get("tags", []) for p in t.split(",") if p.strip()]
+    if old.get("tags") == split_tags and {**old, "tags": new.get("tags")} == new:
+        return "comma in tag"
+    return None
+
+
+def _best_of(repeat: int, fn, *args) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command()
+@click.option("--entries", type=int, default=50000, show_default=True, help="Synthetic entries.")
+@click.option(
+    "--file",
+    "ts_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Use this icons.ts instead of a synthetic one.",
+)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--seed", type=int, default=0)
+def main(entries: int, ts_file: Path | None, repeat: int, seed: int):
+    """
+    Compare the icons.ts parser with the legacy regex parser; exit 1 on unexplained
+    differences or a wrong parse of the fixture.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if not _check_fixture(Path(tmp)):
+            sys.exit(1)
+        if ts_file is None:
+            ts_file = Path(tmp) / "icons.ts"
+            ts_file.write_text(phosphor_icons_ts(icon_names(entries, random.Random(seed))))
+        text = ts_file.read_text()
+        t_new, new = _best_of(repeat, _parse_icons_ts, ts_file)
+    t_old, old = _best_of(repeat, _legacy_parse, text)
+
+    counts = {"identical": 0, "nested alias": 0, "comma in tag": 0, "mismatch": 0}
+    for name in sorted(set(old) | set(new)):
+        if old.get(name) == new.get(name):
+            counts["identical"] += 1
+            continue
+        defect = name in old and name in new and _legacy_defect(old[name], new[name])
+        counts[defect or "mismatch"] += 1
+        if not defect:
+            click.echo(f"{name}: legacy {old.get(name)} != new {new.get(name)}", err=True)
+
+    size_mb = len(text.encode()) / 1e6
+    click.echo(f"{ts_file.name}: {len(new)} entries, {size_mb:.1f} MB")
+    click.echo(f"  legacy regex   {t_old * 1e3:>9.1f} ms  {size_mb / t_old:>7.1f} MB/s")
+    click.echo(f"  ts_literal     {t_new * 1e3:>9.1f} ms  {size_mb / t_new:>7.1f} MB/s")
+    click.echo("  " + ", ".join(f"{n} {label}" for label, n in counts.items()))
+    if counts["mismatch"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Time queries against dist/search.json: index load time, then per-query latency
+for exact, prefix, multi-word and misspelled queries.
+
+Run from pipeline/ after `main.py dist`:
+
+    uv run python -m benchmarks.search
+"""
+
+import time
+from pathlib import Path
+
+import click
+
+from utils.search import SearchIndex
+
+DIST_DIR = Path(__file__).parent.parent.parent / "dist"
+
+QUERIES = [
+    "arrow",
+    "arrow left",
+    "arow left",
+    "a",
+    "ch",
+    "user circle",
+    "calendr",
+    "shopping cart",
+    "github logo",
+    "xmark",
+]
+
+
+@click.command()
+@click.option("--repeat", type=int, default=20, show_default=True)
+@click.option("--budget-ms", type=float, default=5.0, show_default=True)
+def main(repeat: int, budget_ms: float):
+    """
+    Print load time and per-query latency; exit 1 if any query exceeds the budget.
+    """
+    start = time.perf_counter()
+    index = SearchIndex.load(DIST_DIR / "search.json")
+    click.echo(
+        f"load {(time.perf_counter() - start) * 1e3:.1f} ms "
+        f"({len(index.docs)} docs, {len(index.terms)} terms)"
+    )
+    slow = 0
+    for query in QUERIES:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = index.search(query)
+            best = min(best, time.perf_counter() - start)
+        top = ", ".join(f"{h.vendor}/{h.name}" for h in hits[:3])
+        click.echo(f"{query!r:<16} {best * 1e3:>6.2f} ms  {top}")
+        slow += best * 1e3 > budget_ms
+    if slow:
+        click.echo(f"{slow} queries over {budget_ms} ms", err=True)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Load-test `main.py serve`: keep-alive clients request random icons from dist/,
+by path (`/heroicons/src/24/solid/x-mark.svg`) and through the data.json lookup
+(`/heroicons/x-mark?size=24&style=solid`), and the script prints p50/p99
+latency and requests per second.
+
+Run from pipeline/ after `main.py dist`. Without `--url`, a server is started
+on a free port for the run (client and server then share the CPU):
+
+    uv run python -m benchmarks.serve --requests 20000 --concurrency 32
+    uv run python -m benchmarks.serve --url http://127.0.0.1:8000 --accept-encoding "gzip, zstd"
+"""
+
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlencode, urlsplit
+
+import click
+
+from utils.server import DistSnapshot
+
+PIPELINE_DIR = Path(__file__).parent.parent
+DIST_DIR = PIPELINE_DIR.parent / "dist"
+
+
+def _targets(lookup_share: float, seed: int) -> List[str]:
+    """
+    One request target per icon variant, as a path or (for `lookup_share` of
+    them) a data.json lookup, shuffled.
+    """
+    rng = random.Random(seed)
+    snapshot = DistSnapshot(DIST_DIR)
+    targets = []
+    try:
+        for vendor, by_name in snapshot.lookups.items():
+            for name, variants in by_name.items():
+                for props, file in variants:
+                    if rng.random() < lookup_share:
+                        query = f"?{urlencode(props)}" if props else ""
+                        targets.append(f"/{vendor}/{name}{query}")
+                    else:
+                        targets.append(f"/{vendor}/{file}")
+    finally:
+        snapshot.close()
+    rng.shuffle(targets)
+    return targets
+
+
+async def _client(
+    host: str,
+    port: int,
+    targets: List[str],
+    next_index: List[int],
+    total: int,
+    headers: str,
+    timings: List[float],
+    statuses: Counter,
+    sizes: List[int],
+):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while next_index[0] < total:
+            target = targets[next_index[0] % len(targets)]
+            next_index[0] += 1
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            status = int(lines[0].split()[1])
+            length = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length) if length else b""
+            timings.append(time.perf_counter() - start)
+            statuses[status] += 1
+            sizes.append(len(body))
+    finally:
+        writer.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "main.py", "serve", "--port", str(port), "--reload-interval", "0"],
+        cwd=PIPELINE_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+    proc.kill()
+    raise click.ClickException("serve did not start")
+
+
+async def _run(host, port, targets, total, concurrency, headers):
+    timings: List[float] = []
+    statuses: Counter = Counter()
+    sizes: List[int] = []
+    next_index = [0]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _client(host, port, targets, next_index, total, headers, timings, statuses, sizes)
+            for _ in range(concurrency)
+        )
+    )
+    return time.perf_counter() - start, timings, statuses, sizes
+
+
+@click.command()
+@click.option("--url", help="Server to test (default: start `main.py serve` for the run).")
+@click.option("--requests", "total", type=int, default=10000, show_default=True)
+@click.option("--concurrency", type=int, default=16, show_default=True)
+@click.option("--lookup-share", type=float, default=0.2, show_default=True, help="Share of requests that go through /<vendor>/<name>?... lookups.")
+@click.option("--accept-encoding", default="", help='e.g. "gzip, zstd" to request precompressed variants.')
+@click.option("--seed", type=int, default=0)
+def main(
+    url: Optional[str],
+    total: int,
+    concurrency: int,
+    lookup_share: float,
+    accept_encoding: str,
+    seed: int,
+):
+    """
+    Print latency percentiles, requests per second and status counts; exit 1 if
+    any request failed.
+    """
+    targets = _targets(lookup_share, seed)
+    if not targets:
+        raise click.ClickException(f"No icons in {DIST_DIR}; run `main.py dist` first.")
+    headers = f"Accept-Encoding: {accept_encoding}\r\n" if accept_encoding else ""
+
+    proc = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = _start_server(port)
+    try:
+        # One pass over a sample to warm the server's LRU, then the measured run
+        asyncio.run(_run(host, port, targets, min(total, len(targets)), concurrency, headers))
+        elapsed, timings, statuses, sizes = asyncio.run(
+            _run(host, port, targets, total, concurrency, headers)
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    timings.sort()
+    ms = [t * 1e3 for t in timings]
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    click.echo(
+        f"{len(ms)} requests, concurrency {concurrency}: {len(ms) / elapsed:.0f} req/s, "
+        f"p50 {statistics.median(ms):.2f} ms, p99 {p99:.2f} ms, max {ms[-1]:.2f} ms, "
+        f"{sum(sizes) / len(sizes):.0f} B/response"
+    )
+    click.echo("status " + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items())))
+    if any(code >= 400 for code in statuses):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
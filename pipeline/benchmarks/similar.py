@@ -0,0 +1,76 @@
+"""
+Time `similar` queries against the index in dist/ (`similar.npy`, ...): index
+load time, then per-query latency over random icons, each checked against a
+brute-force ranking of every hash.
+
+Run from pipeline/ after `main.py dist --similar`:
+
+    uv run python -m benchmarks.similar --queries 500
+"""
+
+import random
+import statistics
+import time
+from pathlib import Path
+
+import click
+
+from utils.similar import SimilarityIndex, _popcount
+
+DIST_DIR = Path(__file__).parent.parent.parent / "dist"
+
+
+def _brute_force(index: SimilarityIndex, vendor: str, name: str, limit: int) -> list[int]:
+    """
+    Distances of the `limit` closest (vendor, name) groups, from a full scan.
+    """
+    query = index.rows(vendor, name)
+    best: dict[tuple[str, str], int] = {}
+    for q in query:
+        for row, dist in enumerate(_popcount(index.hashes ^ index.hashes[q]).tolist()):
+            if row in query:
+                continue
+            key = (index.icons[row][0], index.icons[row][1])
+            best[key] = min(best.get(key, 65), dist)
+    return sorted(best.values())[:limit]
+
+
+@click.command()
+@click.option("--queries", type=int, default=200, show_default=True)
+@click.option("--limit", type=int, default=10, show_default=True)
+@click.option("--seed", type=int, default=0)
+@click.option("--budget-ms", type=float, default=5.0, show_default=True)
+def main(queries: int, limit: int, seed: int, budget_ms: float):
+    """
+    Print load time and query latency percentiles; exit 1 if the p99 exceeds the
+    budget or any result differs from the brute-force ranking.
+    """
+    start = time.perf_counter()
+    index = SimilarityIndex.load(DIST_DIR)
+    index.rows("", "")
+    click.echo(f"load {(time.perf_counter() - start) * 1e3:.1f} ms ({len(index.icons)} icons)")
+
+    rng = random.Random(seed)
+    sample = rng.sample(index.icons, min(queries, len(index.icons)))
+    timings = []
+    wrong = 0
+    for vendor, name, _ in sample:
+        start = time.perf_counter()
+        hits = index.similar(vendor, name, limit=limit)
+        timings.append((time.perf_counter() - start) * 1e3)
+        if [h.distance for h in hits] != _brute_force(index, vendor, name, limit):
+            wrong += 1
+            click.echo(f"{vendor}/{name}: differs from the full scan", err=True)
+
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    click.echo(
+        f"{len(timings)} queries: p50 {statistics.median(timings):.2f} ms, "
+        f"p99 {p99:.2f} ms, max {timings[-1]:.2f} ms"
+    )
+    if wrong or p99 > budget_ms:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+CLI startup budget: run `main.py` commands that do no work (`--help`) under
+`python -X importtime`, and sum the import time of the top-level modules each
+one loads. The budget is a multiple of a bare `import click` measured in the
+same run, so it holds on slow and fast machines alike. Exits 1 when a command
+goes over the budget or imports a module that only the commands doing the work
+should load (`HEAVY`: NumPy, asyncio, process pools, the vendor processors, ...).
+
+Run from pipeline/ (CI and pre-commit hooks can call it as is):
+
+    uv run python -m benchmarks.startup
+    uv run python -m benchmarks.startup --budget 3 --show 15
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+PIPELINE_DIR = Path(__file__).parent.parent
+
+# Invocations that must stay cheap
+COMMANDS = [
+    ["--help"],
+    ["clean", "--help"],
+    ["cache", "clean", "--help"],
+    ["dist", "--help"],
+    ["search", "--help"],
+    ["concept", "--help"],
+    ["similar", "--help"],
+    ["serve", "--help"],
+    ["stats", "--help"],
+]
+
+# Modules (and their submodules) none of COMMANDS may import
+HEAVY = [
+    "numpy",
+    "asyncio",
+    "concurrent.futures",
+    "multiprocessing",
+    "logging",
+    "xml.etree",
+    "json5",
+    "tracemalloc",
+    "subprocess",
+    "mmap",
+    "hashlib",
+    "utils.binary_catalog",
+    "utils.blob_store",
+    "utils.columnar",
+    "utils.concepts",
+    "utils.file_cache",
+    "utils.geometry",
+    "utils.search",
+    "utils.similar",
+    "utils.server",
+    "utils.svg_pack",
+    "vendor_radix_ui_icons",
+    "vendor_heroicons",
+    "vendor_lucide_icons",
+    "vendor_phosphor_icons",
+    "vendor_octicons",
+    "vendor_svgl",
+]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def _importtime(args: List[str]) -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Run python with args; return (total ms, top-level module -> cumulative ms,
+    every module imported).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PIPELINE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise click.ClickException(f"{' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+    top: Dict[str, float] = {}
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        modules.append(match.group(4))
+        # One space of indent marks a module imported by the script itself
+        if len(match.group(3)) == 1:
+            top[match.group(4)] = int(match.group(2)) / 1000
+    return sum(top.values()), top, modules
+
+
+@click.command()
+@click.option(
+    "--budget",
+    type=float,
+    default=3.0,
+    show_default=True,
+    help="Per-command import time budget, as a multiple of `import click`.",
+)
+@click.option("--repeat", type=int, default=5, show_default=True, help="Runs per command; the fastest counts.")
+@click.option("--show", type=int, default=8, show_default=True, help="Heaviest top-level imports to list.")
+def main(budget: float, repeat: int, show: int):
+    """
+    Print each command's import time and heaviest imports; exit 1 on a budget
+    overrun or a heavy import.
+    """
+    baseline = min(_importtime(["-c", "import click"])[0] for _ in range(repeat))
+    budget_ms = budget * baseline
+    click.echo(f"import click: {baseline:.1f} ms, budget {budget_ms:.1f} ms ({budget:g}x)")
+    failed = 0
+    for args in COMMANDS:
+        runs = [_importtime(["main.py", *args]) for _ in range(repeat)]
+        total, top, modules = min(runs, key=lambda run: run[0])
+        heavy = sorted(
+            {m for m in modules for h in HEAVY if m == h or m.startswith(h + ".")}
+        )
+        status = "ok"
+        if total > budget_ms:
+            status = f"over budget ({total / baseline:.1f}x)"
+        if heavy:
+            status = f"imports {', '.join(heavy[:5])}" + (" ..." if len(heavy) > 5 else "")
+        failed += status != "ok"
+        click.echo(f"main.py {' '.join(args):<22} {total:>7.1f} ms  {len(modules):>4} modules  {status}")
+        heaviest = sorted(top.items(), key=lambda item: -item[1])[:show]
+        click.echo("    " + ", ".join(f"{name} {ms:.1f}" for name, ms in heaviest))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Pipeline benchmark suite over synthetic vendor trees (see `benchmarks/synthetic.py`).
+
+    uv run python -m benchmarks.suite run --icons 1000 --icons 50000 --out bench.json
+    uv run python -m benchmarks.suite compare baseline.json bench.json --threshold 0.2
+
+`run` builds a throwaway workspace per size (synthetic `vendor/`, a copy of
+`pipeline/`, an empty `dist/`) and times, each in its own child process:
+
+- `parse_svg_basic`: every generated SVG, by path
+- `process:<vendor>`: each vendor processor with a cold file cache
+- `copy_svgs`: `_copy_svgs` of every vendor into an empty dist
+- `data_json`: data.json / data.min.json assembly (`_write_packages`)
+
+Each result records seconds, items, items per second and the child's peak RSS
+(`ru_maxrss`, KiB on Linux). `compare` flags steps whose time or peak RSS grew
+by more than the threshold and exits 1 when any did.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import click
+
+from benchmarks.synthetic import generate
+
+PIPELINE_DIR = Path(__file__).parent.parent
+
+STEPS = [
+    "parse_svg_basic",
+    "process:radix-ui-icons",
+    "process:heroicons",
+    "process:lucide-icons",
+    "process:phosphor-icons",
+    "process:octicons",
+    "process:svgl",
+    "copy_svgs",
+    "data_json",
+]
+
+
+def _run_step(step: str) -> Dict[str, Any]:
+    """
+    Run one step inside a workspace (cwd is its pipeline/ copy) and time it.
+    """
+    import main
+    from utils.svg_utils import parse_svg_basic
+    from utils.records import iter_records, records_path
+
+    vendor_root = main.ROOT / "vendor"
+    sink = io.StringIO()
+    if step == "parse_svg_basic":
+        files = sorted(vendor_root.rglob("*.svg"))
+        start = time.perf_counter()
+        for path in files:
+            parse_svg_basic(path)
+        return {"seconds": time.perf_counter() - start, "items": len(files)}
+
+    if step.startswith("process:"):
+        vendor = step.split(":", 1)[1]
+        out = main.CACHE_DIR / vendor
+        cache_file = main.CACHE_DIR / "files" / f"{vendor}.json"
+        if cache_file.exists():
+            cache_file.unlink()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            main._vendor_command(vendor).callback(out=out, fmt="json")
+        seconds = time.perf_counter() - start
+        items = sum(1 for _ in iter_records(records_path(out, "metadata", "json")))
+        return {"seconds": seconds, "items": items}
+
+    sources = {
+        "radix-ui-icons": vendor_root / "radix-ui-icons" / "packages" / "radix-icons" / "icons",
+        "heroicons": vendor_root / "heroicons" / "src",
+        "lucide-icons": vendor_root / "lucide-icons" / "icons",
+        "phosphor-icons": vendor_root / "phosphor-icons" / "assets",
+        "octicons": vendor_root / "octicons" / "icons",
+        "svgl": vendor_root / "svgl" / "static" / "library",
+    }
+
+    def _copy_all():
+        with contextlib.redirect_stdout(sink):
+            for vendor, src in sources.items():
+                main._copy_svgs(src, main.DIST_DIR / vendor / "src")
+
+    if step == "copy_svgs":
+        for vendor in sources:
+            shutil.rmtree(main.DIST_DIR / vendor / "src", ignore_errors=True)
+        start = time.perf_counter()
+        _copy_all()
+        seconds = time.perf_counter() - start
+        items = sum(1 for _ in main.DIST_DIR.rglob("*.svg"))
+        return {"seconds": seconds, "items": items}
+
+    if step == "data_json":
+        vendor_meta = {
+            vendor: records_path(main.CACHE_DIR / vendor, "metadata", "json")
+            for vendor in main.VENDOR_MODULES
+        }
+        # Inputs from the earlier steps, produced untimed when run on its own
+        with contextlib.redirect_stdout(sink):
+            for vendor, path in vendor_meta.items():
+                if not path.exists():
+                    main._vendor_command(vendor).callback(out=path.parent, fmt="json")
+        _copy_all()
+        start = time.perf_counter()
+        entries = main._write_packages(vendor_meta, "json", {})[0]
+        return {"seconds": time.perf_counter() - start, "items": len(entries)}
+
+    raise click.BadParameter(f"Unknown step: {step}")
+
+
+def _make_workspace(root: Path, icons: int, seed: int) -> Dict[str, int]:
+    counts = generate(root, icons, seed)
+    shutil.copytree(
+        PIPELINE_DIR,
+        root / "pipeline",
+        ignore=shutil.ignore_patterns("__pycache__", ".venv", "*.pyc"),
+        dirs_exist_ok=True,
+    )
+    (root / "dist").mkdir(exist_ok=True)
+    return counts
+
+
+def _child(workspace: Path, step: str) -> Dict[str, Any]:
+    """
+    Run a step in a fresh interpreter and add its peak RSS from wait4.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        result_path = Path(tmp.name)
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.suite", "step", step, "--result", str(result_path)],
+            cwd=workspace / "pipeline",
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            raise click.ClickException(f"Step {step} failed with exit code {proc.returncode}")
+        result = json.loads(result_path.read_text())
+    finally:
+        result_path.unlink(missing_ok=True)
+    result["items_per_s"] = round(result["items"] / result["seconds"], 1) if result["seconds"] else None
+    result["seconds"] = round(result["seconds"], 4)
+    result["peak_rss_kb"] = usage.ru_maxrss
+    return result
+
+
+@click.group()
+def cli():
+    """
+    Pipeline benchmarks over synthetic vendor trees.
+    """
+    pass
+
+
+@cli.command()
+@click.option(
+    "--icons",
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[1000, 10000],
+    show_default=True,
+    help="Total synthetic icons; repeat for several sizes (up to 500k).",
+)
+@click.option("--step", "steps", type=click.Choice(STEPS), multiple=True, help="Only run these steps.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--out", type=click.Path(path_type=Path), default=Path("bench.json"), show_default=True)
+@click.option("--workdir", type=click.Path(path_type=Path), help="Keep workspaces here instead of a temp dir.")
+def run(icons: List[int], steps: List[str], seed: int, out: Path, workdir: Path | None):
+    """
+    Time each pipeline step at each size and write the results to OUT.
+    """
+    results: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sizes": {},
+    }
+    base = workdir or Path(tempfile.mkdtemp(prefix="pipeline-bench-"))
+    try:
+        for size in icons:
+            workspace = base / f"icons-{size}"
+            start = time.perf_counter()
+            counts = _make_workspace(workspace, size, seed)
+            click.echo(
+                f"[{size} icons] generated {sum(counts.values())} SVGs in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+            size_results = {"svgs": counts, "steps": {}}
+            for step in steps or STEPS:
+                result = _child(workspace, step)
+                size_results["steps"][step] = result
+                click.echo(
+                    f"  {step:<24} {result['seconds']:>9.3f}s {result['items']:>8} items "
+                    f"{result['items_per_s'] or 0:>11.0f}/s {result['peak_rss_kb'] / 1024:>8.1f} MiB"
+                )
+            results["sizes"][str(size)] = size_results
+    finally:
+        if workdir is None:
+            shutil.rmtree(base, ignore_errors=True)
+    out.write_text(json.dumps(results, indent=2) + "\n")
+    click.echo(f"Wrote {out}")
+
+
+@cli.command(hidden=True)
+@click.argument("step", type=click.Choice(STEPS))
+@click.option("--result", type=click.Path(path_type=Path), required=True)
+def step(step: str, result: Path):
+    """
+    Internal: run a single step in the current workspace.
+    """
+    result.write_text(json.dumps(_run_step(step)))
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Allowed relative growth in seconds and peak RSS (0.2 = 20%).",
+)
+def compare(baseline: Path, current: Path, threshold: float):
+    """
+    Compare CURRENT against BASELINE; exit 1 on any regression beyond the threshold.
+    """
+    base = json.loads(baseline.read_text())["sizes"]
+    cur = json.loads(current.read_text())["sizes"]
+    regressions = 0
+    click.echo(f"{'size':>8} {'step':<24} {'seconds':>17} {'peak MiB':>17}")
+    for size in sorted(set(base) & set(cur), key=int):
+        for name in STEPS:
+            old = base[size]["steps"].get(name)
+            new = cur[size]["steps"].get(name)
+            if not old or not new:
+                continue
+            flags = []
+            for key, label in (("seconds", "time"), ("peak_rss_kb", "rss")):
+                if old[key] and new[key] > old[key] * (1 + threshold):
+                    flags.append(label)
+            regressions += bool(flags)
+            click.echo(
+                f"{size:>8} {name:<24} {old['seconds']:>8.3f}>{new['seconds']:<8.3f} "
+                f"{old['peak_rss_kb'] / 1024:>8.1f}>{new['peak_rss_kb'] / 1024:<8.1f}"
+                + (f"  REGRESSION ({', '.join(flags)})" if flags else "")
+            )
+    if regressions:
+        click.echo(f"{regressions} step(s) regressed beyond {threshold:.0%}", err=True)
+        sys.exit(1)
+    click.echo("No regressions.")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,60 @@
+"""
+Compare serving SVGs from loose files (open + read per icon) with slices of
+dist/<vendor>/svgs.pack, and check that every packed body matches its file.
+
+Run from pipeline/ after `main.py dist`:
+
+    uv run python -m benchmarks.svg_pack
+"""
+
+import random
+import time
+from pathlib import Path
+
+import click
+
+from utils.svg_pack import SvgPack
+
+DIST_DIR = Path(__file__).parent.parent.parent / "dist"
+
+
+@click.command()
+@click.option("--lookups", type=int, default=20000, show_default=True)
+@click.option("--seed", type=int, default=0)
+def main(lookups: int, seed: int):
+    """
+    Print per-lookup latency of open()+read() vs SvgPack.get per vendor.
+    """
+    rng = random.Random(seed)
+    click.echo(f"{'vendor':<16} {'files':>6} {'open us':>8} {'pack us':>8} {'speedup':>8}")
+    for pack_path in sorted(DIST_DIR.glob("*/svgs.pack")):
+        vendor_dir = pack_path.parent
+        start = time.perf_counter()
+        pack = SvgPack(pack_path)
+        open_ms = (time.perf_counter() - start) * 1e3
+        names = list(pack)
+        for name, body in pack.items():
+            if (vendor_dir / name).read_bytes() != body:
+                click.echo(f"{vendor_dir.name}: {name} differs from the packed body", err=True)
+            body.release()
+        sample = [rng.choice(names) for _ in range(lookups)]
+
+        start = time.perf_counter()
+        for name in sample:
+            with open(vendor_dir / name, "rb") as f:
+                f.read()
+        t_files = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in sample:
+            pack.get(name).release()
+        t_pack = time.perf_counter() - start
+        pack.close()
+        click.echo(
+            f"{vendor_dir.name:<16} {len(names):>6} {t_files / lookups * 1e6:>8.2f} "
+            f"{t_pack / lookups * 1e6:>8.2f} {t_files / t_pack:>7.1f}x  (open {open_ms:.2f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
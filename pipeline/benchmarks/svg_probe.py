@@ -0,0 +1,132 @@
+"""
+Micro-benchmark for utils.svg_utils.parse_svg_basic.
+
+Compares the previous full-tree parse (ET.parse) with the header-only probe,
+from a path and from bytes already in memory, and checks that all three agree.
+
+Run from pipeline/:
+
+    uv run python -m benchmarks.svg_probe
+    uv run python -m benchmarks.svg_probe --tree my-icons=/path/to/svgs
+"""
+
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import click
+
+from utils.svg_utils import parse_svg_basic
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Vendor trees, falling back to the committed dist copies when submodules are not checked out
+DEFAULT_TREES = {
+    "phosphor-icons": [
+        ROOT / "vendor" / "phosphor-icons" / "assets",
+        ROOT / "dist" / "phosphor-icons" / "src",
+    ],
+    "svgl": [
+        ROOT / "vendor" / "svgl" / "static" / "library",
+        ROOT / "dist" / "svgl" / "src",
+    ],
+}
+
+
+def legacy_parse_svg_basic(path: Path) -> Dict[str, Any]:
+    """
+    The full-parse implementation parse_svg_basic replaced, kept as the baseline.
+    """
+    result: Dict[str, Any] = {"viewBox": None, "width": None, "height": None}
+    if not path.exists():
+        return result
+    try:
+        root = ET.parse(path).getroot()
+        view_box = root.attrib.get("viewBox")
+
+        def _as_number(value: Optional[str]) -> Optional[float]:
+            if value is None:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                return None
+
+        width_num = _as_number(root.attrib.get("width"))
+        height_num = _as_number(root.attrib.get("height"))
+        result["viewBox"] = view_box
+        if width_num is None and view_box:
+            parts = view_box.split()
+            if len(parts) == 4:
+                width_num = float(parts[2])
+        if height_num is None and view_box:
+            parts = view_box.split()
+            if len(parts) == 4:
+                height_num = float(parts[3])
+        result["width"] = width_num
+        result["height"] = height_num
+    except Exception:
+        return result
+    return result
+
+
+def _time_per_file(fn: Callable[[Any], Any], inputs: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs) * 1e6
+
+
+@click.command()
+@click.option(
+    "--tree",
+    "trees",
+    multiple=True,
+    help="Extra tree to measure as name=path (repeatable). Defaults to phosphor and svgl.",
+)
+@click.option("--repeat", type=int, default=3, show_default=True)
+def main(trees: tuple[str, ...], repeat: int):
+    """
+    Print per-file latency of parse_svg_basic before and after the header-only probe.
+    """
+    selected: dict[str, Path] = {}
+    for name, candidates in DEFAULT_TREES.items():
+        found = next((c for c in candidates if c.exists()), None)
+        if found:
+            selected[name] = found
+    for spec in trees:
+        name, _, path = spec.partition("=")
+        selected[name] = Path(path)
+
+    click.echo(
+        f"{'tree':<16} {'files':>6} {'ET.parse µs':>12} {'probe(path) µs':>15} "
+        f"{'probe(bytes) µs':>16} {'speedup':>8}"
+    )
+    for name, tree in selected.items():
+        files = sorted(tree.rglob("*.svg"))
+        if not files:
+            click.echo(f"{name:<16} no SVG files under {tree}")
+            continue
+        blobs = [f.read_bytes() for f in files]
+        mismatches = sum(
+            1
+            for f, b in zip(files, blobs)
+            if not (legacy_parse_svg_basic(f) == parse_svg_basic(f) == parse_svg_basic(b))
+        )
+        before = _time_per_file(legacy_parse_svg_basic, files, repeat)
+        after_path = _time_per_file(parse_svg_basic, files, repeat)
+        after_bytes = _time_per_file(parse_svg_basic, blobs, repeat)
+        click.echo(
+            f"{name:<16} {len(files):>6} {before:>12.1f} {after_path:>15.1f} "
+            f"{after_bytes:>16.1f} {before / after_path:>7.1f}x"
+        )
+        if mismatches:
+            click.echo(f"  {mismatches} files differ from the full-parse result", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Time the svgl `svgs.ts` parser (`vendor_svgl._parse_svgs_ts`) cold and through
+the per-file cache, on a synthetic file or a real checkout:
+
+    uv run python -m benchmarks.svgs_ts --entries 5000
+    uv run python -m benchmarks.svgs_ts --file ../vendor/svgl/src/data/svgs.ts
+
+When the `json5` package is installed, its output for the same array (what the
+processor used before) is timed too and must match, otherwise this exits 1.
+"""
+
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.synthetic import icon_names, svgl_svgs_ts
+from utils.file_cache import load_file_cache
+from vendor_svgl import _parse_svgs_ts
+
+
+def _json5_parse(text: str) -> list:
+    """
+    The previous implementation: the array text handed to json5.
+    """
+    import json5
+
+    lines = [ln for ln in text.splitlines() if not ln.strip().startswith("import ")]
+    cleaned = "\n".join(lines)
+    start = cleaned.find("[", cleaned.find("=", cleaned.find("export const svgs")))
+    return json5.loads(cleaned[start : cleaned.rfind("]") + 1])
+
+
+@click.command()
+@click.option("--entries", type=int, default=5000, show_default=True, help="Synthetic entries.")
+@click.option(
+    "--file",
+    "ts_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Use this svgs.ts instead of a synthetic one.",
+)
+@click.option("--seed", type=int, default=0)
+def main(entries: int, ts_file: Path | None, seed: int):
+    """
+    Print cold, cached and (if available) json5 parse times of svgs.ts.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if ts_file is None:
+            names = icon_names(entries, random.Random(seed))
+            ts_file = Path(tmp) / "svgs.ts"
+            routes = [(n, {"light": f"{n}.svg", "dark": f"{n}-dark.svg"}) for n in names]
+            ts_file.write_text(svgl_svgs_ts(routes))
+        text = ts_file.read_text()
+        size_mb = len(text.encode()) / 1e6
+
+        start = time.perf_counter()
+        parsed = _parse_svgs_ts(ts_file)
+        t_cold = time.perf_counter() - start
+
+        # Re-run: a fresh process loads the cache file and finds the content hash unchanged
+        cache = load_file_cache("svgl", cache_dir=Path(tmp))
+        cache.get(ts_file, "svgs_ts:2", _parse_svgs_ts)
+        cache.save()
+        start = time.perf_counter()
+        cached = load_file_cache("svgl", cache_dir=Path(tmp)).get(ts_file, "svgs_ts:2", _parse_svgs_ts)
+        t_cached = time.perf_counter() - start
+
+    click.echo(f"{ts_file.name}: {len(parsed)} entries, {size_mb:.2f} MB")
+    click.echo(f"  ts_literal      {t_cold * 1e3:>9.1f} ms  {size_mb / t_cold:>7.2f} MB/s")
+    click.echo(f"  cached re-run   {t_cached * 1e3:>9.1f} ms")
+    ok = cached == parsed
+    if importlib.util.find_spec("json5") is not None:
+        start = time.perf_counter()
+        legacy = _json5_parse(text)
+        t_json5 = time.perf_counter() - start
+        click.echo(f"  json5           {t_json5 * 1e3:>9.1f} ms  {size_mb / t_json5:>7.2f} MB/s")
+        if legacy != parsed:
+            click.echo("Output differs from json5", err=True)
+            ok = False
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
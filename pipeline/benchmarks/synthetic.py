@@ -0,0 +1,206 @@
+"""
+Generate synthetic vendor trees with the layout each processor expects, so the
+pipeline can be benchmarked at any scale without the `vendor/` submodules.
+
+    uv run python -m benchmarks.synthetic /tmp/bench --icons 10000
+
+writes `/tmp/bench/vendor/<vendor>/...` with `--icons` SVG files in total,
+split across vendors in roughly the proportions of the real catalog, plus the
+side files (lucide `.json`, phosphor `icons.ts`, octicons `keywords.json`,
+svgl `svgs.ts`) and a LICENSE per vendor.
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import click
+
+# Share of the total icon count per vendor (real catalog: phosphor ~65%, ...)
+SHARES = {
+    "radix-ui-icons": 0.03,
+    "heroicons": 0.09,
+    "lucide-icons": 0.12,
+    "phosphor-icons": 0.64,
+    "octicons": 0.05,
+    "svgl": 0.07,
+}
+
+PHOSPHOR_WEIGHTS = ["bold", "duotone", "fill", "light", "regular", "thin"]
+HEROICONS_VARIANTS = ["16/solid", "20/solid", "24/solid", "24/outline"]
+
+_WORDS = (
+    "arrow circle square user file folder chart cloud lock key star heart bell "
+    "camera phone mail map pin home gear trash edit copy link search plus minus "
+    "check close play pause stop book code bug box tag flag sun moon"
+).split()
+
+
+def icon_names(count: int, rng: random.Random) -> List[str]:
+    """
+    `count` distinct kebab-case names such as `arrow-circle-12`.
+    """
+    return [f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{i}" for i in range(count)]
+
+
+def svg_body(rng: random.Random, size: int, segments: int = 12, attrs: str = "") -> bytes:
+    """
+    A plausible icon: one path of curves and lines inside a `size` x `size` viewBox.
+    """
+    parts = [f"M{rng.uniform(0, size):.2f} {rng.uniform(0, size):.2f}"]
+    for _ in range(segments):
+        if rng.random() < 0.5:
+            coords = " ".join(f"{rng.uniform(-size / 4, size / 4):.3f}" for _ in range(6))
+            parts.append(f"c{coords}")
+        else:
+            parts.append(f"l{rng.uniform(-size / 4, size / 4):.3f} {rng.uniform(-size / 4, size / 4):.3f}")
+    parts.append("Z")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}"{attrs}><path d="{"".join(parts)}"/></svg>\n'
+    ).encode()
+
+
+def _write(path: Path, data: bytes | str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode()
+    path.write_bytes(data)
+
+
+def _radix(base: Path, count: int, rng: random.Random):
+    for name in icon_names(count, rng):
+        _write(base / "packages" / "radix-icons" / "icons" / f"{name}.svg", svg_body(rng, 15))
+
+
+def _heroicons(base: Path, count: int, rng: random.Random):
+    names = icon_names(max(1, count // len(HEROICONS_VARIANTS)), rng)
+    for variant in HEROICONS_VARIANTS:
+        size = int(variant.split("/")[0])
+        for name in names:
+            _write(base / "src" / variant / f"{name}.svg", svg_body(rng, size))
+
+
+def _lucide(base: Path, count: int, rng: random.Random):
+    for name in icon_names(count, rng):
+        _write(base / "icons" / f"{name}.svg", svg_body(rng, 24, attrs=' fill="none" stroke="currentColor"'))
+        meta = {
+            "tags": name.split("-")[:2],
+            "categories": [rng.choice(_WORDS)],
+            "contributors": ["synthetic"],
+            "aliases": [{"name": f"{name}-alt"}] if rng.random() < 0.2 else [],
+        }
+        _write(base / "icons" / f"{name}.json", json.dumps(meta))
+
+
+def phosphor_icons_ts(names: List[str]) -> str:
+    """
+    A phosphor `src/icons.ts` listing names; every 7th entry has a nested alias.
+    """
+    lines = ['import { IconCategory, FigmaCategory } from "./types";', "", "export const icons = <const>["]
+    for i, name in enumerate(names):
+        alias = f'\n    alias: {{ name: "{name}-old", pascal_name: "Old" }},' if i % 7 == 0 else ""
+        lines.append(
+            f"  {{\n    name: \"{name}\",\n    pascal_name: \"Icon{i}\",{alias}\n"
+            f"    categories: [IconCategory.ARROWS, IconCategory.DESIGN],\n"
+            f"    figma_category: FigmaCategory.ARROWS,\n"
+            f"    tags: [\"{name.split('-')[0]}\", \"*new*\"],\n"
+            f"    codepoint: {57344 + i},\n    published_in: 1.0,\n    updated_in: 2.0,\n  }},"
+        )
+    lines.append("];")
+    return "\n".join(lines) + "\n"
+
+
+def _phosphor(base: Path, count: int, rng: random.Random):
+    names = icon_names(max(1, count // len(PHOSPHOR_WEIGHTS)), rng)
+    for weight in PHOSPHOR_WEIGHTS:
+        suffix = "" if weight == "regular" else f"-{weight}"
+        for name in names:
+            _write(base / "assets" / weight / f"{name}{suffix}.svg", svg_body(rng, 256, 20))
+    _write(base / "src" / "icons.ts", phosphor_icons_ts(names))
+
+
+def _octicons(base: Path, count: int, rng: random.Random):
+    names = icon_names(max(1, count // 2), rng)
+    for name in names:
+        for size in (16, 24):
+            _write(base / "icons" / f"{name}-{size}.svg", svg_body(rng, size))
+    _write(base / "keywords.json", json.dumps({name: name.split("-")[:2] for name in names}))
+
+
+def svgl_svgs_ts(routes: List[Tuple[str, Dict[str, str]]]) -> str:
+    """
+    An svgl `src/data/svgs.ts` with one entry per (title, {theme: file}) route.
+    """
+    entries = []
+    for name, files in routes:
+        entries.append(
+            f"  {{\n    title: '{name}',\n    category: ['Software', \"AI\"],\n"
+            f"    route: {{\n      light: '/library/{files['light']}',\n"
+            f"      dark: \"/library/{files['dark']}\",\n    }},\n"
+            f"    url: 'https://example.com/{name}', // homepage\n  }},"
+        )
+    text = 'import type { iSVG } from "@/types/svg";\n\nexport const svgs: iSVG[] = [\n'
+    return text + "\n".join(entries) + "\n];\n"
+
+
+def _svgl(base: Path, count: int, rng: random.Random):
+    names = icon_names(max(1, count // 2), rng)
+    routes = []
+    for name in names:
+        # Half the brands ship light/dark variants, the rest a single file
+        if rng.random() < 0.5:
+            files = {"light": f"{name}-light.svg", "dark": f"{name}-dark.svg"}
+        else:
+            files = {"light": f"{name}.svg", "dark": f"{name}.svg"}
+        for fname in set(files.values()):
+            _write(base / "static" / "library" / fname, svg_body(rng, 24, 30))
+        routes.append((name, files))
+    _write(base / "src" / "data" / "svgs.ts", svgl_svgs_ts(routes))
+
+
+GENERATORS: Dict[str, Callable[[Path, int, random.Random], None]] = {
+    "radix-ui-icons": _radix,
+    "heroicons": _heroicons,
+    "lucide-icons": _lucide,
+    "phosphor-icons": _phosphor,
+    "octicons": _octicons,
+    "svgl": _svgl,
+}
+
+
+def generate(root: Path, icons: int, seed: int = 0) -> Dict[str, int]:
+    """
+    Replace `root/vendor` with synthetic trees holding about `icons` SVGs in total.
+    Returns the number of SVG files written per vendor.
+    """
+    vendor_dir = root / "vendor"
+    if vendor_dir.exists():
+        shutil.rmtree(vendor_dir)
+    counts = {}
+    for vendor, make in GENERATORS.items():
+        rng = random.Random(f"{seed}:{vendor}")
+        base = vendor_dir / vendor
+        make(base, max(1, round(icons * SHARES[vendor])), rng)
+        _write(base / "LICENSE", f"Synthetic {vendor} icons for benchmarks.\n")
+        counts[vendor] = sum(1 for _ in base.rglob("*.svg"))
+    return counts
+
+
+@click.command()
+@click.argument("root", type=click.Path(path_type=Path))
+@click.option("--icons", type=int, default=1000, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(root: Path, icons: int, seed: int):
+    """
+    Write synthetic vendor trees under ROOT/vendor.
+    """
+    counts = generate(root, icons, seed)
+    for vendor, count in counts.items():
+        click.echo(f"{vendor:<16} {count:>7} SVGs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Check the programmatic processors (`utils.vendors.vendor_metadata`) against the
+cached `metadata.json` files, and compare feeding the search and concept index
+builders from the generators with reading the records back from disk:
+wall time and tracemalloc peak per vendor.
+
+Run from pipeline/ after `main.py cache all` (json format):
+
+    uv run python -m benchmarks.vendor_metadata
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+
+from utils.concepts import ConceptIndexBuilder
+from utils.records import iter_records, records_path
+from utils.search import SearchIndexBuilder
+from utils.vendors import VENDOR_MODULES, vendor_metadata
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "dist" / ".cache"
+
+
+def _index(vendor: str, records) -> int:
+    search, concepts = SearchIndexBuilder(), ConceptIndexBuilder()
+    count = 0
+    for record in records:
+        search.add_record(vendor, record)
+        concepts.add_record(vendor, record)
+        count += 1
+    return count
+
+
+def _measure(run):
+    """
+    (result, seconds, peak bytes); the peak is traced in a second run.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+@click.command()
+def main():
+    """
+    Print per-vendor timings and peaks; exit 1 if a generator's records differ
+    from the cached metadata.json.
+    """
+    wrong = 0
+    click.echo(f"{'':<16} {'records':>8} {'generator ms':>13} {'peak MiB':>9} {'metadata.json ms':>17} {'peak MiB':>9}")
+    for vendor in VENDOR_MODULES:
+        path = records_path(CACHE_DIR / vendor, "metadata", "json")
+        if not path.exists():
+            raise click.ClickException(f"No {path}; run `main.py cache all` first.")
+        # Round-trip through JSON so tuples and key order compare as written
+        expected = json.loads(path.read_text())
+        if json.loads(json.dumps(list(vendor_metadata(vendor)))) != expected:
+            wrong += 1
+            click.echo(f"{vendor}: generator records differ from {path}", err=True)
+        del expected
+
+        count, t_gen, m_gen = _measure(lambda: _index(vendor, vendor_metadata(vendor)))
+        _, t_disk, m_disk = _measure(lambda: _index(vendor, iter_records(path)))
+        click.echo(
+            f"{vendor:<16} {count:>8} {t_gen * 1e3:>13.1f} {m_gen / 2**20:>9.2f} "
+            f"{t_disk * 1e3:>17.1f} {m_disk / 2**20:>9.2f}"
+        )
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,50 @@
+import contextlib
+import importlib
+import importlib.util
+import io
 import json
+import os
 import shutil
+import sys
+import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
 import click
 
-from vendor_radix_ui_icons import process as process_radix
-from vendor_heroicons import process as process_heroicons
-from vendor_lucide_icons import process as process_lucide
-from vendor_phosphor_icons import process as process_phosphor
-from vendor_octicons import process as process_octicons
-from vendor_svgl import process as process_svgl
+# Only what the command definitions need is imported up front; modules used by
+# one command (blob store, catalogs, indexes, file cache) are imported inside it
+# (see benchmarks/startup.py)
+from utils import trace
+from utils.precompress import ENCODINGS, precompress_tree, write_manifest, zstd_available
+from utils.records import (
+    collect_records,
+    format_option,
+    iter_records,
+    records_path,
+    remove_other_formats,
+    staged_as,
+    write_package,
+)
+from utils.svg_optimize import DEFAULT_PRECISION, OptimizeStats, optimize_tree
+from utils.sync import (
+    LINK_MODES,
+    SourceFile,
+    SyncStats,
+    prune_tree,
+    scan_tree,
+    sync_file,
+    sync_tree,
+    walk_files,
+    write_if_changed,
+)
+from utils.vendors import VENDOR_MODULES
+
+if TYPE_CHECKING:
+    from utils.blob_store import BlobStore
+    from utils.concepts import ConceptIndexBuilder
+    from utils.file_cache import FileCache
+    from utils.search import SearchIndexBuilder
 
 
 ROOT = Path(__file__).parent.parent
@@ -17,13 +52,41 @@ DIST_DIR = ROOT / "dist"
 CACHE_DIR = DIST_DIR / ".cache"
 
 
+def _vendor_command(vendor: str) -> click.Command:
+    return importlib.import_module(VENDOR_MODULES[vendor]).process
+
+
+class LazyGroup(click.Group):
+    """
+    A click group whose `lazy_commands` (name -> loader) are only created, and
+    their modules imported, when the command is looked up.
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, Callable[[], click.Command]], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, name: str) -> click.Command | None:
+        if name in self.lazy_commands and name not in self.commands:
+            self.add_command(self.lazy_commands[name](), name=name)
+        return super().get_command(ctx, name)
+
+
 @click.group()
 def cli():
     """Root CLI."""
     pass
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        vendor: lambda vendor=vendor: _vendor_command(vendor) for vendor in VENDOR_MODULES
+    },
+)
 def cache():
     """
     Cache vendor-native metadata and SVG info.
@@ -31,34 +94,227 @@ def cache():
     pass
 
 
-# Register individual vendor commands under cache
-cache.add_command(process_radix, name="radix-ui-icons")
-cache.add_command(process_heroicons, name="heroicons")
-cache.add_command(process_lucide, name="lucide-icons")
-cache.add_command(process_phosphor, name="phosphor-icons")
-cache.add_command(process_octicons, name="octicons")
-cache.add_command(process_svgl, name="svgl")
+def _swap_dir(staging: Path, out: Path):
+    """
+    Replace `out` with `staging` using renames, so readers never see a partial directory.
+    """
+    backup = out.with_name(f".{out.name}.old")
+    if backup.exists():
+        shutil.rmtree(backup)
+    if out.exists():
+        out.rename(backup)
+    staging.rename(out)
+    if backup.exists():
+        shutil.rmtree(backup)
+
+
+def _vendor_fingerprint(vendor: str) -> str | None:
+    """
+    Fingerprint a vendor by its submodule commit and the code that processes it.
+    """
+    from utils.file_cache import vendor_fingerprint
+
+    # Located without importing it, so skipped vendors are never loaded
+    module = importlib.util.find_spec(VENDOR_MODULES[vendor])
+    utils_dir = ROOT / "pipeline" / "utils"
+    return vendor_fingerprint(
+        ROOT / "vendor" / vendor,
+        [Path(module.origin), *sorted(utils_dir.glob("*.py"))],
+    )
+
+
+def _read_fingerprint(out: Path, fmt: str) -> str | None:
+    path = out / ".fingerprint"
+    if not path.exists() or not records_path(out, "metadata", fmt).exists():
+        return None
+    return path.read_text().strip()
+
+
+def _package_record(record: Any) -> Any:
+    """
+    What `_write_packages` reads of a cache record: its dist path and properties,
+    and the fields the search and concept indexes are built from.
+    """
+    from utils.search import search_record
+
+    if not isinstance(record, dict):
+        return record
+    return {**search_record(record), "properties": record.get("properties", {})}
+
+
+def _run_vendor(
+    vendor: str,
+    out: Path,
+    capture: bool,
+    fingerprint: str | None = None,
+    fmt: str = "json",
+    trace_memory: bool | None = None,
+    keep_records: bool = False,
+    files: dict[str, bytes] | None = None,
+) -> tuple[str, bool, str, list[dict], list[Any] | None]:
+    """
+    Run one vendor processor into a staging directory and swap it into `out` on success.
+    A failing processor leaves the previous contents of `out` untouched.
+    When `capture` is set, output is buffered and returned instead of printed.
+    `trace_memory` is set when the caller traces (see utils/trace.py); a worker
+    process then records its own span and returns it.
+    With `keep_records`, the metadata records written are also returned (the part
+    `_write_packages` reads), so an in-process caller does not have to read them
+    back from disk. `files` holds source contents already read, by path, which
+    the processor uses instead of reading them again.
+    Returns (vendor, ok, captured output, trace events from this worker, records or None).
+    """
+    command = _vendor_command(vendor)
+    staging = out.with_name(f".{out.name}.tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+
+    own_tracer = trace_memory is not None and trace.active() is None
+    if own_tracer:
+        trace.start(memory=trace_memory)
+    buf = io.StringIO()
+    ok = True
+    records = None
+    with trace.span(f"process {vendor}", vendor=vendor) as span:
+        with contextlib.ExitStack() as stack:
+            if capture:
+                stack.enter_context(contextlib.redirect_stdout(buf))
+                stack.enter_context(contextlib.redirect_stderr(buf))
+            # Logs name the cache path the staging directory is swapped into
+            stack.enter_context(staged_as(staging, out))
+            if files:
+                from utils.file_cache import preread
+
+                stack.enter_context(preread(files))
+            collected = (
+                stack.enter_context(collect_records(_package_record)) if keep_records else None
+            )
+            try:
+                command.callback(out=staging, fmt=fmt)
+            except SystemExit as e:
+                ok = e.code in (None, 0)
+            except Exception:
+                traceback.print_exc()
+                ok = False
+        span["ok"] = ok
+
+        if ok:
+            if collected is not None:
+                records = collected.get(str(records_path(staging, "metadata", fmt)))
+            if fingerprint:
+                (staging / ".fingerprint").write_text(fingerprint + "\n")
+            _swap_dir(staging, out)
+        elif staging.exists():
+            shutil.rmtree(staging)
+    events = trace.stop().events if own_tracer else []
+    return vendor, ok, buf.getvalue(), events, records
 
 
 @cache.command(name="all")
-@click.pass_context
-def cache_all(ctx):
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of vendor processors to run in parallel.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Process every vendor, even when its submodule commit is unchanged.",
+)
+@format_option
+def cache_all(jobs: int, force: bool, fmt: str):
     """
     Run all vendor processors.
+    Vendors whose submodule commit and processor code are unchanged since the last run are skipped.
+    """
+    return _cache_all(jobs, force, fmt)
+
+
+def _cache_all(
+    jobs: int,
+    force: bool,
+    fmt: str,
+    sources: dict[str, dict[str, bytes]] | None = None,
+) -> dict[str, list[Any]]:
     """
+    `cache all`. `sources` holds, per vendor, file contents the caller already
+    read (by path), handed to the processors instead of reading the files again.
+    Returns the records (see `_package_record`) of the vendors processed in
+    this process, by vendor.
+    """
+    sources = sources or {}
     click.echo("Running all processors...")
-    ctx.invoke(process_radix, out=CACHE_DIR / "radix-ui-icons")
-    click.echo("-" * 20)
-    ctx.invoke(process_heroicons, out=CACHE_DIR / "heroicons")
-    click.echo("-" * 20)
-    ctx.invoke(process_lucide, out=CACHE_DIR / "lucide-icons")
-    click.echo("-" * 20)
-    ctx.invoke(process_phosphor, out=CACHE_DIR / "phosphor-icons")
-    click.echo("-" * 20)
-    ctx.invoke(process_octicons, out=CACHE_DIR / "octicons")
-    click.echo("-" * 20)
-    ctx.invoke(process_svgl, out=CACHE_DIR / "svgl")
+    fingerprints = {vendor: _vendor_fingerprint(vendor) for vendor in VENDOR_MODULES}
+    vendors = []
+    for vendor, fingerprint in fingerprints.items():
+        if (
+            not force
+            and fingerprint
+            and _read_fingerprint(CACHE_DIR / vendor, fmt) == fingerprint
+        ):
+            click.echo(f"Skipping {vendor}: unchanged since last run.")
+        else:
+            vendors.append(vendor)
+
+    tracer = trace.active()
+    trace_memory = tracer.memory if tracer else None
+    results = []
+    if jobs == 1 or not vendors:
+        for i, vendor in enumerate(vendors):
+            if i:
+                click.echo("-" * 20)
+            results.append(
+                _run_vendor(
+                    vendor,
+                    CACHE_DIR / vendor,
+                    False,
+                    fingerprints[vendor],
+                    fmt,
+                    trace_memory,
+                    keep_records=True,
+                    files=sources.get(vendor),
+                )
+            )
+    else:
+        from utils.pool import process_pool
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with process_pool(jobs, len(vendors)) as pool:
+            futures = [
+                pool.submit(
+                    _run_vendor,
+                    vendor,
+                    CACHE_DIR / vendor,
+                    True,
+                    fingerprints[vendor],
+                    fmt,
+                    trace_memory,
+                    files=sources.get(vendor),
+                )
+                for vendor in vendors
+            ]
+            # Print each vendor's buffered log as one block, in a stable order
+            for i, future in enumerate(futures):
+                result = future.result()
+                if i:
+                    click.echo("-" * 20)
+                click.echo(f"[{result[0]}]")
+                click.echo(result[2], nl=False)
+                trace.extend(result[3])
+                results.append(result)
+
+    failed = [vendor for vendor, ok, *_ in results if not ok]
+    if failed:
+        click.echo(
+            f"PANIC: Processors failed: {', '.join(failed)}. Their previous cache was kept.",
+            err=True,
+        )
+        sys.exit(1)
     click.echo("All processors finished.")
+    return {vendor: records for vendor, ok, _, _, records in results if records is not None}
 
 
 @cache.command(name="clean")
@@ -73,26 +329,90 @@ def cache_clean():
         click.echo("Cache directory not found; nothing to clean.")
 
 
-def _copy_svgs(src: Path, dst: Path):
+def _copy_svgs(
+    src: Path,
+    dst: Path,
+    link: str = "auto",
+    precision: Optional[int] = None,
+    jobs: int = 1,
+    files: Optional[list[SourceFile]] = None,
+    canonical: bool = False,
+) -> Optional[OptimizeStats]:
     """
-    Copy only .svg files from src to dst, preserving directory structure.
+    Sync only .svg files from src to dst, preserving directory structure.
+    Unchanged files are left untouched and files no longer in src are removed.
+    With a precision, files are minified on the way (see utils/svg_optimize.py),
+    in canonical form when `canonical` (the bytes of their blob under --dedupe),
+    and the minified bytes are kept in the returned stats' `outputs`.
+    `files` is the `scan_tree(src)` inventory, used instead of re-reading src.
     """
-    if dst.exists():
-        shutil.rmtree(dst)
-    if not src.exists():
-        return
-    dst.mkdir(parents=True, exist_ok=True)
-    for path in src.rglob("*"):
-        if path.is_file() and path.suffix.lower() == ".svg":
-            rel = path.relative_to(src)
-            target = dst / rel
-            target.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(path, target)
+    with trace.span(f"copy_svgs {dst.parent.name}", vendor=dst.parent.name) as span:
+        if precision is None:
+            stats = sync_tree(src, dst, suffix=".svg", mode=link, files=files)
+            span.update(copied=stats.copied, removed=stats.removed, unchanged=stats.unchanged)
+            click.echo(f"Synced {dst.relative_to(ROOT)}: {stats}")
+            return None
+        opt_stats = optimize_tree(
+            src,
+            dst,
+            precision=precision,
+            jobs=jobs,
+            canonical=canonical,
+            files=files,
+            keep_outputs=True,
+        )
+        span.update(
+            files=opt_stats.files,
+            bytes_before=opt_stats.bytes_before,
+            bytes_after=opt_stats.bytes_after,
+            invalid=len(opt_stats.invalid),
+        )
+        click.echo(f"Optimized {dst.relative_to(ROOT)}: {opt_stats}")
+        return opt_stats
 
 
-def _copy_file(src: Path, dst: Path):
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
+def _link_blobs(
+    vendor: str,
+    contents: list[tuple[str, str, bytes]],
+    dst: Path,
+    store: "BlobStore",
+    blob_cache: "FileCache",
+) -> tuple[list[tuple[str, str, bytes]], dict[str, str]]:
+    """
+    Add each (rel, path, bytes) SVG to the blob store and make dst/<rel> a
+    hardlink of its blob; SVGs under dst that are not listed are removed.
+    Hashes are cached per path. Returns the SVGs as (rel, dist path, blob bytes)
+    and the dist path (`src/...`) -> hash map for data.json.
+    """
+    from utils.blob_store import canonical_digest
+
+    with trace.span(f"dedupe {vendor}", vendor=vendor) as span:
+        stats = SyncStats()
+        linked = []
+        digests = {}
+        for rel, path, data in contents:
+            digest = blob_cache.get(Path(path), "blob", canonical_digest, from_bytes=True, data=data)
+            digests[f"src/{rel}"] = digest
+            blob = store.add(f"{vendor}/src/{rel}", digest, data)
+            if store.link(dst / rel, digest):
+                stats.copied += 1
+            else:
+                stats.unchanged += 1
+            linked.append((rel, os.path.join(dst, rel), blob))
+        existing = {
+            rel: path for rel, path in walk_files(dst).items() if rel.lower().endswith(".svg")
+        }
+        stats.removed = prune_tree(dst, existing, [rel for rel, _, _ in contents])
+        span.update(linked=stats.copied, removed=stats.removed, unchanged=stats.unchanged)
+        click.echo(
+            f"Linked {dst.relative_to(ROOT)} to blobs: {stats.copied} linked, "
+            f"{stats.removed} removed, {stats.unchanged} unchanged"
+        )
+    return linked, digests
+
+
+def _copy_file(src: Path, dst: Path, link: str = "auto"):
+    sync_file(src, dst, mode=link)
 
 
 def _copy_license(src_dir: Path, dst_dir: Path):
@@ -113,14 +433,15 @@ def _ensure_dist_placeholders():
     (LICENSE is generated from vendor licenses during dist build.)
     """
     DIST_DIR.mkdir(parents=True, exist_ok=True)
-    (DIST_DIR / ".gitkeep").write_text("")
-    (DIST_DIR / ".gitignore").write_text(".cache/\n")
+    write_if_changed(DIST_DIR / ".gitkeep", "")
+    write_if_changed(DIST_DIR / ".gitignore", ".cache/\n")
     templates_dir = ROOT / "pipeline" / "templates"
     readme_template = templates_dir / "README.dist.md"
     if readme_template.exists():
-        (DIST_DIR / "README.md").write_text(readme_template.read_text())
+        write_if_changed(DIST_DIR / "README.md", readme_template.read_text())
     else:
-        (DIST_DIR / "README.md").write_text(
+        write_if_changed(
+            DIST_DIR / "README.md",
             "# Distribution\n\nBuilt icon metadata and assets.\n"
         )
 
@@ -154,71 +475,37 @@ def _write_merged_license():
             parts.append("\n")
     out = DIST_DIR / "LICENSE"
     if parts:
-        out.write_text("".join(parts))
+        write_if_changed(out, "".join(parts))
     else:
-        out.write_text("No vendor licenses found.\n")
+        write_if_changed(out, "No vendor licenses found.\n")
 
 
-@click.command()
-@click.pass_context
-def dist(ctx):
+def _write_packages(
+    vendor_meta: dict[str, Path | Iterable[dict]],
+    fmt: str,
+    blob_digests: dict[str, dict[str, str]],
+    blob_ids: Optional[dict[str, int]] = None,
+    svg_files: Optional[dict[str, list[str]]] = None,
+    geometry: Optional[dict[str, dict[str, dict]]] = None,
+) -> tuple[list[tuple[str, dict]], "SearchIndexBuilder", "ConceptIndexBuilder"]:
     """
-    Build dist outputs: clean cache, cache all vendors, then copy metadata and SVGs into dist/.
+    Assemble dist/<vendor>/data.json (or data.ndjson) and data.min.json from the
+    vendor cache records and the SVGs already synced into dist/<vendor>/src.
+    `vendor_meta` holds each vendor's records file, or the records themselves:
+    a list still in memory, or a generator such as `utils.vendors.vendor_metadata`,
+    consumed once as the package is written; `svg_files` lists each vendor's SVGs (relative to
+    src/, in `scan_tree` order) so dist/ does not have to be walked again.
+    `blob_ids` maps each content hash to its position in `blobs/hashes.json`,
+    which is what data.min.json stores (`dist --dedupe`).
+    `geometry` holds per-file metrics from the geometry stores (`dist --geometry`).
+    Returns the (vendor, file entry) pairs and the search and concept indexes fed
+    along the way.
     """
-    # Clean dist first
-    ctx.invoke(clean)
-    # Clean cache first
-    ctx.invoke(cache_clean)
-    # Rebuild cache
-    ctx.invoke(cache_all)
-
-    _ensure_dist_placeholders()
+    from utils.columnar import ColumnarBuilder
+    from utils.concepts import ConceptIndexBuilder
+    from utils.search import SearchIndexBuilder
 
-    vendor_meta = {
-        "radix-ui-icons": CACHE_DIR / "radix-ui-icons" / "metadata.json",
-        "heroicons": CACHE_DIR / "heroicons" / "metadata.json",
-        "lucide-icons": CACHE_DIR / "lucide-icons" / "metadata.json",
-        "phosphor-icons": CACHE_DIR / "phosphor-icons" / "metadata.json",
-        "octicons": CACHE_DIR / "octicons" / "metadata.json",
-        "svgl": CACHE_DIR / "svgl" / "metadata.json",
-    }
-
-    # Copy licenses
-    _copy_license(ROOT / "vendor" / "radix-ui-icons", DIST_DIR / "radix-ui-icons")
-    _copy_license(ROOT / "vendor" / "heroicons", DIST_DIR / "heroicons")
-    _copy_license(ROOT / "vendor" / "lucide-icons", DIST_DIR / "lucide-icons")
-    _copy_license(ROOT / "vendor" / "phosphor-icons", DIST_DIR / "phosphor-icons")
-    _copy_license(ROOT / "vendor" / "octicons", DIST_DIR / "octicons")
-    _copy_license(ROOT / "vendor" / "svgl", DIST_DIR / "svgl")
-
-    # Copy SVG assets per vendor
-    # Unified layout: assets under dist/<vendor>/src/
-    _copy_svgs(
-        ROOT / "vendor" / "radix-ui-icons" / "packages" / "radix-icons" / "icons",
-        DIST_DIR / "radix-ui-icons" / "src",
-    )
-    _copy_svgs(
-        ROOT / "vendor" / "heroicons" / "src",
-        DIST_DIR / "heroicons" / "src",
-    )
-    _copy_svgs(
-        ROOT / "vendor" / "lucide-icons" / "icons",
-        DIST_DIR / "lucide-icons" / "src",
-    )
-    _copy_svgs(
-        ROOT / "vendor" / "phosphor-icons" / "assets",
-        DIST_DIR / "phosphor-icons" / "src",
-    )
-    _copy_svgs(
-        ROOT / "vendor" / "octicons" / "icons",
-        DIST_DIR / "octicons" / "src",
-    )
-    _copy_svgs(
-        ROOT / "vendor" / "svgl" / "static" / "library",
-        DIST_DIR / "svgl" / "src",
-    )
-
-    # Package metadata (SPEC package schema) -> dist/<vendor>/data.json
+    # Package metadata (SPEC package schema) -> dist/<vendor>/data.json (or data.ndjson)
     vendor_packages = {
         "radix-ui-icons": {},
         "heroicons": {},
@@ -229,23 +516,48 @@ def dist(ctx):
     }
     templates_dir = ROOT / "pipeline" / "templates"
 
-    def _load_meta_map(meta_path: Path) -> dict[str, dict]:
-        if not meta_path.exists():
-            return {}
-        try:
-            data = json.loads(meta_path.read_text())
-        except Exception:
-            return {}
+    search_index = SearchIndexBuilder()
+    concept_index = ConceptIndexBuilder()
+
+    def _load_meta_map(vendor: str, meta: Path | Iterable[dict]) -> dict[str, dict]:
+        # Streams the cache records; only dist_path -> properties is kept,
+        # search terms (names, tags, aliases, ...) go to the search and concept indexes
         by_path: dict[str, dict] = {}
-        if isinstance(data, list):
-            for rec in data:
-                if not isinstance(rec, dict):
-                    continue
-                dist_path = rec.get("dist_path")
-                if dist_path:
-                    by_path[dist_path] = rec.get("properties", {})
+        for rec in iter_records(meta) if isinstance(meta, Path) else meta:
+            if not isinstance(rec, dict):
+                continue
+            search_index.add_record(vendor, rec)
+            concept_index.add_record(vendor, rec)
+            dist_path = rec.get("dist_path")
+            if dist_path:
+                by_path[dist_path] = rec.get("properties", {})
         return by_path
 
+    def _file_entries(vendor: str, by_path: dict[str, dict]):
+        if svg_files is not None and vendor in svg_files:
+            rels = svg_files[vendor]
+        else:
+            # Only the SVGs themselves, not their precompressed siblings
+            rels = sorted(
+                (rel for rel in walk_files(DIST_DIR / vendor / "src") if rel.lower().endswith(".svg")),
+                key=lambda rel: rel.split("/"),
+            )
+        for rel in rels:
+            rel_path = f"src/{rel}"
+            entry = {
+                "name": os.path.splitext(rel.rpartition("/")[2])[0],
+                "file": rel_path,
+                "properties": by_path.get(rel_path, {}),
+            }
+            if vendor in blob_digests:
+                entry["blob"] = blob_digests[vendor][rel_path]
+            if geometry and vendor in geometry:
+                entry["geometry"] = geometry[vendor].get(rel_path)
+            yield entry
+
+    # (vendor, file entry) pairs across all vendors for dist/catalog.bin
+    catalog_entries: list[tuple[str, dict]] = []
+
     # Attach flat file list (relative paths under dist/<vendor>)
     for vendor, pkg in vendor_packages.items():
         template_path = templates_dir / f"{vendor}.spec.json"
@@ -254,47 +566,571 @@ def dist(ctx):
                 pkg.update(json.loads(template_path.read_text()))
             except Exception:
                 pass
-        by_path = _load_meta_map(vendor_meta.get(vendor, Path("")))
-        src_root = DIST_DIR / vendor / "src"
-        file_entries = []
-        if src_root.exists():
-            for p in sorted(src_root.rglob("*")):
-                if p.is_file():
-                    rel_path = str(p.relative_to(DIST_DIR / vendor))
-                    name = p.stem
-                    properties = by_path.get(rel_path, {})
-                    file_entries.append(
-                        {
-                            "name": name,
-                            "file": rel_path,
-                            "properties": properties,
-                        }
-                    )
-        pkg["files"] = file_entries
-        out_pkg = DIST_DIR / vendor / "data.json"
-        out_pkg.parent.mkdir(parents=True, exist_ok=True)
-        out_pkg.write_text(json.dumps(pkg, indent=2))
+        with trace.span(f"data.json {vendor}", vendor=vendor):
+            by_path = _load_meta_map(vendor, vendor_meta[vendor])
+            columnar = ColumnarBuilder(pkg, blob_ids)
+
+            def _entries():
+                for entry in _file_entries(vendor, by_path):
+                    trace.count("files")
+                    columnar.add(entry)
+                    catalog_entries.append((vendor, entry))
+                    yield entry
+
+            # Entries are compared with the existing file as they are produced;
+            # it is only rewritten when they differ
+            write_package(records_path(DIST_DIR / vendor, "data", fmt), pkg, _entries(), fmt)
+            remove_other_formats(DIST_DIR / vendor, "data", fmt)
+            # Compact columnar variant for clients (see utils/columnar.py)
+            write_if_changed(DIST_DIR / vendor / "data.min.json", columnar.dumps())
+
+    return catalog_entries, search_index, concept_index
+
+
+@click.command()
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of vendor processors (and SVG optimizer workers) to run in parallel.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Process every vendor, even when its submodule commit is unchanged.",
+)
+@click.option(
+    "--clean",
+    "clean_first",
+    is_flag=True,
+    help="Remove dist outputs before building instead of syncing them in place.",
+)
+@click.option(
+    "--link",
+    type=click.Choice(LINK_MODES),
+    default="auto",
+    show_default=True,
+    help="How SVGs are materialized in dist: reflink when possible (auto), copy, hardlink or reflink.",
+)
+@click.option(
+    "--optimize",
+    is_flag=True,
+    help="Minify SVGs into dist (strip metadata and comments, round coordinates) instead of copying them.",
+)
+@click.option(
+    "--precision",
+    type=click.IntRange(min=0),
+    default=DEFAULT_PRECISION,
+    show_default=True,
+    help="Decimal places kept in coordinates when optimizing.",
+)
+@click.option(
+    "--precompress",
+    type=click.Choice(tuple(ENCODINGS)),
+    multiple=True,
+    help="Write precompressed .gz/.zst siblings of SVGs, metadata and packed files (repeatable).",
+)
+@click.option(
+    "--dedupe",
+    is_flag=True,
+    help="Store SVGs once per content hash under dist/blobs and reference the hash from data.json.",
+)
+@click.option(
+    "--geometry",
+    is_flag=True,
+    help="Parse SVG geometry into per-vendor NumPy stores and add bounding boxes and complexity metrics to data.json (needs numpy).",
+)
+@click.option(
+    "--similar",
+    is_flag=True,
+    help="Build the perceptual-hash index behind `similar` from the geometry stores (implies --geometry).",
+)
+@click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write a Chrome trace (Perfetto / chrome://tracing) of the build stages to this file.",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    help="With --trace, also record the tracemalloc peak per stage (slower).",
+)
+@format_option
+@click.pass_context
+def dist(
+    ctx,
+    jobs: int,
+    force: bool,
+    clean_first: bool,
+    link: str,
+    optimize: bool,
+    precision: int,
+    precompress: tuple[str, ...],
+    dedupe: bool,
+    geometry: bool,
+    similar: bool,
+    trace_path: Path | None,
+    trace_memory: bool,
+    fmt: str,
+):
+    """
+    Build dist outputs: refresh cache for all vendors, then sync metadata and SVGs into dist/.
+    Only new or changed files are written; a no-op rebuild leaves dist/ untouched.
+    """
+    if "zstd" in precompress and not zstd_available():
+        raise click.BadParameter(
+            "zstd needs the zstandard package (pip install zstandard)",
+            param_hint="--precompress",
+        )
+    from utils.geometry import numpy_available
+
+    if (geometry or similar) and not numpy_available():
+        raise click.BadParameter(
+            "needs the numpy package (pip install numpy)",
+            param_hint="--similar" if similar else "--geometry",
+        )
+    if trace_path:
+        trace.start(memory=trace_memory)
+    try:
+        with trace.span("dist"):
+            _build_dist(
+                ctx,
+                jobs,
+                force,
+                clean_first,
+                link,
+                optimize,
+                precision,
+                precompress,
+                dedupe,
+                geometry or similar,
+                similar,
+                fmt,
+            )
+    finally:
+        # Written even when a stage fails, so the failing span can be inspected
+        tracer = trace.stop()
+        if tracer and trace_path:
+            tracer.dump(trace_path)
+            click.echo(f"Wrote trace to {trace_path}")
+
+
+def _build_dist(
+    ctx,
+    jobs: int,
+    force: bool,
+    clean_first: bool,
+    link: str,
+    optimize: bool,
+    precision: int,
+    precompress: tuple[str, ...],
+    dedupe: bool,
+    geometry: bool,
+    similar: bool,
+    fmt: str,
+):
+    from utils.binary_catalog import build_catalog
+    from utils.blob_store import BlobStore
+    from utils.file_cache import load_file_cache
+    from utils.svg_pack import build_pack
+
+    # NumPy comes in with these; only `dist` pays for it
+    from utils.geometry import GeometryStore
+    from utils.similar import SimilarityIndex
+
+    if clean_first:
+        with trace.span("clean"):
+            ctx.invoke(clean)
+
+    # Unified layout: assets under dist/<vendor>/src/
+    svg_sources = {
+        "radix-ui-icons": ROOT / "vendor" / "radix-ui-icons" / "packages" / "radix-icons" / "icons",
+        "heroicons": ROOT / "vendor" / "heroicons" / "src",
+        "lucide-icons": ROOT / "vendor" / "lucide-icons" / "icons",
+        "phosphor-icons": ROOT / "vendor" / "phosphor-icons" / "assets",
+        "octicons": ROOT / "vendor" / "octicons" / "icons",
+        "svgl": ROOT / "vendor" / "svgl" / "static" / "library",
+    }
+    # One listing and one read per source SVG feeds the processors, the sync,
+    # the pack and the blob store
+    scanned: dict[str, list[SourceFile]] = {}
+    for vendor, src in svg_sources.items():
+        with trace.span(f"scan {vendor}", vendor=vendor) as span:
+            scanned[vendor] = scan_tree(src)
+            span["files"] = len(scanned[vendor])
+
+    # Refresh cache; unchanged vendors and files are reused from .cache
+    with trace.span("cache all"):
+        fresh_records = _cache_all(
+            jobs,
+            force,
+            fmt,
+            {
+                vendor: {file.path: file.data for file in files}
+                for vendor, files in scanned.items()
+            },
+        )
+
+    _ensure_dist_placeholders()
+
+    # Records of vendors just processed in this process are used as-is; the
+    # others are streamed from their cache file
+    vendor_meta = {
+        vendor: fresh_records.get(vendor, records_path(CACHE_DIR / vendor, "metadata", fmt))
+        for vendor in VENDOR_MODULES
+    }
+
+    # Copy licenses
+    with trace.span("licenses"):
+        for vendor in VENDOR_MODULES:
+            _copy_license(ROOT / "vendor" / vendor, DIST_DIR / vendor)
+
+    # Copy SVG assets per vendor
+    # Content-addressed blobs (see utils/blob_store.py): dist path -> hash per vendor
+    blob_digests: dict[str, dict[str, str]] = {}
+    blobs_dir = DIST_DIR / "blobs"
+    dedupe_report = DIST_DIR / "dedupe.json"
+    if dedupe:
+        store = BlobStore(blobs_dir)
+        # Canonical hashes are cached per dist file, so only changed SVGs are re-hashed
+        blob_cache = load_file_cache("dist-blobs")
+
+    optimize_report = {}
+    svg_files: dict[str, list[str]] = {}
+    geometry_metrics: dict[str, dict[str, dict]] = {}
+    geometry_stores: dict[str, GeometryStore] = {}
+    for vendor, src in svg_sources.items():
+        # Each SVG is read once, by the scan: the copy, the optimizer, the blob
+        # store, svgs.pack and geometry all work from those bytes (or the
+        # optimizer's output)
+        files = scanned.pop(vendor)
+        svg_files[vendor] = [file.rel for file in files]
+        dst = DIST_DIR / vendor / "src"
+        if dedupe and not optimize:
+            # dist paths become hardlinks of their blobs; nothing is copied
+            opt_stats = None
+            contents = [(file.rel, file.path, file.data) for file in files]
+        else:
+            opt_stats = _copy_svgs(
+                src,
+                dst,
+                link,
+                precision=precision if optimize else None,
+                jobs=jobs,
+                files=files,
+                canonical=dedupe,
+            )
+        if opt_stats is not None:
+            optimize_report[vendor] = opt_stats.report(precision)
+            contents = [
+                (rel, os.path.join(dst, rel), data)
+                for rel, data in sorted(opt_stats.outputs.items())
+            ]
+        elif not dedupe:
+            contents = [(file.rel, os.path.join(dst, file.rel), file.data) for file in files]
+        if dedupe:
+            contents, blob_digests[vendor] = _link_blobs(vendor, contents, dst, store, blob_cache)
+        # All of the vendor's SVGs in one mmap-able file (see utils/svg_pack.py)
+        with trace.span(f"svgs.pack {vendor}", vendor=vendor):
+            pack = build_pack([(f"src/{rel}", data) for rel, _, data in contents])
+            write_if_changed(DIST_DIR / vendor / "svgs.pack", pack)
+        # Flat coordinate arrays and per-icon metrics (see utils/geometry.py)
+        if geometry:
+            with trace.span(f"geometry {vendor}", vendor=vendor) as span:
+                geometry_store, written = GeometryStore.update(
+                    DIST_DIR / vendor,
+                    [(f"src/{rel}", data) for rel, _, data in contents],
+                    jobs,
+                )
+                geometry_stores[vendor] = geometry_store
+                geometry_metrics[vendor] = geometry_store.icon_metrics()
+                span.update(
+                    files=len(geometry_store.files),
+                    segments=len(geometry_store.kinds),
+                    written=written,
+                )
+        else:
+            GeometryStore.remove(DIST_DIR / vendor)
+    # Bytes before/after per vendor; only present when dist/ holds optimized SVGs
+    report_path = DIST_DIR / "optimize.json"
+    if optimize:
+        write_if_changed(report_path, json.dumps(optimize_report, indent=2) + "\n")
+    elif report_path.exists():
+        report_path.unlink()
+
+    if dedupe:
+        with trace.span("dedupe") as span:
+            store.finish()
+            blob_cache.save()
+            report = store.report()
+            span.update(files=report["files"], blobs=report["blobs"], written=store.written)
+            write_if_changed(dedupe_report, json.dumps(report, indent=2) + "\n")
+            click.echo(
+                f"Deduplicated {report['files']} SVGs into {report['blobs']} blobs "
+                f"({store.written} written, {store.removed} removed), "
+                f"ratio {report['duplication_ratio']}"
+            )
+    else:
+        if blobs_dir.exists():
+            shutil.rmtree(blobs_dir)
+        if dedupe_report.exists():
+            dedupe_report.unlink()
+
+    # Perceptual hashes for `similar` (see utils/similar.py)
+    if similar:
+        with trace.span("similar") as span:
+            try:
+                previous = SimilarityIndex.load(DIST_DIR)
+            except (OSError, ValueError):
+                previous = None
+            similar_index = SimilarityIndex.build(geometry_stores.items(), previous)
+            written = similar_index.save(DIST_DIR)
+            span.update(icons=len(similar_index.icons), written=written)
+    else:
+        SimilarityIndex.remove(DIST_DIR)
+
+    with trace.span("metadata"):
+        catalog_entries, search_index, concept_index = _write_packages(
+            vendor_meta,
+            fmt,
+            blob_digests,
+            {digest: i for i, digest in enumerate(store.hashes())} if dedupe else None,
+            svg_files if not optimize else None,
+            geometry_metrics,
+        )
+
+    # Memory-mappable lookup index over all vendors (see utils/binary_catalog.py)
+    with trace.span("catalog.bin", files=len(catalog_entries)):
+        write_if_changed(DIST_DIR / "catalog.bin", build_catalog(catalog_entries))
+    # Prebuilt search index (see utils/search.py)
+    with trace.span("search.json"):
+        write_if_changed(DIST_DIR / "search.json", search_index.dumps())
+    # Cross-vendor name/alias/keyword joins (see utils/concepts.py)
+    with trace.span("concepts.json"):
+        write_if_changed(DIST_DIR / "concepts.json", concept_index.dumps())
 
     # Merge licenses into dist/LICENSE
-    _write_merged_license()
+    with trace.span("merged license"):
+        _write_merged_license()
+
+    # Precompressed siblings; run last so they cover every artifact written above.
+    # Without --precompress this removes siblings left by an earlier build.
+    with trace.span("precompress") as span:
+        manifest, written, removed = precompress_tree(DIST_DIR, precompress, jobs=jobs)
+        write_manifest(DIST_DIR, manifest)
+        span.update(files=len(manifest), written=written, removed=removed)
+    if precompress or removed:
+        click.echo(
+            f"Precompressed {len(manifest)} files ({', '.join(precompress) or 'none'}): "
+            f"{written} written, {removed} removed"
+        )
 
     click.echo(f"Dist build complete at {DIST_DIR}")
 
 
 @click.command(name="clean")
 def clean():
-    """Remove the dist directory and recreate placeholders."""
+    """Remove the dist outputs (keeping .cache) and recreate placeholders."""
     if DIST_DIR.exists():
-        shutil.rmtree(DIST_DIR)
-        click.echo(f"Removed dist directory: {DIST_DIR}")
+        for child in DIST_DIR.iterdir():
+            if child == CACHE_DIR:
+                continue
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+        click.echo(f"Removed dist outputs: {DIST_DIR}")
     _ensure_dist_placeholders()
     click.echo("Dist directory reset with placeholders (.gitkeep, README.md).")
 
 
-# Expose only cache and dist at the root
+@click.command()
+@click.argument("query")
+@click.option("--vendor", help="Only return icons from this vendor.")
+@click.option("--limit", type=int, default=20, show_default=True)
+def search(query: str, vendor: str | None, limit: int):
+    """
+    Search icons by name, alias, tag, keyword or category (typo-tolerant).
+    Uses the index built by `dist`.
+    """
+    from utils.search import SearchIndex
+
+    index_path = DIST_DIR / "search.json"
+    if not index_path.exists():
+        click.echo(f"Search index {index_path} not found; run `dist` first.", err=True)
+        sys.exit(1)
+    index = SearchIndex.load(index_path)
+    for hit in index.search(query, limit=limit, vendor=vendor):
+        click.echo(f"{hit.score:6.2f}  {hit.vendor}/{hit.name}  ({len(hit.files)} files)")
+
+
+@click.command()
+@click.argument("name")
+@click.option("--vendor", help="Only return icons from this vendor.")
+@click.option("--to", type=click.Choice(list(VENDOR_MODULES)), help="Swap NAME (<vendor>/<name>) into this vendor.")
+def concept(name: str, vendor: str | None, to: str | None):
+    """
+    List every vendor's icons for the concept NAME (a name, alias or synonym),
+    or with --to, the counterpart of the icon <vendor>/<name> in another vendor.
+    Uses the table built by `dist`.
+    """
+    from utils.concepts import ConceptIndex
+
+    index_path = DIST_DIR / "concepts.json"
+    if not index_path.exists():
+        click.echo(f"Concept table {index_path} not found; run `dist` first.", err=True)
+        sys.exit(1)
+    index = ConceptIndex.load(index_path)
+    if to:
+        src_vendor, _, src_name = name.partition("/")
+        try:
+            hit = index.swap(src_vendor, src_name, to)
+        except KeyError:
+            click.echo(f"Unknown icon {name!r}; expected <vendor>/<name>.", err=True)
+            sys.exit(1)
+        hits = [hit] if hit else []
+    else:
+        hits = index.lookup(name, vendor=vendor)
+    for hit in hits:
+        click.echo(f"{hit.via:<8} {hit.vendor}/{hit.name}  ({len(hit.files)} files)")
+
+
+@click.command()
+@click.argument("icon")
+@click.option(
+    "--vendor",
+    "vendors",
+    type=click.Choice(list(VENDOR_MODULES)),
+    multiple=True,
+    help="Only return icons from these vendors (repeatable).",
+)
+@click.option("--limit", "-k", type=int, default=10, show_default=True)
+def similar(icon: str, vendors: tuple[str, ...], limit: int):
+    """
+    Find the icons that look most like ICON, given as <vendor>/<name> or
+    <vendor>/<dist path> (e.g. lucide-icons/arrow-left), across all vendors.
+    Uses the index built by `dist --similar`; prints the Hamming distance
+    between perceptual hashes (0 = same picture, 64 = opposite).
+    """
+    from utils.geometry import numpy_available
+    from utils.similar import SimilarityIndex
+
+    if not numpy_available():
+        click.echo("similar needs the numpy package (pip install numpy).", err=True)
+        sys.exit(1)
+    vendor, _, key = icon.partition("/")
+    try:
+        index = SimilarityIndex.load(DIST_DIR)
+    except (OSError, ValueError):
+        click.echo("Similarity index not found; run `dist --similar` first.", err=True)
+        sys.exit(1)
+    try:
+        hits = index.similar(vendor, key, limit=limit, vendors=vendors)
+    except KeyError:
+        click.echo(f"Unknown icon {icon!r}; expected <vendor>/<name>.", err=True)
+        sys.exit(1)
+    for hit in hits:
+        click.echo(f"{hit.distance:>3}  {hit.vendor}/{hit.name}  ({len(hit.files)} files)")
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8000, show_default=True)
+@click.option(
+    "--cache-mb",
+    type=click.IntRange(min=1),
+    default=64,
+    show_default=True,
+    help="Upper bound of the in-memory LRU of response bodies.",
+)
+@click.option(
+    "--reload-interval",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds between checks for a new build (0 disables hot reload).",
+)
+def serve(host: str, port: int, cache_mb: int, reload_interval: float):
+    """
+    Serve dist/ over HTTP with ETags, Range requests and precompressed variants.
+    /<vendor>/<name>?size=..&style=.. picks a variant through data.json
+    (see utils/server.py).
+    """
+    import asyncio
+
+    from utils.server import DistServer
+
+    server = DistServer(
+        DIST_DIR,
+        cache_bytes=cache_mb << 20,
+        reload_interval=reload_interval,
+        log=click.echo,
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+@click.command()
+@click.option(
+    "--vendor",
+    "vendors",
+    type=click.Choice(list(VENDOR_MODULES)),
+    multiple=True,
+    help="Only these vendors (repeatable).",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the distributions as JSON.")
+def stats(vendors: tuple[str, ...], as_json: bool):
+    """
+    Print per-vendor geometry distributions: segments, subpaths, points, outline
+    length and bounding box size (min, p50, p90, p99, max), fill/stroke classes
+    and the path command mix. Uses the stores built by `dist --geometry`.
+    """
+    from utils.geometry import GeometryStore, numpy_available
+
+    if not numpy_available():
+        click.echo("stats needs the numpy package (pip install numpy).", err=True)
+        sys.exit(1)
+    summaries = {}
+    for vendor in vendors or VENDOR_MODULES:
+        try:
+            summaries[vendor] = GeometryStore.load(DIST_DIR / vendor).summary()
+        except (OSError, ValueError):
+            click.echo(
+                f"No geometry store for {vendor}; run `dist --geometry` first.", err=True
+            )
+            sys.exit(1)
+    if as_json:
+        click.echo(json.dumps(summaries, indent=2))
+        return
+    for i, (vendor, summary) in enumerate(summaries.items()):
+        if i:
+            click.echo()
+        paint = ", ".join(f"{label} {n}" for label, n in summary["paint"].items())
+        click.echo(f"{vendor}: {summary['icons']} icons ({paint})")
+        click.echo(f"  {'':<12}" + "".join(f"{h:>10}" for h in ("min", "p50", "p90", "p99", "max")))
+        for name, values in summary["distributions"].items():
+            click.echo(f"  {name:<12}" + "".join(f"{v:>10.1f}" for v in values))
+        total = sum(summary["commands"].values()) or 1
+        mix = sorted(summary["commands"].items(), key=lambda item: -item[1])
+        click.echo(
+            "  commands    "
+            + ", ".join(f"{cmd} {100 * n / total:.1f}%" for cmd, n in mix if n)
+        )
+
+
 cli.add_command(cache, name="cache")
 cli.add_command(dist, name="dist")
 cli.add_command(clean, name="clean")
+cli.add_command(search, name="search")
+cli.add_command(concept, name="concept")
+cli.add_command(similar, name="similar")
+cli.add_command(serve, name="serve")
+cli.add_command(stats, name="stats")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+"""
+Memory-mappable binary catalog of every dist icon across vendors (`dist/catalog.bin`).
+
+Layout (little-endian):
+
+- header (64 bytes): magic, version, counts and section offsets (`_HEADER`)
+- string table: `string_count + 1` u32 offsets into a UTF-8 blob, followed by
+  the blob; strings are unique and sorted, so ids follow string order
+- rows: one fixed-width row per icon: vendor, name and file string ids, then
+  `max_props` (key id, value id) pairs, unused pairs set to `_NONE`
+- hash index: `slot_count` (power of two) slots of (u64 key hash, u32 row + 1),
+  open addressing with linear probing; 0 marks an empty slot
+
+Lookups hash the query strings directly, probe the index and decode only the
+matching row, so opening the file costs one mmap and no parsing.
+"""
+
+import hashlib
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"ICNCAT\x00\x01"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIIQQQQI4x")
+_OFFSET = struct.Struct("<I")
+_SLOT = struct.Struct("<QI")
+_NONE = 0xFFFFFFFF
+
+
+class CatalogRecord(NamedTuple):
+    vendor: str
+    name: str
+    file: str
+    properties: Dict[str, str]
+
+
+def _key_hash(vendor: str, name: str, properties: Dict[str, Any]) -> int:
+    parts = [vendor, name]
+    for key in sorted(properties):
+        parts.extend((key, str(properties[key])))
+    digest = hashlib.blake2b("\x00".join(parts).encode(), digest_size=8).digest()
+    # 0 is reserved for empty slots
+    return int.from_bytes(digest, "little") or 1
+
+
+def _row_struct(max_props: int) -> struct.Struct:
+    return struct.Struct("<III" + "II" * max_props)
+
+
+def pack_string_table(table: List[str]) -> bytes:
+    """
+    `len(table) + 1` u32 offsets followed by the UTF-8 blob of all strings.
+    """
+    blob = bytearray()
+    offsets = bytearray()
+    for s in table:
+        offsets += _OFFSET.pack(len(blob))
+        blob += s.encode()
+    offsets += _OFFSET.pack(len(blob))
+    return bytes(offsets + blob)
+
+
+def build_catalog(entries: Iterable[Tuple[str, Dict[str, Any]]]) -> bytes:
+    """
+    Serialize (vendor, data.json file entry) pairs into the catalog format.
+    """
+    rows: List[Tuple[str, str, str, List[Tuple[str, str]]]] = []
+    strings: set[str] = set()
+    for vendor, entry in entries:
+        props = sorted((k, str(v)) for k, v in (entry.get("properties") or {}).items())
+        rows.append((vendor, entry["name"], entry["file"], props))
+        strings.update((vendor, entry["name"], entry["file"]))
+        for key, value in props:
+            strings.update((key, value))
+
+    table = sorted(strings)
+    ids = {s: i for i, s in enumerate(table)}
+    string_section = pack_string_table(table)
+
+    max_props = max((len(r[3]) for r in rows), default=0)
+    row_struct = _row_struct(max_props)
+    row_section = bytearray()
+    for vendor, name, file, props in rows:
+        pairs: List[int] = []
+        for key, value in props:
+            pairs.extend((ids[key], ids[value]))
+        pairs.extend([_NONE] * (2 * (max_props - len(props))))
+        row_section += row_struct.pack(ids[vendor], ids[name], ids[file], *pairs)
+
+    slot_count = 1
+    while slot_count < 2 * max(len(rows), 1):
+        slot_count *= 2
+    slots: List[Tuple[int, int]] = [(0, 0)] * slot_count
+    for index, (vendor, name, _, props) in enumerate(rows):
+        h = _key_hash(vendor, name, dict(props))
+        slot = h & (slot_count - 1)
+        while slots[slot][0]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (h, index + 1)
+    hash_section = b"".join(_SLOT.pack(h, r) for h, r in slots)
+
+    strings_offset = _HEADER.size
+    rows_offset = strings_offset + len(string_section)
+    hash_offset = rows_offset + len(row_section)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(rows),
+        len(table),
+        max_props,
+        strings_offset,
+        rows_offset,
+        hash_offset,
+        slot_count,
+        row_struct.size,
+    )
+    return header + string_section + bytes(row_section) + hash_section
+
+
+class IconCatalog:
+    """
+    Read-only view of `catalog.bin` backed by mmap.
+
+        with IconCatalog(DIST_DIR / "catalog.bin") as catalog:
+            catalog.get("heroicons", "x-mark", {"size": "24", "style": "solid"})
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.record_count,
+            self.string_count,
+            self.max_props,
+            self._strings_offset,
+            self._rows_offset,
+            self._hash_offset,
+            self._slot_count,
+            row_size,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        self._row = _row_struct(self.max_props)
+        if magic != MAGIC or version != VERSION or self._row.size != row_size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} icon catalog")
+        self._blob_offset = self._strings_offset + 4 * (self.string_count + 1)
+
+    def string(self, sid: int) -> str:
+        base = self._strings_offset + 4 * sid
+        start, end = struct.unpack_from("<II", self._mm, base)
+        return self._mm[self._blob_offset + start : self._blob_offset + end].decode()
+
+    def _record(self, index: int) -> CatalogRecord:
+        vendor, name, file, *pairs = self._row.unpack_from(
+            self._mm, self._rows_offset + index * self._row.size
+        )
+        properties = {
+            self.string(pairs[i]): self.string(pairs[i + 1])
+            for i in range(0, len(pairs), 2)
+            if pairs[i] != _NONE
+        }
+        return CatalogRecord(
+            self.string(vendor), self.string(name), self.string(file), properties
+        )
+
+    def get(
+        self, vendor: str, name: str, properties: Optional[Dict[str, Any]] = None
+    ) -> Optional[CatalogRecord]:
+        """
+        Return the record matching vendor, name and exactly these properties, or None.
+        """
+        properties = {k: str(v) for k, v in (properties or {}).items()}
+        h = _key_hash(vendor, name, properties)
+        mask = self._slot_count - 1
+        slot = h & mask
+        while True:
+            slot_hash, row = _SLOT.unpack_from(
+                self._mm, self._hash_offset + slot * _SLOT.size
+            )
+            if not row:
+                return None
+            if slot_hash == h:
+                record = self._record(row - 1)
+                if (
+                    record.vendor == vendor
+                    and record.name == name
+                    and record.properties == properties
+                ):
+                    return record
+            slot = (slot + 1) & mask
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __iter__(self) -> Iterator[CatalogRecord]:
+        for index in range(self.record_count):
+            yield self._record(index)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "IconCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
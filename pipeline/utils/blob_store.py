@@ -0,0 +1,146 @@
+"""
+Content-addressed store of dist SVGs (`dist/blobs/`).
+
+Each distinct SVG is stored once as `blobs/<h[:2]>/<h>.svg`, where `h` is the
+sha256 of its canonical form (`canonicalize_svg`), so files that differ only in
+formatting, comments or editor metadata share a blob; the blob holds that
+canonical form. Every dist path (`<vendor>/src/...`) is a hardlink to its
+blob (see `link`), so a shared SVG takes its bytes on disk once.
+`blobs/index.json` maps every dist path to its hash, and data.json entries
+carry it as `blob`. `blobs/hashes.json` lists the distinct hashes, sorted;
+data.min.json refers to them by position (see utils/columnar.py).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.svg_optimize import canonicalize_svg
+from utils.sync import link_file, prune_tree, walk_files, write_if_changed
+
+INDEX = "index.json"
+HASHES = "hashes.json"
+
+
+def canonical_digest(data: bytes) -> str:
+    return hashlib.sha256(canonicalize_svg(data)).hexdigest()
+
+
+def blob_rel_path(digest: str) -> str:
+    return f"{digest[:2]}/{digest}.svg"
+
+
+def load_hashes(root: Path) -> List[str]:
+    """
+    The distinct hashes of a store, in the order data.min.json indexes them.
+    """
+    return json.loads((root / HASHES).read_text())
+
+
+class BlobStore:
+    """
+    Collect dist SVGs by content hash, write missing blobs, link dist paths to
+    them, and report duplication.
+
+        store = BlobStore(DIST_DIR / "blobs")
+        data = store.add("heroicons/src/24/solid/x-mark.svg", canonical_digest(svg), svg)
+        store.link(DIST_DIR / "heroicons/src/24/solid/x-mark.svg", digest)
+        store.finish()
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.aliases: Dict[str, str] = {}
+        self.blob_sizes: Dict[str, int] = {}
+        self.written = 0
+        self.removed = 0
+
+    def path(self, digest: str) -> Path:
+        return self.root / blob_rel_path(digest)
+
+    def add(self, rel: str, digest: str, data: bytes) -> bytes:
+        """
+        Register `data`, the SVG at dist path rel, writing its blob if missing.
+        Returns the blob's bytes (the canonical form), which the dist path holds
+        once linked.
+        """
+        self.aliases[rel] = digest
+        target = self.path(digest)
+        if target.exists():
+            # Blobs are immutable: an existing file already holds this content
+            blob = target.read_bytes()
+        else:
+            blob = canonicalize_svg(data)
+            write_if_changed(target, blob)
+            self.written += 1
+        self.blob_sizes[digest] = len(blob)
+        return blob
+
+    def link(self, path: Path, digest: str) -> bool:
+        """
+        Make path a hardlink of the blob (a copy without hardlink support).
+        Returns True when path was written.
+        """
+        return link_file(self.path(digest), path)
+
+    def hashes(self) -> List[str]:
+        return sorted(self.blob_sizes)
+
+    def finish(self):
+        """
+        Remove blobs no longer referenced and write `index.json` and `hashes.json`.
+        """
+        wanted = {blob_rel_path(d) for d in self.blob_sizes}
+        existing = {
+            rel: path
+            for rel, path in walk_files(self.root).items()
+            if rel.endswith(".svg")
+        }
+        self.removed = prune_tree(self.root, existing, wanted)
+        write_if_changed(
+            self.root / INDEX, json.dumps(self.aliases, indent=2, sort_keys=True) + "\n"
+        )
+        write_if_changed(self.root / HASHES, json.dumps(self.hashes()) + "\n")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Duplication summary overall and per vendor, plus every group of paths
+        sharing a blob. `bytes_files` counts every path's bytes; `bytes_blobs`
+        what is actually stored.
+        """
+        groups: Dict[str, List[str]] = {}
+        for rel, digest in sorted(self.aliases.items()):
+            groups.setdefault(digest, []).append(rel)
+
+        vendors: Dict[str, Dict[str, Any]] = {}
+        for rel, digest in self.aliases.items():
+            stats = vendors.setdefault(
+                rel.split("/", 1)[0], {"files": 0, "bytes": 0, "blobs": set()}
+            )
+            stats["files"] += 1
+            stats["bytes"] += self.blob_sizes[digest]
+            stats["blobs"].add(digest)
+
+        def _summary(files: int, file_bytes: int, blobs: set) -> Dict[str, Any]:
+            blob_bytes = sum(self.blob_sizes[d] for d in blobs)
+            return {
+                "files": files,
+                "blobs": len(blobs),
+                "bytes_files": file_bytes,
+                "bytes_blobs": blob_bytes,
+                "duplication_ratio": round(files / len(blobs), 4) if blobs else 0,
+            }
+
+        return {
+            **_summary(
+                len(self.aliases),
+                sum(self.blob_sizes[d] for d in self.aliases.values()),
+                set(self.blob_sizes),
+            ),
+            "vendors": {
+                vendor: _summary(s["files"], s["bytes"], s["blobs"])
+                for vendor, s in sorted(vendors.items())
+            },
+            "shared": {d: paths for d, paths in groups.items() if len(paths) > 1},
+        }
@@ -0,0 +1,228 @@
+"""
+Columnar encoding of a dist package (`data.json`) into `data.min.json`.
+
+Instead of one `{"name", "file", "properties"}` object per file, entries are
+stored as parallel arrays:
+
+- `names`: file names (stems)
+- `templates`: distinct file path templates, e.g. `src/{weight}/{name}.svg`
+- `file`: per entry, index into `templates`
+- `properties`: per variant key, per entry index into `values[key]` (-1 when absent)
+- `values`: per variant key, the `variants[key].enum` of the spec, followed by
+  any value seen in the files that the spec does not list
+- `blob`: per entry, the position of the file's content hash in `blobs/hashes.json`,
+  -1 when it has none (only when built with `dist --dedupe`, see utils/blob_store.py)
+- `geometry`: the per-entry metrics of `dist --geometry` (see utils/geometry.py) as
+  columns: `paints` (the distinct paint classes) and `paint` (per entry, index
+  into `paints`, -1 when the entry has no metrics), `bbox` (per entry, the box or
+  null), `commands` (per command letter, per entry count) and one column each
+  for `subpaths`, `segments`, `points` and `length`
+
+Index columns (`file`, `properties[key]`, `geometry.paint`) are run-length encoded as a flat
+`[value, count, value, count, ...]` list. Entries are sorted by path, so
+directory-based variants (heroicons sizes, phosphor weights) collapse to a
+handful of runs.
+
+All other package fields (name, vendor, variants, ...) are kept as-is.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+FORMAT = "columnar-v1"
+
+# Document keys that are not package fields
+COLUMNS = ("format", "names", "templates", "file", "properties", "values", "blob", "geometry")
+
+# Numeric geometry metrics stored as one plain column each
+GEOMETRY_SCALARS = ("subpaths", "segments", "points", "length")
+
+
+def _rle(column: List[int]) -> List[int]:
+    out: List[int] = []
+    for value in column:
+        if out and out[-2] == value:
+            out[-1] += 1
+        else:
+            out.extend((value, 1))
+    return out
+
+
+def _unrle(runs: List[int]) -> List[int]:
+    out: List[int] = []
+    for i in range(0, len(runs), 2):
+        out.extend([runs[i]] * runs[i + 1])
+    return out
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class ColumnarBuilder:
+    """
+    Accumulate file entries one at a time and emit the columnar document.
+    """
+
+    def __init__(self, header: Dict[str, Any], blob_ids: Optional[Dict[str, int]] = None):
+        self.header = header
+        # Content hash -> position in the shared hash table
+        self.blob_ids = blob_ids if blob_ids is not None else {}
+        self.keys: List[str] = list(header.get("variants") or {})
+        self.values: Dict[str, List[str]] = {
+            key: [str(v) for v in (header["variants"][key].get("enum") or [])]
+            for key in self.keys
+        }
+        self._value_index = {
+            key: {v: i for i, v in enumerate(vals)} for key, vals in self.values.items()
+        }
+        self.names: List[str] = []
+        self.templates: List[str] = []
+        self._template_index: Dict[str, int] = {}
+        self.file: List[int] = []
+        self.properties: Dict[str, List[int]] = {key: [] for key in self.keys}
+        self.blob: List[int] = []
+        # Geometry columns, started by the first entry that has a `geometry` key
+        self.geometry: Optional[Dict[str, Any]] = None
+        self._paint_index: Dict[str, int] = {}
+
+    def _value(self, key: str, value: str) -> int:
+        index = self._value_index[key]
+        if value not in index:
+            index[value] = len(self.values[key])
+            self.values[key].append(value)
+        return index[value]
+
+    def _template(self, name: str, file: str, properties: Dict[str, Any]) -> str:
+        *dirs, base = file.split("/")
+        parts = []
+        for part in dirs:
+            key = next((k for k, v in properties.items() if str(v) == part), None)
+            parts.append(f"{{{key}}}" if key in self.properties else _escape(part))
+        stem, dot, ext = base.rpartition(".")
+        if dot and stem == name:
+            parts.append("{name}." + _escape(ext))
+        else:
+            parts.append(_escape(base))
+        return "/".join(parts)
+
+    def _add_geometry(self, metrics: Optional[Dict[str, Any]]):
+        rows = len(self.names)
+        if self.geometry is None:
+            # Entries added before this one have no metrics
+            self.geometry = {
+                "paints": [],
+                "paint": [-1] * rows,
+                "bbox": [None] * rows,
+                "commands": {},
+                **{key: [0] * rows for key in GEOMETRY_SCALARS},
+            }
+        geometry = self.geometry
+        metrics = metrics or {}
+        paint = metrics.get("paint")
+        if paint is not None and paint not in self._paint_index:
+            self._paint_index[paint] = len(geometry["paints"])
+            geometry["paints"].append(paint)
+        geometry["paint"].append(-1 if paint is None else self._paint_index[paint])
+        geometry["bbox"].append(metrics.get("bbox"))
+        commands = metrics.get("commands") or {}
+        for command in commands:
+            if command not in geometry["commands"]:
+                geometry["commands"][command] = [0] * rows
+        for command, column in geometry["commands"].items():
+            column.append(commands.get(command, 0))
+        for key in GEOMETRY_SCALARS:
+            geometry[key].append(metrics.get(key, 0))
+
+    def add(self, entry: Dict[str, Any]):
+        name = entry["name"]
+        properties = entry.get("properties") or {}
+        for key in properties:
+            if key not in self.properties:
+                # Property not declared in the spec variants: give it a column
+                self.keys.append(key)
+                self.values[key] = []
+                self._value_index[key] = {}
+                self.properties[key] = [-1] * len(self.names)
+        template = self._template(name, entry["file"], properties)
+        if template not in self._template_index:
+            self._template_index[template] = len(self.templates)
+            self.templates.append(template)
+        if "geometry" in entry or self.geometry is not None:
+            self._add_geometry(entry.get("geometry"))
+        self.names.append(name)
+        blob = entry.get("blob")
+        self.blob.append(-1 if blob is None else self.blob_ids.setdefault(blob, len(self.blob_ids)))
+        self.file.append(self._template_index[template])
+        for key in self.keys:
+            value = properties.get(key)
+            self.properties[key].append(
+                -1 if value is None else self._value(key, str(value))
+            )
+
+    def document(self) -> Dict[str, Any]:
+        doc = {
+            **self.header,
+            "format": FORMAT,
+            "names": self.names,
+            "templates": self.templates,
+            "file": _rle(self.file),
+            "properties": {key: _rle(col) for key, col in self.properties.items()},
+            "values": self.values,
+        }
+        if any(index >= 0 for index in self.blob):
+            doc["blob"] = self.blob
+        if self.geometry is not None:
+            doc["geometry"] = {**self.geometry, "paint": _rle(self.geometry["paint"])}
+        return doc
+
+    def dumps(self) -> str:
+        return json.dumps(self.document(), separators=(",", ":"))
+
+
+def geometry_entry(geometry: Dict[str, Any], paint: List[int], i: int) -> Optional[Dict[str, Any]]:
+    """
+    The `geometry` value of entry i, from a document's geometry columns and its
+    decoded `paint` column.
+    """
+    if paint[i] < 0:
+        return None
+    return {
+        "bbox": geometry["bbox"][i],
+        "paint": geometry["paints"][paint[i]],
+        "commands": {
+            command: column[i] for command, column in geometry["commands"].items() if column[i]
+        },
+        **{key: geometry[key][i] for key in GEOMETRY_SCALARS},
+    }
+
+
+def decode(doc: Dict[str, Any], blob_table: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Reference decoder: turn a `data.min.json` document back into the `data.json` shape.
+    `blob_table` is the hash table the `blob` column indexes (`blobs/hashes.json`).
+    """
+    if "blob" in doc and blob_table is None:
+        raise ValueError("data.min.json has a blob column; pass the blobs/hashes.json table")
+    header = {k: v for k, v in doc.items() if k not in COLUMNS}
+    file_col = _unrle(doc["file"])
+    prop_cols = {key: _unrle(runs) for key, runs in doc["properties"].items()}
+    geometry = doc.get("geometry")
+    paint = _unrle(geometry["paint"]) if geometry else []
+    files = []
+    for i, name in enumerate(doc["names"]):
+        props = {}
+        for key, col in prop_cols.items():
+            if col[i] >= 0:
+                props[key] = doc["values"][key][col[i]]
+        entry = {
+            "name": name,
+            "file": doc["templates"][file_col[i]].format(name=name, **props),
+            "properties": props,
+        }
+        if "blob" in doc and doc["blob"][i] >= 0:
+            entry["blob"] = blob_table[doc["blob"][i]]
+        if geometry:
+            entry["geometry"] = geometry_entry(geometry, paint, i)
+        files.append(entry)
+    return {**header, "files": files}
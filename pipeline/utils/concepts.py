@@ -0,0 +1,210 @@
+"""
+Cross-vendor concept table: every normalized name, alias and keyword mapped to
+the icons it names in every vendor, so swapping icon sets is a dict lookup.
+
+A concept key is the icon name reduced to its canonical tokens (see
+`normalize`): lowercase alphanumeric tokens, with `SYNONYMS` phrases replaced
+by their canonical form, sorted so word order does not matter. Heroicons
+`magnifying-glass`, lucide `search` and phosphor `magnifying-glass` all become
+`search`; lucide `circle-x` and heroicons `x-circle` both become `circle-x`.
+
+`ConceptIndexBuilder` collects the vendor cache records during `dist`, next to
+`SearchIndexBuilder`. The persisted table (`dist/concepts.json`) holds:
+
+- `icons`: `[vendor, name, [files...], [keys...]]` per icon, variants grouped;
+  `keys` are the icon's own concepts, name first
+- `concepts`: per key, a flat `[icon, via, icon, via, ...]` list ordered by
+  `via` (0 name, 1 alias, 2 keyword), then vendor order
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.search import search_fields
+
+# How an icon joined a concept, strongest first
+VIA = ("name", "alias", "keyword")
+
+# Which `search_fields` field feeds which kind of join; tags and categories
+# are too broad to name an icon and are left to the search index
+FIELD_VIA = {"name": 0, "title": 0, "alias": 1, "keyword": 2}
+
+# Naming conventions that differ between vendors: each group lists phrases
+# (as "-"-joined tokens) that name the same thing, canonical form first
+SYNONYMS = [
+    ("x", "xmark", "x-mark", "close"),
+    ("search", "magnifying-glass", "magnifier"),
+    ("settings", "gear", "cog"),
+    ("home", "house"),
+    ("pencil", "edit"),
+    ("plus", "add"),
+    ("minus", "subtract"),
+    ("user", "person"),
+    ("users", "people", "user-group"),
+    ("mail", "envelope", "email"),
+    ("info", "information"),
+    ("alert", "exclamation", "warning"),
+    ("check", "checkmark", "tick"),
+    ("chevron", "caret"),
+    ("image", "photo", "picture"),
+    ("copy", "duplicate", "clone"),
+    ("file", "document"),
+    ("folder", "directory"),
+    ("download", "arrow-down-tray"),
+    ("upload", "arrow-up-tray"),
+    ("lock", "lock-closed", "padlock"),
+    ("eye-off", "eye-slash", "eye-closed"),
+    ("menu", "bars-3", "hamburger-menu", "hamburger"),
+    ("refresh", "reload", "arrow-path"),
+    ("external-link", "link-external", "arrow-top-right-on-square"),
+    ("log-out", "sign-out", "logout"),
+    ("log-in", "sign-in", "login"),
+    ("ellipsis", "ellipsis-horizontal", "dots-horizontal", "dots-three", "more-horizontal"),
+    ("ellipsis-vertical", "dots-vertical", "dots-three-vertical", "more-vertical"),
+    ("github", "mark-github"),
+]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _split(text: str) -> Tuple[str, ...]:
+    # "arrowLeft" and "ArrowLeft" split like "arrow-left"
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1-\2", text)
+    return tuple(_TOKEN.findall(text.lower()))
+
+
+def _phrase_table() -> Dict[Tuple[str, ...], Tuple[str, ...]]:
+    table = {}
+    for group in SYNONYMS:
+        canonical = _split(group[0])
+        for phrase in group[1:]:
+            table[_split(phrase)] = canonical
+    return table
+
+
+_PHRASES = _phrase_table()
+_LONGEST = max(len(phrase) for phrase in _PHRASES)
+
+
+def normalize(text: str) -> str:
+    """
+    Concept key for a name, alias or keyword ("" when it has no tokens).
+    """
+    tokens = _split(text)
+    out: List[str] = []
+    i = 0
+    while i < len(tokens):
+        # Longest synonym phrase starting here wins
+        for n in range(min(_LONGEST, len(tokens) - i), 0, -1):
+            canonical = _PHRASES.get(tokens[i : i + n])
+            if canonical is not None:
+                out.extend(canonical)
+                i += n
+                break
+        else:
+            out.append(tokens[i])
+            i += 1
+    return "-".join(sorted(out))
+
+
+class ConceptIndexBuilder:
+    def __init__(self):
+        self._icons: Dict[Tuple[str, str], int] = {}
+        self.icons: List[List[Any]] = []
+        # Per icon: concept key -> strongest via
+        self._keys: List[Dict[str, int]] = []
+
+    def add_record(self, vendor: str, record: Dict[str, Any]):
+        name, fields = search_fields(record)
+        key = (vendor, name)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = self._icons[key] = len(self.icons)
+            self.icons.append([vendor, name, []])
+            self._keys.append({})
+        if record.get("dist_path"):
+            self.icons[icon][2].append(record["dist_path"])
+        keys = self._keys[icon]
+        for field, text in fields:
+            via = FIELD_VIA.get(field)
+            if via is None:
+                continue
+            concept = normalize(text)
+            if concept and keys.get(concept, len(VIA)) > via:
+                keys[concept] = via
+
+    def build(self) -> Dict[str, Any]:
+        joined: Dict[str, List[Tuple[int, int]]] = {}
+        icons = []
+        for icon, ((vendor, name, files), keys) in enumerate(zip(self.icons, self._keys)):
+            own = sorted(keys, key=lambda k: (keys[k], k))
+            icons.append([vendor, name, sorted(files), own])
+            for concept in own:
+                joined.setdefault(concept, []).append((keys[concept], icon))
+        concepts = {}
+        for concept in sorted(joined):
+            flat: List[int] = []
+            for via, icon in sorted(joined[concept]):
+                flat.extend((icon, via))
+            concepts[concept] = flat
+        return {"version": 1, "icons": icons, "concepts": concepts}
+
+    def dumps(self) -> str:
+        return json.dumps(self.build(), separators=(",", ":"))
+
+
+class ConceptHit(NamedTuple):
+    vendor: str
+    name: str
+    via: str
+    files: List[str]
+
+
+class ConceptIndex:
+    """
+    In-memory view of `dist/concepts.json`.
+
+        index = ConceptIndex.load(DIST_DIR / "concepts.json")
+        index.lookup("magnifying glass")  # every vendor's search icon
+        index.swap("heroicons", "x-mark", "lucide-icons")  # ConceptHit for lucide "x"
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.icons: List[List[Any]] = data["icons"]
+        self.concepts: Dict[str, List[int]] = data["concepts"]
+        self._icon_ids = {(icon[0], icon[1]): i for i, icon in enumerate(self.icons)}
+
+    @classmethod
+    def load(cls, path: Path) -> "ConceptIndex":
+        return cls(json.loads(path.read_text()))
+
+    def _hits(self, concept: str, vendor: Optional[str] = None):
+        flat = self.concepts.get(concept, ())
+        for i in range(0, len(flat), 2):
+            icon_vendor, name, files, _ = self.icons[flat[i]]
+            if vendor is None or icon_vendor == vendor:
+                yield ConceptHit(icon_vendor, name, VIA[flat[i + 1]], files)
+
+    def lookup(self, text: str, vendor: Optional[str] = None) -> List[ConceptHit]:
+        """
+        Icons whose name, alias or keyword normalizes to the same concept as text,
+        strongest join first.
+        """
+        return list(self._hits(normalize(text), vendor))
+
+    def swap(self, vendor: str, name: str, to: str) -> Optional[ConceptHit]:
+        """
+        The `to` vendor's counterpart of vendor/name: the best icon sharing the
+        source's name concept, else one of its alias or keyword concepts.
+        Raises KeyError for an unknown source icon.
+        """
+        if vendor == to:
+            icon = self.icons[self._icon_ids[(vendor, name)]]
+            return ConceptHit(vendor, name, VIA[0], icon[2])
+        for concept in self.icons[self._icon_ids[(vendor, name)]][3]:
+            hit = next(self._hits(concept, to), None)
+            if hit is not None:
+                return hit
+        return None
@@ -0,0 +1,306 @@
+"""
+Lazy, compact Python API over the dist output (`dist/<vendor>/data.min.json`).
+
+`DistCatalog` opens nothing up front. Each vendor is loaded on first access
+from its columnar `data.min.json` (see utils/columnar.py), falling back to
+`data.json`, and kept as array-backed columns rather than one dict per file:
+
+- `names`: the distinct icon names (interned), with a per-row `array` of ids
+- per variant key, a per-row `array` of indices into the interned values
+- per row, an index into the file path templates
+- with `dist --geometry`, the metric columns as stored (see utils/columnar.py)
+
+`IconEntry` objects (`__slots__`) are only built for the rows a lookup returns.
+Lookups go through a name -> rows index and a lazily built
+(key, value) -> rows index. `svg()` reads the bytes on demand, from
+`svgs.pack` when there is one.
+
+    catalog = DistCatalog(DIST_DIR)
+    catalog.get("heroicons", "x-mark", size="24", style="solid").svg()
+    [e.file for e in catalog["phosphor-icons"].where(weight="fill")][:3]
+
+(`IconCatalog` in utils/binary_catalog.py is the reader for `catalog.bin`.)
+"""
+
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.columnar import COLUMNS, ColumnarBuilder, _unrle, geometry_entry
+from utils.records import find_records, read_package
+from utils.svg_pack import SvgPack
+
+
+class IconEntry:
+    """
+    One file of a vendor package: the `data.json` entry fields plus `vendor`.
+    """
+
+    __slots__ = ("vendor", "name", "file", "properties", "blob", "geometry", "_catalog")
+
+    def __init__(
+        self,
+        catalog: "VendorCatalog",
+        name: str,
+        file: str,
+        properties: Dict[str, str],
+        blob: Optional[str],
+        geometry: Optional[Dict[str, Any]] = None,
+    ):
+        self._catalog = catalog
+        self.vendor = catalog.vendor
+        self.name = name
+        self.file = file
+        self.properties = properties
+        self.blob = blob
+        self.geometry = geometry
+
+    def svg(self) -> bytes:
+        return self._catalog.svg(self.file)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        The entry as written to `data.json`.
+        """
+        entry = {"name": self.name, "file": self.file, "properties": self.properties}
+        if self.blob is not None:
+            entry["blob"] = self.blob
+        if self._catalog.geometry is not None:
+            entry["geometry"] = self.geometry
+        return entry
+
+    def __repr__(self) -> str:
+        return f"IconEntry({self.vendor!r}, {self.name!r}, {self.file!r}, {self.properties!r})"
+
+
+def _index_array(values: List[int]) -> array:
+    # Small columns (variant values, templates) fit in 16 bits
+    return array("h" if len(values) and max(values) < 1 << 15 else "i", values)
+
+
+class VendorCatalog:
+    """
+    Columns of one vendor's files; see the module docstring.
+    """
+
+    def __init__(self, root: Path, vendor: str):
+        self.root = root
+        self.vendor = vendor
+        # Content hashes the `blob` column indexes; loaded on first use
+        self._blob_table: Optional[List[str]] = None
+        doc = self._read_columns()
+        self.header: Dict[str, Any] = {k: v for k, v in doc.items() if k not in COLUMNS}
+        self.templates: List[str] = doc["templates"]
+        self.values: Dict[str, List[str]] = {
+            sys.intern(key): [sys.intern(v) for v in vals] for key, vals in doc["values"].items()
+        }
+        self._file = _index_array(_unrle(doc["file"]))
+        self._props = {
+            sys.intern(key): _index_array(_unrle(runs)) for key, runs in doc["properties"].items()
+        }
+        self._blob: Optional[array] = array("i", doc["blob"]) if "blob" in doc else None
+        # `dist --geometry` metrics: the document's columns, paint decoded
+        self.geometry: Optional[Dict[str, Any]] = doc.get("geometry")
+        self._paint = _index_array(_unrle(self.geometry["paint"])) if self.geometry else None
+
+        # Distinct names, a per-row name id, and name id -> rows
+        ids: Dict[str, int] = {}
+        name_ids = array("i")
+        for name in doc["names"]:
+            nid = ids.get(name)
+            if nid is None:
+                nid = ids[sys.intern(name)] = len(ids)
+            name_ids.append(nid)
+        self.names: List[str] = list(ids)
+        self._name_ids = name_ids
+        self._name_index = ids
+        self._rows_by_name: List[array] = [array("i") for _ in ids]
+        for row, nid in enumerate(name_ids):
+            self._rows_by_name[nid].append(row)
+        # key -> value id -> rows, built on first `where` over that key
+        self._value_rows: Dict[str, List[array]] = {}
+        self._pack: Optional[SvgPack] = None
+
+    def _read_columns(self) -> Dict[str, Any]:
+        base = self.root / self.vendor
+        try:
+            return json.loads((base / "data.min.json").read_text())
+        except (OSError, ValueError):
+            pass
+        header, files = read_package(find_records(base, "data"))
+        columns = ColumnarBuilder(header)
+        for entry in files:
+            columns.add(entry)
+        self._blob_table = list(columns.blob_ids)
+        return columns.document()
+
+    def _blob_hash(self, row: int) -> Optional[str]:
+        if self._blob is None or self._blob[row] < 0:
+            return None
+        if self._blob_table is None:
+            from utils.blob_store import load_hashes
+
+            self._blob_table = load_hashes(self.root / "blobs")
+        return self._blob_table[self._blob[row]]
+
+    def __len__(self) -> int:
+        return len(self._name_ids)
+
+    def _entry(self, row: int) -> IconEntry:
+        name = self.names[self._name_ids[row]]
+        props = {}
+        for key, column in self._props.items():
+            vid = column[row]
+            if vid >= 0:
+                props[key] = self.values[key][vid]
+        file = self.templates[self._file[row]].format(name=name, **props)
+        geometry = geometry_entry(self.geometry, self._paint, row) if self.geometry else None
+        return IconEntry(self, name, file, props, self._blob_hash(row), geometry)
+
+    def __iter__(self) -> Iterator[IconEntry]:
+        for row in range(len(self)):
+            yield self._entry(row)
+
+    def _matches(self, row: int, wanted: Dict[str, int]) -> bool:
+        return all(self._props[key][row] == vid for key, vid in wanted.items())
+
+    def _wanted(self, properties: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """
+        Property filters as value ids, or None when a key or value does not exist.
+        """
+        wanted = {}
+        for key, value in properties.items():
+            try:
+                wanted[key] = self.values[key].index(str(value))
+            except (KeyError, ValueError):
+                return None
+        return wanted
+
+    def variants(self, name: str, **properties: Any) -> List[IconEntry]:
+        """
+        Every file of icon `name` whose properties match the given ones.
+        """
+        nid = self._name_index.get(name)
+        wanted = self._wanted(properties)
+        if nid is None or wanted is None:
+            return []
+        return [self._entry(row) for row in self._rows_by_name[nid] if self._matches(row, wanted)]
+
+    def get(self, name: str, **properties: Any) -> Optional[IconEntry]:
+        """
+        The first file of icon `name` (in data.json order) matching the given properties.
+        """
+        nid = self._name_index.get(name)
+        wanted = self._wanted(properties)
+        if nid is None or wanted is None:
+            return None
+        for row in self._rows_by_name[nid]:
+            if self._matches(row, wanted):
+                return self._entry(row)
+        return None
+
+    def _rows_with(self, key: str, vid: int) -> array:
+        index = self._value_rows.get(key)
+        if index is None:
+            index = [array("i") for _ in self.values[key]]
+            for row, value in enumerate(self._props[key]):
+                if value >= 0:
+                    index[value].append(row)
+            self._value_rows[key] = index
+        return index[vid]
+
+    def where(self, **properties: Any) -> Iterator[IconEntry]:
+        """
+        Every file with all the given property values, e.g. `where(weight="fill")`.
+        """
+        wanted = self._wanted(properties)
+        if wanted is None:
+            return
+        if not wanted:
+            yield from self
+            return
+        # Walk the smallest posting list and check the other keys per row
+        key = min(wanted, key=lambda k: len(self._rows_with(k, wanted[k])))
+        for row in self._rows_with(key, wanted[key]):
+            if self._matches(row, wanted):
+                yield self._entry(row)
+
+    def svg(self, file: str) -> bytes:
+        """
+        The bytes of `file` (a dist path like `src/24/solid/x-mark.svg`).
+        """
+        if self._pack is None and (self.root / self.vendor / "svgs.pack").exists():
+            self._pack = SvgPack(self.root / self.vendor / "svgs.pack")
+        if self._pack is not None:
+            view = self._pack.get(file)
+            if view is not None:
+                with view:
+                    return bytes(view)
+        with open(os.path.join(self.root, self.vendor, file), "rb") as f:
+            return f.read()
+
+    def close(self):
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+
+
+class DistCatalog:
+    """
+    All vendors under a dist directory, each loaded on first access.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._vendors: Dict[str, VendorCatalog] = {}
+        self._names: Optional[List[str]] = None
+
+    @property
+    def vendors(self) -> List[str]:
+        if self._names is None:
+            self._names = sorted(
+                entry.name
+                for entry in os.scandir(self.root)
+                if entry.is_dir()
+                and not entry.name.startswith(".")
+                and (
+                    os.path.exists(os.path.join(entry.path, "data.min.json"))
+                    or find_records(Path(entry.path), "data") is not None
+                )
+            )
+        return self._names
+
+    def __getitem__(self, vendor: str) -> VendorCatalog:
+        catalog = self._vendors.get(vendor)
+        if catalog is None:
+            if vendor not in self.vendors:
+                raise KeyError(vendor)
+            catalog = self._vendors[vendor] = VendorCatalog(self.root, vendor)
+        return catalog
+
+    def __contains__(self, vendor: str) -> bool:
+        return vendor in self.vendors
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.vendors)
+
+    def loaded(self) -> List[str]:
+        return list(self._vendors)
+
+    def get(self, vendor: str, name: str, **properties: Any) -> Optional[IconEntry]:
+        if vendor not in self.vendors:
+            return None
+        return self[vendor].get(name, **properties)
+
+    def close(self):
+        for catalog in self._vendors.values():
+            catalog.close()
+
+    def __enter__(self) -> "DistCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,174 @@
+import contextlib
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+
+FILE_CACHE_DIR = Path(__file__).parent.parent.parent / "dist" / ".cache" / "files"
+
+# File contents already read by the caller, by path, while `preread()` is active
+_preread: Optional[Mapping[str, bytes]] = None
+
+
+@contextlib.contextmanager
+def preread(files: Mapping[str, bytes]) -> Iterator[None]:
+    """
+    Inside the block, `FileCache.get` takes the contents of a listed file from
+    `files` instead of reading it, e.g. the `scan_tree` buffers `dist` holds
+    for the vendor processors it runs.
+    """
+    global _preread
+    previous, _preread = _preread, files
+    try:
+        yield
+    finally:
+        _preread = previous
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileCache:
+    """
+    Persistent per-file cache of parsed values, stored as one JSON file.
+
+    Entries are keyed by path and validated by size and mtime; when only the
+    mtime changed, the content hash decides whether the stored values still apply.
+    Each entry can hold several values, one per `kind` (e.g. "svg", "meta").
+    `get` may be called from several threads, as long as each file is handled
+    by one thread at a time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seen: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if isinstance(data, dict):
+                    self.entries = data
+            except Exception:
+                self.entries = {}
+
+    def get(
+        self,
+        file: Path,
+        kind: str,
+        parse: Callable[[Any], Any],
+        from_bytes: bool = False,
+        data: Optional[bytes] = None,
+    ) -> Any:
+        """
+        Return the cached `kind` value for `file`, calling `parse` on a miss.
+        With `from_bytes`, `parse` receives the bytes already read for hashing
+        instead of the path, so the file is read only once.
+        Pass `data` when the caller already holds the file's contents; the file
+        is then never read here. Inside `preread()` that is automatic.
+        Missing files are never cached.
+        """
+        key = str(file)
+        try:
+            st = file.stat()
+        except OSError:
+            return parse(file)
+        if data is None and _preread is not None:
+            # Buffers from an earlier scan; ignored if the file changed size since
+            data = _preread.get(key)
+            if data is not None and len(data) != st.st_size:
+                data = None
+
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry and entry.get("size") == st.st_size:
+            if entry.get("mtime_ns") != st.st_mtime_ns:
+                # Touched but possibly unchanged (e.g. fresh checkout): compare content
+                if data is None:
+                    data = file.read_bytes()
+                if entry.get("sha256") == _sha256(data):
+                    entry["mtime_ns"] = st.st_mtime_ns
+                else:
+                    entry = None
+            if entry and kind in entry["values"]:
+                with self._lock:
+                    self.hits += 1
+                return entry["values"][kind]
+        else:
+            entry = None
+
+        if data is None:
+            data = file.read_bytes()
+        if entry is None:
+            entry = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": _sha256(data),
+                "values": {},
+            }
+            self.entries[key] = entry
+        with self._lock:
+            self.misses += 1
+        value = parse(data if from_bytes else file)
+        entry["values"][kind] = value
+        return value
+
+    def save(self):
+        """
+        Write entries seen during this run back to disk; entries for files that
+        were not visited (removed from the vendor tree) are dropped.
+        """
+        entries = {k: v for k, v in self.entries.items() if k in self.seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, self.path)
+
+
+def load_file_cache(vendor: str, cache_dir: Path = FILE_CACHE_DIR) -> FileCache:
+    """
+    Load the per-file cache for a vendor. Callers call `save()` once the run
+    completes, so an aborted run never prunes entries.
+    """
+    return FileCache(cache_dir / f"{vendor}.json")
+
+
+def _git(cwd: Path, *args: str) -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(cwd), *args],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def vendor_fingerprint(vendor_dir: Path, sources: Iterable[Path]) -> Optional[str]:
+    """
+    Fingerprint a vendor checkout by its submodule commit plus the processor sources.
+    Returns None when the directory is not its own git checkout or has local
+    changes, in which case the vendor must be processed.
+    """
+    if not vendor_dir.exists():
+        return None
+    toplevel = _git(vendor_dir, "rev-parse", "--show-toplevel")
+    if not toplevel or Path(toplevel).resolve() != vendor_dir.resolve():
+        return None
+    commit = _git(vendor_dir, "rev-parse", "HEAD")
+    status = _git(vendor_dir, "status", "--porcelain")
+    if not commit or status is None or status:
+        return None
+    digest = hashlib.sha256(commit.encode())
+    for source in sources:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
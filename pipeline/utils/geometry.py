@@ -0,0 +1,701 @@
+"""
+Per-vendor geometry store: every drawn shape of every SVG as flat NumPy arrays,
+plus bounding boxes and complexity metrics computed over them in vectorized form.
+
+`parse_geometry` walks one document with expat and turns its `<path>`, `<rect>`,
+`<circle>`, `<ellipse>`, `<line>`, `<polyline>` and `<polygon>` elements into
+cubic Bézier segments in absolute root coordinates: lines and quadratics are
+raised to cubics exactly, arcs are split into pieces of at most 90 degrees, and
+`transform` attributes (including inherited ones) are applied. Content of
+`<defs>`, `<clipPath>`, `<mask>`, `<symbol>`, gradients and the like, `<use>`
+references and elements with `display="none"` are not drawn and are skipped.
+
+A vendor store is three `.npy` files in dist/<vendor>/ plus a small index:
+
+- `geometry.npy`: float32 `(segments, 4, 2)`, the control points of each segment
+- `geometry.offsets.npy`: int64 `(icons + 1,)`, icon i owns segments
+  `offsets[i]:offsets[i + 1]`
+- `geometry.kinds.npy`: uint8 `(segments,)`, the path command that produced the
+  segment (index into `COMMANDS`) in the low 4 bits, plus `STARTS_SUBPATH`,
+  `CONTINUED` (later pieces of one arc), `FILLED` and `STROKED`
+- `geometry.json`: format, the icons' dist paths in offsets order and a digest
+  of the SVGs they were built from; `GeometryStore.update` reuses a store whose
+  digest matches instead of parsing again
+
+`GeometryStore.metrics` derives per-icon tight bounding boxes (curve extrema,
+not control points; stroke width is not included), command counts, subpaths,
+segments, source points, outline length and fill/stroke classification from
+those arrays alone, so `stats` needs nothing but the store.
+
+NumPy is optional (`pip install numpy`); `numpy_available()` tells whether
+the store can be built.
+"""
+
+import hashlib
+import io
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from xml.parsers import expat
+
+from utils.pool import map_batches
+from utils.sync import write_if_changed
+
+try:
+    import numpy as np
+except ImportError:  # optional: only `dist --geometry` and `stats` need it
+    np = None
+
+FORMAT = "geometry-v1"
+
+# Segment kinds: command index in the low bits, flags above
+COMMANDS = "LHVCSQTAZ"
+COMMAND_MASK = 0x0F
+STARTS_SUBPATH = 0x10
+CONTINUED = 0x20
+FILLED = 0x40
+STROKED = 0x80
+
+# Source coordinate pairs per command (M adds one per subpath)
+_POINTS = {"L": 1, "H": 1, "V": 1, "C": 3, "S": 2, "Q": 2, "T": 1, "A": 1, "Z": 0}
+_ARITY = {"m": 2, "l": 2, "h": 1, "v": 1, "c": 6, "s": 4, "q": 4, "t": 2, "a": 7, "z": 0}
+_CODE = {c.lower(): i for i, c in enumerate(COMMANDS)}
+
+PAINT_CLASSES = ("none", "fill", "stroke", "mixed")
+
+# Files per worker task, as in utils/svg_optimize.py
+BATCH_SIZE = 128
+
+_PATH_TOKEN = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+_SHAPES = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon"}
+# Subtrees that define resources or metadata rather than drawing
+_HIDDEN = {
+    "defs", "clipPath", "mask", "symbol", "pattern", "marker", "linearGradient",
+    "radialGradient", "filter", "metadata", "style", "script", "title", "desc",
+}
+
+Matrix = Tuple[float, float, float, float, float, float]
+_IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + c * b2,
+        b * a2 + d * b2,
+        a * c2 + c * d2,
+        b * c2 + d * d2,
+        a * e2 + c * f2 + e,
+        b * e2 + d * f2 + f,
+    )
+
+
+def parse_transform(value: str) -> Matrix:
+    """
+    The matrix of an SVG `transform` list; unknown or malformed parts are ignored.
+    """
+    matrix = _IDENTITY
+    for name, args in _TRANSFORM.findall(value):
+        v = [float(x) for x in _NUMBER.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            step = tuple(v)
+        elif name == "translate" and v:
+            step = (1.0, 0.0, 0.0, 1.0, v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale" and v:
+            step = (v[0], 0.0, 0.0, v[1] if len(v) > 1 else v[0], 0.0, 0.0)
+        elif name == "rotate" and v:
+            cos, sin = math.cos(math.radians(v[0])), math.sin(math.radians(v[0]))
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(v) == 3:
+                # rotate(a, cx, cy) = translate(cx, cy) rotate(a) translate(-cx, -cy)
+                step = _multiply(
+                    _multiply((1.0, 0.0, 0.0, 1.0, v[1], v[2]), step),
+                    (1.0, 0.0, 0.0, 1.0, -v[1], -v[2]),
+                )
+        elif name == "skewX" and v:
+            step = (1.0, 0.0, math.tan(math.radians(v[0])), 1.0, 0.0, 0.0)
+        elif name == "skewY" and v:
+            step = (1.0, math.tan(math.radians(v[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            continue
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def _arc_to_cubics(
+    x1: float, y1: float, rx: float, ry: float, angle: float,
+    large: bool, sweep: bool, x2: float, y2: float,
+) -> List[Tuple[float, ...]]:
+    """
+    Cubic approximations (c1x, c1y, c2x, c2y, x, y) of an endpoint-parameterized
+    arc, one per piece of at most 90 degrees (SVG 1.1 implementation notes F.6.5).
+    """
+    if (x1, y1) == (x2, y2):
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [_line_controls(x1, y1, x2, y2)]
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p, y1p = cos * dx + sin * dy, -sin * dx + cos * dy
+    scale = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    num = (rx * ry) ** 2 - (rx * y1p) ** 2 - (ry * x1p) ** 2
+    den = (rx * y1p) ** 2 + (ry * x1p) ** 2
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    cx = cos * cxp - sin * cyp + (x1 + x2) / 2
+    cy = sin * cxp + cos * cyp + (y1 + y2) / 2
+    theta = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    delta = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx) - theta
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+
+    pieces = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / pieces
+    k = 4 / 3 * math.tan(step / 4)
+
+    def _point(ux: float, uy: float) -> Tuple[float, float]:
+        return cx + rx * cos * ux - ry * sin * uy, cy + rx * sin * ux + ry * cos * uy
+
+    out = []
+    for i in range(pieces):
+        t1, t2 = theta + i * step, theta + (i + 1) * step
+        c1 = _point(math.cos(t1) - k * math.sin(t1), math.sin(t1) + k * math.cos(t1))
+        c2 = _point(math.cos(t2) + k * math.sin(t2), math.sin(t2) - k * math.cos(t2))
+        end = (x2, y2) if i == pieces - 1 else _point(math.cos(t2), math.sin(t2))
+        out.append((*c1, *c2, *end))
+    return out
+
+
+def _line_controls(x0: float, y0: float, x1: float, y1: float) -> Tuple[float, ...]:
+    dx, dy = (x1 - x0) / 3, (y1 - y0) / 3
+    return (x0 + dx, y0 + dy, x1 - dx, y1 - dy, x1, y1)
+
+
+def path_segments(d: str) -> Tuple[List[float], List[int]]:
+    """
+    Cubic segments of path data, as 8 coordinates each (start, two controls,
+    end) in a flat list, and their kinds (without paint flags). Parsing stops
+    at the first error, keeping what was drawn so far, as browsers do.
+    """
+    coords: List[float] = []
+    kinds: List[int] = []
+    tokens = _PATH_TOKEN.findall(d)
+    n = len(tokens)
+    i = 0
+    cmd = ""
+    x = y = sx = sy = 0.0
+    # Reflected control point for S / T: (x, y, previous command)
+    last_ctrl: Tuple[float, float, str] = (0.0, 0.0, "")
+    new_subpath = False
+
+    def emit(code: str, controls: Tuple[float, ...], continued: bool = False):
+        nonlocal new_subpath
+        kind = _CODE[code]
+        if new_subpath:
+            kind |= STARTS_SUBPATH
+            new_subpath = False
+        if continued:
+            kind |= CONTINUED
+        coords.extend((x, y))
+        coords.extend(controls)
+        kinds.append(kind)
+
+    while i < n:
+        token = tokens[i]
+        if token.isalpha():
+            cmd = token
+            i += 1
+            if cmd in "Zz":
+                emit("z", _line_controls(x, y, sx, sy))
+                x, y = sx, sy
+                last_ctrl = (x, y, "z")
+                # Drawing on without a moveto starts a new subpath at the same point
+                new_subpath = True
+                continue
+        elif not cmd or cmd in "Zz":
+            break
+        lower = cmd.lower()
+        arity = _ARITY[lower]
+        if lower != "a":
+            chunk = tokens[i : i + arity]
+            try:
+                args = list(map(float, chunk))
+            except ValueError:
+                break
+            if len(args) < arity:
+                break
+            i += arity
+        else:
+            args = []
+            try:
+                while len(args) < arity:
+                    token = tokens[i]
+                    if len(args) in (3, 4):
+                        # Flags are single characters: `a1 1 0 011 1` is 0, 1, 1 1
+                        if token[0] not in "01":
+                            raise ValueError(token)
+                        args.append(float(token[0]))
+                        if len(token) > 1:
+                            tokens[i] = token[1:]
+                            continue
+                    else:
+                        args.append(float(token))
+                    i += 1
+            except (IndexError, ValueError):
+                break
+        rel = cmd.islower()
+        ox, oy = (x, y) if rel else (0.0, 0.0)
+        if lower == "m":
+            x, y = sx, sy = args[0] + ox, args[1] + oy
+            new_subpath = True
+            # Further coordinate pairs are implicit lineto commands
+            cmd = "l" if rel else "L"
+            last_ctrl = (x, y, "m")
+            continue
+        if lower in "lhv":
+            if lower == "l":
+                nx, ny = args[0] + ox, args[1] + oy
+            elif lower == "h":
+                nx, ny = args[0] + ox, y
+            else:
+                nx, ny = x, args[0] + oy
+            emit(lower, _line_controls(x, y, nx, ny))
+            x, y = nx, ny
+            last_ctrl = (x, y, lower)
+        elif lower in "cs":
+            if lower == "c":
+                c1x, c1y = args[0] + ox, args[1] + oy
+                rest = args[2:]
+            else:
+                lx, ly, prev = last_ctrl
+                c1x, c1y = (2 * x - lx, 2 * y - ly) if prev in ("c", "s") else (x, y)
+                rest = args
+            c2x, c2y = rest[0] + ox, rest[1] + oy
+            nx, ny = rest[2] + ox, rest[3] + oy
+            emit(lower, (c1x, c1y, c2x, c2y, nx, ny))
+            x, y = nx, ny
+            last_ctrl = (c2x, c2y, lower)
+        elif lower in "qt":
+            if lower == "q":
+                qx, qy = args[0] + ox, args[1] + oy
+                nx, ny = args[2] + ox, args[3] + oy
+            else:
+                lx, ly, prev = last_ctrl
+                qx, qy = (2 * x - lx, 2 * y - ly) if prev in ("q", "t") else (x, y)
+                nx, ny = args[0] + ox, args[1] + oy
+            # Degree elevation: the quadratic is exactly this cubic
+            emit(lower, (
+                x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y),
+                nx + 2 / 3 * (qx - nx), ny + 2 / 3 * (qy - ny),
+                nx, ny,
+            ))
+            x, y = nx, ny
+            last_ctrl = (qx, qy, lower)
+        else:
+            nx, ny = args[5] + ox, args[6] + oy
+            pieces = _arc_to_cubics(x, y, args[0], args[1], args[2], bool(args[3]), bool(args[4]), nx, ny)
+            for n_piece, controls in enumerate(pieces):
+                emit("a", controls, continued=n_piece > 0)
+                x, y = controls[4], controls[5]
+            x, y = nx, ny
+            last_ctrl = (x, y, "a")
+    return coords, kinds
+
+
+def _style(attrs: Dict[str, str]) -> Dict[str, str]:
+    """
+    Presentation attributes, with `style` declarations taking precedence.
+    """
+    props = {key: attrs[key].strip() for key in ("fill", "stroke", "display") if key in attrs}
+    for decl in attrs.get("style", "").split(";"):
+        key, sep, value = decl.partition(":")
+        key = key.strip()
+        if sep and key in ("fill", "stroke", "display"):
+            props[key] = value.strip()
+    return props
+
+
+def _length(value: Optional[str], default: float = 0.0) -> float:
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith("px"):
+        value = value[:-2]
+    return float(value)
+
+
+def _shape_path(name: str, attrs: Dict[str, str]) -> Optional[str]:
+    """
+    Path data equivalent to a basic shape, or None when it draws nothing.
+    Raises ValueError on non-numeric geometry (e.g. percentages).
+    """
+    if name == "path":
+        return attrs.get("d")
+    if name == "rect":
+        x, y = _length(attrs.get("x")), _length(attrs.get("y"))
+        w, h = _length(attrs.get("width")), _length(attrs.get("height"))
+        if w <= 0 or h <= 0:
+            return None
+        rx_attr, ry_attr = attrs.get("rx"), attrs.get("ry")
+        rx = _length(rx_attr if rx_attr is not None else ry_attr)
+        ry = _length(ry_attr if ry_attr is not None else rx_attr)
+        rx, ry = min(abs(rx), w / 2), min(abs(ry), h / 2)
+        if not rx or not ry:
+            return f"M{x} {y}H{x + w}V{y + h}H{x}Z"
+        arc = f"A{rx} {ry} 0 0 1"
+        return (
+            f"M{x + rx} {y}H{x + w - rx}{arc} {x + w} {y + ry}V{y + h - ry}"
+            f"{arc} {x + w - rx} {y + h}H{x + rx}{arc} {x} {y + h - ry}"
+            f"V{y + ry}{arc} {x + rx} {y}Z"
+        )
+    if name in ("circle", "ellipse"):
+        cx, cy = _length(attrs.get("cx")), _length(attrs.get("cy"))
+        if name == "circle":
+            rx = ry = _length(attrs.get("r"))
+        else:
+            rx, ry = _length(attrs.get("rx")), _length(attrs.get("ry"))
+        if rx <= 0 or ry <= 0:
+            return None
+        arc = f"A{rx} {ry} 0 1 0"
+        return f"M{cx - rx} {cy}{arc} {cx + rx} {cy}{arc} {cx - rx} {cy}Z"
+    if name == "line":
+        return (
+            f"M{_length(attrs.get('x1'))} {_length(attrs.get('y1'))}"
+            f"L{_length(attrs.get('x2'))} {_length(attrs.get('y2'))}"
+        )
+    numbers = _NUMBER.findall(attrs.get("points", ""))
+    if len(numbers) < 4:
+        return None
+    pairs = " ".join(numbers[: len(numbers) // 2 * 2])
+    return f"M{pairs}" + ("Z" if name == "polygon" else "")
+
+
+class _Walker:
+    """
+    expat handlers collecting the segments of every drawn element.
+    """
+
+    def __init__(self):
+        self.coords: List[float] = []
+        self.kinds: List[int] = []
+        # Per open element: (matrix, fill, stroke, hidden)
+        self.stack: List[Tuple[Matrix, str, str, bool]] = [(_IDENTITY, "black", "none", False)]
+
+    def start(self, name: str, attrs: Dict[str, str]):
+        matrix, fill, stroke, hidden = self.stack[-1]
+        name = name.rpartition(":")[2]
+        props = _style(attrs)
+        if hidden or name in _HIDDEN or props.get("display") == "none":
+            self.stack.append((matrix, fill, stroke, True))
+            return
+        if "transform" in attrs:
+            matrix = _multiply(matrix, parse_transform(attrs["transform"]))
+        if props.get("fill", "inherit") != "inherit":
+            fill = props["fill"]
+        if props.get("stroke", "inherit") != "inherit":
+            stroke = props["stroke"]
+        self.stack.append((matrix, fill, stroke, False))
+        if name not in _SHAPES:
+            return
+        try:
+            d = _shape_path(name, attrs)
+        except ValueError:
+            return
+        if not d:
+            return
+        coords, kinds = path_segments(d)
+        if not kinds:
+            return
+        paint = (FILLED if fill not in ("none", "transparent") else 0) | (
+            STROKED if stroke not in ("none", "transparent") else 0
+        )
+        if matrix != _IDENTITY:
+            a, b, c, dd, e, f = matrix
+            xs, ys = coords[0::2], coords[1::2]
+            coords[0::2] = [a * x + c * y + e for x, y in zip(xs, ys)]
+            coords[1::2] = [b * x + dd * y + f for x, y in zip(xs, ys)]
+        self.coords.extend(coords)
+        self.kinds.extend(kind | paint for kind in kinds)
+
+    def end(self, name: str):
+        self.stack.pop()
+
+
+def parse_geometry(data: bytes) -> Tuple[List[float], List[int]]:
+    """
+    Segments of one SVG document: 8 coordinates per segment in a flat list and
+    the segment kinds. A document that does not parse yields what was read
+    before the error.
+    """
+    walker = _Walker()
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = walker.start
+    parser.EndElementHandler = walker.end
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError:
+        pass
+    return walker.coords, walker.kinds
+
+
+def _parse_batch(batch: List[bytes]) -> List[Tuple[List[float], List[int]]]:
+    """
+    Worker: `parse_geometry` of each document.
+    """
+    return [parse_geometry(data) for data in batch]
+
+
+def source_digest(items: Iterable[Tuple[str, bytes]]) -> str:
+    """
+    sha256 over the (dist path, bytes) pairs a store is built from, in order.
+    """
+    h = hashlib.sha256(FORMAT.encode())
+    for rel, data in items:
+        h.update(b"\0%s\0%d\0" % (rel.encode(), len(data)))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _percentiles(values: "np.ndarray") -> List[float]:
+    if not len(values):
+        return [0.0] * 5
+    return np.percentile(values, [0, 50, 90, 99, 100]).tolist()
+
+
+class GeometryStore:
+    """
+    The segments of a vendor's icons in flat arrays (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        files: List[str],
+        segments: "np.ndarray",
+        offsets: "np.ndarray",
+        kinds: "np.ndarray",
+        source: str = "",
+    ):
+        self.files = files
+        self.segments = segments
+        self.offsets = offsets
+        self.kinds = kinds
+        # Digest of the (dist path, bytes) pairs the store was built from
+        self.source = source
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, bytes]], jobs: int = 1) -> "GeometryStore":
+        """
+        Parse (dist path, SVG bytes) pairs, in the given order, into a store.
+        """
+        items = list(items)
+        results = map_batches(_parse_batch, [data for _, data in items], BATCH_SIZE, jobs)
+        coords: List[float] = []
+        kinds: List[int] = []
+        offsets = [0]
+        for batch in results:
+            for doc_coords, doc_kinds in batch:
+                coords.extend(doc_coords)
+                kinds.extend(doc_kinds)
+                offsets.append(len(kinds))
+        return cls(
+            [rel for rel, _ in items],
+            np.array(coords, dtype=np.float32).reshape(-1, 4, 2),
+            np.array(offsets, dtype=np.int64),
+            np.array(kinds, dtype=np.uint8),
+            source_digest(items),
+        )
+
+    @classmethod
+    def update(
+        cls, directory: Path, items: Iterable[Tuple[str, bytes]], jobs: int = 1
+    ) -> Tuple["GeometryStore", bool]:
+        """
+        The store for items, loaded from directory when it was saved from the same
+        SVGs, otherwise built and saved. Returns (store, whether files were written).
+        """
+        items = list(items)
+        try:
+            store = cls.load(directory)
+        except (OSError, ValueError):
+            store = None
+        if store is not None and store.source == source_digest(items):
+            return store, False
+        store = cls.build(items, jobs)
+        return store, store.save(directory)
+
+    @staticmethod
+    def paths(directory: Path) -> Dict[str, Path]:
+        return {
+            "segments": directory / "geometry.npy",
+            "offsets": directory / "geometry.offsets.npy",
+            "kinds": directory / "geometry.kinds.npy",
+            "index": directory / "geometry.json",
+        }
+
+    def save(self, directory: Path) -> bool:
+        """
+        Write the store into directory; only files whose bytes changed are written.
+        """
+        paths = self.paths(directory)
+        changed = False
+        for key in ("segments", "offsets", "kinds"):
+            buf = io.BytesIO()
+            np.save(buf, getattr(self, key), allow_pickle=False)
+            changed |= write_if_changed(paths[key], buf.getvalue())
+        index = {"format": FORMAT, "source": self.source, "files": self.files}
+        changed |= write_if_changed(paths["index"], json.dumps(index, indent=2) + "\n")
+        return changed
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "GeometryStore":
+        """
+        Open a saved store; arrays are memory-mapped unless `mmap` is False.
+        """
+        paths = cls.paths(directory)
+        index = json.loads(paths["index"].read_text())
+        if index.get("format") != FORMAT:
+            raise ValueError(f"{paths['index']}: unsupported format {index.get('format')!r}")
+        mode = "r" if mmap else None
+        return cls(
+            index["files"],
+            np.load(paths["segments"], mmap_mode=mode),
+            np.load(paths["offsets"], mmap_mode=mode),
+            np.load(paths["kinds"], mmap_mode=mode),
+            index.get("source", ""),
+        )
+
+    @staticmethod
+    def remove(directory: Path):
+        for path in GeometryStore.paths(directory).values():
+            if path.exists():
+                path.unlink()
+
+    def metrics(self) -> Dict[str, "np.ndarray"]:
+        """
+        Per-icon metrics, each an array indexed like `files`:
+
+        - `bbox`: float64 (icons, 4) x0, y0, x1, y1 (NaN for icons with no geometry)
+        - `commands`: int64 (icons, len(COMMANDS) + 1), counts of M then `COMMANDS`
+        - `subpaths`, `segments`, `points`: int64 (icons,)
+        - `length`: float64 (icons,) outline length
+        - `paint`: int8 (icons,) index into `PAINT_CLASSES`
+        """
+        seg = np.asarray(self.segments, dtype=np.float64)
+        kinds = np.asarray(self.kinds)
+        offsets = np.asarray(self.offsets)
+        icons = len(offsets) - 1
+        counts = np.diff(offsets)
+        owner = np.repeat(np.arange(icons), counts)
+
+        p0, p1, p2, p3 = seg[:, 0], seg[:, 1], seg[:, 2], seg[:, 3]
+        # Extrema of each cubic per axis: roots in (0, 1) of B'(t) / 3 = a t^2 + b t + c
+        a = -p0 + 3 * p1 - 3 * p2 + p3
+        b = 2 * (p0 - 2 * p1 + p2)
+        c = p1 - p0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            disc = np.sqrt(b * b - 4 * a * c)
+            quadratic = np.abs(a) > 1e-12
+            roots = np.stack(
+                [
+                    np.where(quadratic, (-b + disc) / (2 * a), -c / b),
+                    np.where(quadratic, (-b - disc) / (2 * a), np.nan),
+                ]
+            )
+        roots[~((roots > 0) & (roots < 1))] = np.nan
+        mt = 1 - roots
+        extrema = mt**3 * p0 + 3 * mt**2 * roots * p1 + 3 * mt * roots**2 * p2 + roots**3 * p3
+        # fmin / fmax skip the NaNs of segments without an interior extremum
+        lo = np.fmin(np.minimum(p0, p3), np.fmin(extrema[0], extrema[1]))
+        hi = np.fmax(np.maximum(p0, p3), np.fmax(extrema[0], extrema[1]))
+        bbox = np.full((icons, 4), np.nan)
+        drawn = counts > 0
+        starts = offsets[:-1][drawn]
+        if len(starts):
+            bbox[drawn, :2] = np.minimum.reduceat(lo, starts)
+            bbox[drawn, 2:] = np.maximum.reduceat(hi, starts)
+
+        # Outline length: each cubic flattened to 8 chords
+        t = np.linspace(0, 1, 9)[:, None, None]
+        curve = (1 - t) ** 3 * p0 + 3 * (1 - t) ** 2 * t * p1 + 3 * (1 - t) * t**2 * p2 + t**3 * p3
+        seg_length = np.hypot(*np.diff(curve, axis=0).transpose(2, 0, 1)).sum(axis=0)
+        length = np.bincount(owner, weights=seg_length, minlength=icons)
+
+        code = kinds & COMMAND_MASK
+        first = (kinds & CONTINUED) == 0
+        subpath = (kinds & STARTS_SUBPATH) != 0
+        commands = np.zeros((icons, len(COMMANDS) + 1), dtype=np.int64)
+        commands[:, 0] = np.bincount(owner, weights=subpath, minlength=icons)
+        np.add.at(commands, (owner[first], code[first] + 1), 1)
+        points_per = np.array([_POINTS[cmd] for cmd in COMMANDS], dtype=np.int64)
+
+        filled = np.bincount(owner, weights=(kinds & FILLED) != 0, minlength=icons) > 0
+        stroked = np.bincount(owner, weights=(kinds & STROKED) != 0, minlength=icons) > 0
+        return {
+            "bbox": bbox,
+            "commands": commands,
+            "subpaths": commands[:, 0],
+            "segments": counts,
+            "points": commands[:, 0] + commands[:, 1:] @ points_per,
+            "length": length,
+            "paint": (filled.astype(np.int8) + 2 * stroked.astype(np.int8)),
+        }
+
+    def icon_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        `metrics` as one JSON-ready dict per dist path, for data.json entries.
+        """
+        m = self.metrics()
+        columns = {key: value.tolist() for key, value in m.items()}
+        names = ("M",) + tuple(COMMANDS)
+        out = {}
+        for i, rel in enumerate(self.files):
+            bbox = columns["bbox"][i]
+            out[rel] = {
+                "bbox": None if math.isnan(bbox[0]) else [round(v, 3) for v in bbox],
+                "paint": PAINT_CLASSES[columns["paint"][i]],
+                "commands": {n: k for n, k in zip(names, columns["commands"][i]) if k},
+                "subpaths": columns["subpaths"][i],
+                "segments": columns["segments"][i],
+                "points": columns["points"][i],
+                "length": round(columns["length"][i], 2),
+            }
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Distributions over the vendor's icons, for `stats`: min, p50, p90, p99
+        and max of each metric, the paint classes and the command mix.
+        """
+        m = self.metrics()
+        bbox = m["bbox"][~np.isnan(m["bbox"][:, 0])]
+        totals = m["commands"].sum(axis=0)
+        return {
+            "icons": len(self.files),
+            "paint": dict(zip(PAINT_CLASSES, np.bincount(m["paint"], minlength=4).tolist())),
+            "distributions": {
+                "segments": _percentiles(m["segments"]),
+                "subpaths": _percentiles(m["subpaths"]),
+                "points": _percentiles(m["points"]),
+                "length": _percentiles(m["length"]),
+                "bbox width": _percentiles(bbox[:, 2] - bbox[:, 0]),
+                "bbox height": _percentiles(bbox[:, 3] - bbox[:, 1]),
+            },
+            "commands": dict(zip(("M",) + tuple(COMMANDS), totals.tolist())),
+        }
@@ -0,0 +1,42 @@
+"""
+Process pools for the `--jobs` stages (vendor processors, SVG optimizer,
+geometry parsing, precompression).
+
+`concurrent.futures` is imported only when a pool is actually started: it pulls
+in logging and multiprocessing, which CLI startup should not pay for (see
+benchmarks/startup.py).
+"""
+
+from typing import Any, Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def process_pool(jobs: int, tasks: int):
+    """
+    A `ProcessPoolExecutor` with at most `jobs` workers, and no more than there
+    are tasks.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=min(jobs, tasks))
+
+
+def map_batches(
+    fn: Callable[..., R],
+    items: Sequence[T],
+    batch_size: int,
+    jobs: int = 1,
+    *args: Any,
+) -> List[R]:
+    """
+    `fn(batch, *args)` for each run of `batch_size` items, in order. Batches go
+    to `jobs` worker processes when there are several of both; otherwise they
+    run in this process.
+    """
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+    if jobs == 1 or len(batches) <= 1:
+        return [fn(batch, *args) for batch in batches]
+    with process_pool(jobs, len(batches)) as pool:
+        return list(pool.map(fn, batches, *([arg] * len(batches) for arg in args)))
@@ -0,0 +1,183 @@
+"""
+Precompressed siblings of dist assets: `<file>.gz` (gzip) and `<file>.zst` (zstd),
+so servers can send them as-is instead of compressing on every request.
+
+Compression runs at the maximum level with deterministic output (gzip mtime 0),
+so a rebuild of unchanged inputs writes nothing. A variant is only kept when it
+is smaller than the original. `dist/encodings.json` lists, per file, the byte
+size of every encoding that exists (`identity` is the file itself) and the
+file's `mtime_ns`. A file whose size and mtime still match its entry, and
+whose listed siblings are all present, is not compressed again; the build
+rewrites dist files only when their bytes change, so their mtime is stable.
+
+zstd needs the optional `zstandard` package.
+"""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.pool import map_batches
+from utils.sync import walk_files, write_if_changed
+
+ENCODINGS = {"gzip": ".gz", "zstd": ".zst"}
+MANIFEST = "encodings.json"
+
+# Per-file manifest field that is not an encoding
+STAMP = "mtime_ns"
+
+# Files that get precompressed siblings
+SUFFIXES = (".svg", ".json", ".ndjson", ".pack", ".bin", ".npy")
+
+BATCH_SIZE = 256
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        import gzip
+
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=zstandard.MAX_COMPRESSION_LEVEL).compress(data)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def _compress_batch(
+    batch: List[Tuple[str, str]], encodings: List[str]
+) -> List[Tuple[str, Dict[str, int], int]]:
+    """
+    Worker: write (or drop) the requested siblings of each (rel, path) file.
+    Returns (rel, {encoding: size}, siblings written) per file.
+    """
+    results = []
+    for rel, path in batch:
+        with open(path, "rb") as f:
+            data = f.read()
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        sizes = {"identity": len(data), STAMP: mtime_ns}
+        written = 0
+        for encoding in encodings:
+            sibling = Path(path + ENCODINGS[encoding])
+            packed = compress(data, encoding)
+            if len(packed) < len(data):
+                written += write_if_changed(sibling, packed)
+                sizes[encoding] = len(packed)
+            elif sibling.exists():
+                sibling.unlink()
+        results.append((rel, sizes, written))
+    return results
+
+
+def _is_sibling(rel: str) -> bool:
+    return rel.endswith(tuple(ENCODINGS.values()))
+
+
+def _load_manifest(root: Path) -> Dict[str, Dict[str, int]]:
+    try:
+        manifest = json.loads((root / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _reusable(
+    rel: str,
+    path: str,
+    previous: Optional[Dict[str, int]],
+    encodings: List[str],
+    files: Dict[str, str],
+) -> Optional[Dict[str, int]]:
+    """
+    The manifest entry of an unchanged file whose requested siblings all exist,
+    narrowed to `encodings`; None when the file has to be compressed.
+    An encoding missing from the entry (not smaller last time, or not asked
+    for) is tried again.
+    """
+    if not isinstance(previous, dict):
+        return None
+    st = os.stat(path)
+    if previous.get("identity") != st.st_size or previous.get(STAMP) != st.st_mtime_ns:
+        return None
+    if not all(e in previous and rel + ENCODINGS[e] in files for e in encodings):
+        return None
+    return {
+        "identity": st.st_size,
+        STAMP: st.st_mtime_ns,
+        **{e: previous[e] for e in encodings},
+    }
+
+
+def precompress_tree(
+    root: Path, encodings: Iterable[str], jobs: int = 1
+) -> Tuple[Dict[str, Dict[str, int]], int, int]:
+    """
+    Bring the precompressed siblings under root in line with `encodings`:
+    compress every file with one of `SUFFIXES` (skipping dot-directories such as
+    `.cache`) that changed since the manifest under root was written, and remove
+    siblings of other encodings or of files that are gone.
+    An empty `encodings` removes all siblings.
+
+    Returns (manifest, siblings written, siblings removed); the manifest maps each
+    "/"-joined path relative to root to its sizes per encoding and its mtime.
+    """
+    encodings = [e for e in ENCODINGS if e in set(encodings)]
+    files = {
+        rel: path
+        for rel, path in walk_files(root).items()
+        if not any(part.startswith(".") for part in rel.split("/"))
+    }
+    sources = sorted(
+        rel for rel in files
+        if rel.lower().endswith(SUFFIXES) and rel != MANIFEST and not _is_sibling(rel)
+    )
+
+    removed = 0
+    wanted_suffixes = tuple(ENCODINGS[e] for e in encodings)
+    for rel, path in files.items():
+        if not _is_sibling(rel):
+            continue
+        base, ext = os.path.splitext(rel)
+        if ext not in wanted_suffixes or base not in files or _is_sibling(base):
+            os.unlink(path)
+            removed += 1
+
+    manifest: Dict[str, Dict[str, int]] = {}
+    written = 0
+    if not encodings:
+        return manifest, written, removed
+
+    previous = _load_manifest(root)
+    tasks = []
+    for rel in sources:
+        entry = _reusable(rel, files[rel], previous.get(rel), encodings, files)
+        if entry is None:
+            tasks.append((rel, files[rel]))
+        else:
+            manifest[rel] = entry
+    results = map_batches(_compress_batch, tasks, BATCH_SIZE, jobs, encodings)
+    for batch in results:
+        for rel, sizes, count in batch:
+            manifest[rel] = sizes
+            written += count
+    return manifest, written, removed
+
+
+def write_manifest(root: Path, manifest: Dict[str, Dict[str, int]]) -> bool:
+    """
+    Write `encodings.json` under root, or remove it when there is nothing to list.
+    """
+    path = root / MANIFEST
+    if not manifest:
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+    return write_if_changed(path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,235 @@
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import click
+
+from utils import trace
+from utils.sync import IfChangedWriter
+
+FORMATS = ("json", "ndjson")
+
+format_option = click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(FORMATS),
+    default="json",
+    show_default=True,
+    help="Output format: a JSON array, or NDJSON with one record per line written as it is produced.",
+)
+
+
+# Records written while `collect_records()` is active, by writer path
+_collected: Optional[Dict[str, List[Any]]] = None
+# What `collect_records()` keeps of each record
+_keep: Callable[[Any], Any] = lambda record: record
+
+# (staging dir, final dir) while `staged_as()` is active
+_staged: Optional[Tuple[Path, Path]] = None
+
+
+@contextlib.contextmanager
+def collect_records(
+    keep: Optional[Callable[[Any], Any]] = None,
+) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Also keep every record written inside the block in memory, keyed by the
+    writer's path, so a later stage can use them without reading the file back.
+    `keep` narrows each record to the part that stage needs.
+    """
+    global _collected, _keep
+    previous = _collected, _keep
+    _collected, _keep = {}, keep or (lambda record: record)
+    try:
+        yield _collected
+    finally:
+        _collected, _keep = previous
+
+
+@contextlib.contextmanager
+def staged_as(staging: Path, final: Path) -> Iterator[None]:
+    """
+    Writers opened under `staging` inside the block report the path under
+    `final` the directory is swapped into once complete (`RecordWriter.final_path`).
+    """
+    global _staged
+    previous, _staged = _staged, (staging, final)
+    try:
+        yield
+    finally:
+        _staged = previous
+
+
+def _indent(text: str, prefix: str) -> str:
+    # JSON strings never contain raw newlines, so indenting by line is safe
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+class RecordWriter:
+    """
+    Write records one at a time instead of collecting them in a list.
+
+    `json` produces the same bytes as `json.dumps(records, indent=2)`;
+    `ndjson` writes one compact record per line and flushes it, so readers
+    can follow `tmp_path` while it is being written.
+
+    Records go to `.<name>.tmp` next to `path`, which is renamed over `path`
+    only when the `with` block exits cleanly; on an exception it is removed and
+    `path` keeps its previous content. Inside `staged_as()` (`cache all`,
+    `dist`) `path` itself then appears at `final_path` when its directory is
+    swapped in.
+    """
+
+    def __init__(self, path: Path, fmt: str = "json"):
+        self.path = path
+        self.final_path = path
+        if _staged is not None and path.is_relative_to(_staged[0]):
+            self.final_path = _staged[1] / path.relative_to(_staged[0])
+        self.tmp_path = path.with_name(f".{path.name}.tmp")
+        self.fmt = fmt
+        self.count = 0
+        self._file: TextIO = open(self.tmp_path, "w")
+        self._kept = _collected.setdefault(str(path), []) if _collected is not None else None
+        self._keep = _keep
+
+    def write(self, record: Any):
+        if self.fmt == "ndjson":
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+        else:
+            self._file.write("[\n" if self.count == 0 else ",\n")
+            self._file.write(_indent(json.dumps(record, indent=2), "  "))
+        if self._kept is not None:
+            self._kept.append(self._keep(record))
+        self.count += 1
+
+    def close(self):
+        """
+        Finish the file and move it to `path`.
+        """
+        if self.fmt == "json":
+            self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        # Shows up as `records` on the enclosing trace span (see utils/trace.py)
+        trace.count("records", self.count)
+
+    def discard(self):
+        """
+        Drop the partial file, leaving `path` as it was.
+        """
+        self._file.close()
+        if self.tmp_path.exists():
+            os.unlink(self.tmp_path)
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def records_path(out_dir: Path, stem: str, fmt: str) -> Path:
+    return out_dir / f"{stem}.{fmt}"
+
+
+def open_records(out_dir: Path, stem: str, fmt: str) -> RecordWriter:
+    """
+    Open `<out_dir>/<stem>.<fmt>` for streaming records.
+    """
+    return RecordWriter(records_path(out_dir, stem, fmt), fmt)
+
+
+def find_records(out_dir: Path, stem: str) -> Optional[Path]:
+    """
+    Return the records file for `stem` in whichever format exists (NDJSON first).
+    """
+    for fmt in reversed(FORMATS):
+        path = records_path(out_dir, stem, fmt)
+        if path.exists():
+            return path
+    return None
+
+
+def iter_records(path: Optional[Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from a `.json` array or `.ndjson` file.
+    NDJSON is read line by line; unreadable input yields nothing.
+    """
+    if path is None or not path.exists():
+        return
+    if path.suffix == ".ndjson":
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    try:
+        data = json.loads(path.read_text())
+    except Exception:
+        return
+    if isinstance(data, list):
+        yield from data
+
+
+def read_package(path: Optional[Path]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Read a package written by `write_package` as (header, file entries).
+    A missing or unreadable file gives an empty package.
+    """
+    if path is None:
+        return {}, []
+    if path.suffix == ".ndjson":
+        entries = iter_records(path)
+        return next(entries, {}), list(entries)
+    try:
+        header = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}, []
+    files = header.pop("files", [])
+    return header, files
+
+
+def write_package(
+    path: Path, header: Dict[str, Any], files: Iterable[Dict[str, Any]], fmt: str
+) -> bool:
+    """
+    Stream a package document (header fields plus a `files` list) to path,
+    leaving path untouched when its bytes would not change (see `IfChangedWriter`).
+    Returns True when path was written.
+
+    `json` matches `json.dumps({**header, "files": [...]}, indent=2)` byte for byte.
+    `ndjson` writes the header on the first line and then one file entry per line.
+    """
+    with IfChangedWriter(path) as f:
+        if fmt == "ndjson":
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for entry in files:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        else:
+            head = json.dumps(header, indent=2)
+            f.write(head[:-2] + ",\n" if header else "{\n")
+            f.write('  "files": [')
+            count = 0
+            for entry in files:
+                f.write("\n" if count == 0 else ",\n")
+                f.write(_indent(json.dumps(entry, indent=2), "    "))
+                count += 1
+            f.write("\n  ]\n}" if count else "]\n}")
+    return f.changed
+
+
+def remove_other_formats(out_dir: Path, stem: str, fmt: str):
+    """
+    Drop `<stem>.*` outputs of other formats so a format switch leaves no stale file.
+    """
+    for other in FORMATS:
+        if other != fmt:
+            path = records_path(out_dir, stem, other)
+            if path.exists():
+                os.unlink(path)
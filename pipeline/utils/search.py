@@ -0,0 +1,257 @@
+"""
+Prebuilt search index over icon names, tags, keywords, aliases and categories.
+
+`SearchIndexBuilder` collects the vendor cache records during `dist` and groups
+variants of the same icon into one document. The persisted index (`dist/search.json`) holds:
+
+- `docs`: `[vendor, name, [files...]]` per icon
+- `terms`: every distinct token
+- `postings`: per term, a flat `[doc, weight, doc, weight, ...]` list
+- `prefixes`: per prefix (1 to `PREFIX_LEN` chars), the term ids starting with it
+- `trigrams`: per trigram of `" " + term + " "`, the term ids containing it
+
+`SearchIndex.search` ranks exact term hits above prefix hits above fuzzy
+(trigram candidates confirmed by edit distance) hits, weighted by the field
+the term came from.
+"""
+
+import heapq
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PREFIX_LEN = 6
+
+# Relative weight of a term by the field it was found in
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "title": 3.0,
+    "alias": 2.5,
+    "tag": 1.5,
+    "keyword": 1.5,
+    "category": 1.0,
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f" {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance, giving up (returning limit + 1) once it exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# Record and `meta` keys that `search_fields` reads
+RECORD_KEYS = ("name", "file", "dist_path", "keywords")
+META_KEYS = ("title", "aliases", "alias", "tags", "categories", "category")
+
+
+def search_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The part of a vendor cache record the search and concept index builders
+    read, for callers that hold records only to index them.
+    """
+    slim = {key: record[key] for key in RECORD_KEYS if key in record}
+    meta = record.get("meta")
+    if isinstance(meta, dict):
+        slim["meta"] = {key: meta[key] for key in META_KEYS if key in meta}
+    return slim
+
+
+def search_fields(record: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Return (icon name, [(field, text), ...]) for a vendor cache record.
+    Works across vendors by looking at the fields each processor emits.
+    """
+    meta = record.get("meta") if isinstance(record.get("meta"), dict) else {}
+    fields: List[Tuple[str, str]] = []
+    name = record.get("name")
+    if not name:
+        # svgl: one record per file; group by the svgs.ts title when matched
+        name = meta.get("title") or Path(record.get("file", "")).stem
+    fields.append(("name", str(name)))
+    if meta.get("title"):
+        fields.append(("title", str(meta["title"])))
+    for alias in _as_list(meta.get("aliases")) + _as_list(meta.get("alias")):
+        alias_name = alias.get("name") if isinstance(alias, dict) else alias
+        if alias_name:
+            fields.append(("alias", str(alias_name)))
+    for tag in _as_list(meta.get("tags")):
+        fields.append(("tag", str(tag)))
+    for keyword in _as_list(record.get("keywords")):
+        fields.append(("keyword", str(keyword)))
+    for category in _as_list(meta.get("categories")) + _as_list(meta.get("category")):
+        fields.append(("category", str(category)))
+    return str(name), fields
+
+
+class SearchIndexBuilder:
+    def __init__(self):
+        self._docs: Dict[Tuple[str, str], int] = {}
+        self.docs: List[List[Any]] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+
+    def add_record(self, vendor: str, record: Dict[str, Any]):
+        name, fields = search_fields(record)
+        key = (vendor, name)
+        doc = self._docs.get(key)
+        if doc is None:
+            doc = self._docs[key] = len(self.docs)
+            self.docs.append([vendor, name, []])
+        if record.get("dist_path"):
+            self.docs[doc][2].append(record["dist_path"])
+        for field, text in fields:
+            weight = FIELD_WEIGHTS[field]
+            for term in tokenize(text):
+                postings = self._postings.setdefault(term, {})
+                if postings.get(doc, 0) < weight:
+                    postings[doc] = weight
+
+    def build(self) -> Dict[str, Any]:
+        for doc in self.docs:
+            doc[2].sort()
+        terms = sorted(self._postings)
+        prefixes: Dict[str, List[int]] = {}
+        trigrams: Dict[str, List[int]] = {}
+        for tid, term in enumerate(terms):
+            for n in range(1, min(len(term), PREFIX_LEN) + 1):
+                prefixes.setdefault(term[:n], []).append(tid)
+            for tri in sorted(_trigrams(term)):
+                trigrams.setdefault(tri, []).append(tid)
+        postings = []
+        for term in terms:
+            flat: List[Any] = []
+            for doc, weight in sorted(self._postings[term].items()):
+                flat.extend((doc, weight))
+            postings.append(flat)
+        return {
+            "version": 1,
+            "docs": self.docs,
+            "terms": terms,
+            "postings": postings,
+            "prefixes": prefixes,
+            "trigrams": trigrams,
+        }
+
+    def dumps(self) -> str:
+        return json.dumps(self.build(), separators=(",", ":"))
+
+
+class SearchHit(NamedTuple):
+    score: float
+    vendor: str
+    name: str
+    files: List[str]
+
+
+class SearchIndex:
+    """
+    In-memory view of `dist/search.json`.
+
+        index = SearchIndex.load(DIST_DIR / "search.json")
+        index.search("arow left", vendor="lucide-icons")
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.docs: List[List[Any]] = data["docs"]
+        self.terms: List[str] = data["terms"]
+        self._term_ids = {term: i for i, term in enumerate(self.terms)}
+        self._postings: List[List[Any]] = data["postings"]
+        self._prefixes: Dict[str, List[int]] = data["prefixes"]
+        self._trigrams: Dict[str, List[int]] = data["trigrams"]
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        return cls(json.loads(path.read_text()))
+
+    def _term_matches(self, token: str) -> Dict[int, float]:
+        """
+        Map term id -> match quality for one query token:
+        1.0 exact, 0.7-1.0 prefix, below 0.6 fuzzy.
+        """
+        matches: Dict[int, float] = {}
+        tid = self._term_ids.get(token)
+        if tid is not None:
+            matches[tid] = 1.0
+
+        for tid in self._prefixes.get(token[:PREFIX_LEN], ()):
+            term = self.terms[tid]
+            if tid not in matches and term.startswith(token):
+                matches[tid] = 0.7 + 0.3 * len(token) / len(term)
+
+        if len(token) >= 3:
+            limit = 1 if len(token) < 6 else 2
+            grams = _trigrams(token)
+            counts: Counter = Counter()
+            for tri in grams:
+                counts.update(self._trigrams.get(tri, ()))
+            # A term within `limit` edits shares at least this many trigrams
+            need = max(1, len(grams) - 3 * limit)
+            for tid, shared in counts.items():
+                if shared < need or tid in matches:
+                    continue
+                term = self.terms[tid]
+                dist = _edit_distance(token, term, limit)
+                if dist <= limit:
+                    matches[tid] = 0.6 * (1 - dist / max(len(term), len(token)))
+        return matches
+
+    def search(
+        self, query: str, limit: int = 20, vendor: Optional[str] = None
+    ) -> List[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        scores: Dict[int, float] = {}
+        matched: Counter = Counter()
+        for token in tokens:
+            best: Dict[int, float] = {}
+            for tid, quality in self._term_matches(token).items():
+                postings = self._postings[tid]
+                for i in range(0, len(postings), 2):
+                    doc, score = postings[i], quality * postings[i + 1]
+                    if score > best.get(doc, 0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0) + score
+                matched[doc] += 1
+
+        def _rank(doc: int) -> Tuple[int, float, int]:
+            # Docs matching every token first, then by score, then shorter names
+            return (matched[doc], scores[doc], -len(self.docs[doc][1]))
+
+        candidates: Iterable[int] = scores
+        if vendor:
+            candidates = (d for d in scores if self.docs[d][0] == vendor)
+        top = heapq.nlargest(limit, candidates, key=_rank)
+        return [
+            SearchHit(round(scores[d], 3), *self.docs[d]) for d in top
+        ]
@@ -0,0 +1,484 @@
+"""
+Async HTTP/1.1 server for dist/ (`main.py serve`), standard library only.
+
+- SVGs under `<vendor>/src/` are read from the vendor's `svgs.pack` (one mmap,
+  no per-request `stat` or `open`); other files are read from disk and
+  revalidated by `stat` on each hit.
+- Bodies live in a byte-bounded LRU with their content-hash ETag, so a hot
+  icon is sent from memory. `If-None-Match` gets `304`.
+- `Accept-Encoding` picks the smallest acceptable precompressed sibling listed
+  in `encodings.json` (see utils/precompress.py).
+- A single `Range: bytes=...` is answered with `206`, or `416` when it cannot
+  be satisfied. Ranges always apply to the identity encoding, and `If-Range`
+  is honored.
+- `/<vendor>/<name>?size=24&style=solid` resolves an icon through the
+  vendor's `data.json`: the first file whose properties match every query
+  parameter is served, with `Content-Location` pointing at it.
+- Every `svgs.pack`, `data.json` and top-level index is polled. When a new
+  build has landed and the stamps have settled, the packs and lookups are
+  reloaded and the LRU is dropped.
+"""
+
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from utils.precompress import ENCODINGS, MANIFEST
+from utils.records import find_records, read_package
+from utils.svg_pack import SvgPack
+
+CONTENT_TYPES = {
+    ".svg": "image/svg+xml",
+    ".json": "application/json",
+    ".ndjson": "application/x-ndjson",
+    ".md": "text/markdown; charset=utf-8",
+    ".pack": "application/octet-stream",
+    ".bin": "application/octet-stream",
+    ".npy": "application/octet-stream",
+}
+
+# Top-level outputs whose change marks a new build (besides each vendor's
+# svgs.pack and data.json)
+SENTINELS = (MANIFEST, "catalog.bin", "search.json", "concepts.json")
+
+MAX_HEADER = 16 * 1024
+
+REASONS = {
+    200: "OK",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+}
+
+
+class Asset(NamedTuple):
+    data: bytes
+    etag: str
+    # (st_mtime_ns, st_size, st_ino) for files read from disk; None for pack entries
+    stamp: Optional[Tuple[int, int, int]]
+
+
+def _etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def _file_stamp(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class LruCache:
+    """
+    Assets by key, evicting the least recently used once `max_bytes` is exceeded.
+    Assets larger than an eighth of the bound are not kept.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Any, Asset]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Asset]:
+        asset = self._items.get(key)
+        if asset is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return asset
+
+    def put(self, key: Any, asset: Asset):
+        size = len(asset.data)
+        if size > self.max_bytes // 8:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old.data)
+        self._items[key] = asset
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.bytes -= len(evicted.data)
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DistSnapshot:
+    """
+    What one build of dist/ serves from: the vendors' packs, the `data.json`
+    lookups and the encodings manifest.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.packs: Dict[str, SvgPack] = {}
+        # vendor -> name -> [(properties, file), ...] in data.json order
+        self.lookups: Dict[str, Dict[str, List[Tuple[Dict[str, str], str]]]] = {}
+        self.vendors: List[str] = []
+        if root.exists():
+            self.vendors = sorted(
+                entry.name
+                for entry in os.scandir(root)
+                if entry.is_dir()
+                and not entry.name.startswith(".")
+                and find_records(Path(entry.path), "data") is not None
+            )
+        for vendor in self.vendors:
+            by_name: Dict[str, List[Tuple[Dict[str, str], str]]] = {}
+            for entry in read_package(find_records(root / vendor, "data"))[1]:
+                props = {k: str(v) for k, v in (entry.get("properties") or {}).items()}
+                by_name.setdefault(entry["name"], []).append((props, entry["file"]))
+            self.lookups[vendor] = by_name
+            try:
+                self.packs[vendor] = SvgPack(root / vendor / "svgs.pack")
+            except (OSError, ValueError):
+                pass
+        try:
+            self.manifest: Dict[str, Dict[str, int]] = json.loads((root / MANIFEST).read_text())
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.stamp = stamp(root)
+
+    def resolve(self, vendor: str, name: str, query: Dict[str, str]) -> Optional[str]:
+        """
+        Dist path (relative to root) of the first variant of vendor/name whose
+        properties match every query parameter.
+        """
+        for props, file in self.lookups.get(vendor, {}).get(name, ()):
+            if all(props.get(k) == v for k, v in query.items()):
+                return f"{vendor}/{file}"
+        return None
+
+    def close(self):
+        for pack in self.packs.values():
+            pack.close()
+        self.packs.clear()
+
+
+def stamp(root: Path) -> Tuple[Any, ...]:
+    """
+    Stat signature of the files every build rewrites when its output changes.
+    """
+    paths = [root / name for name in SENTINELS]
+    if root.exists():
+        for entry in sorted(os.scandir(root), key=lambda e: e.name):
+            if entry.is_dir() and not entry.name.startswith("."):
+                base = Path(entry.path)
+                paths += [base / "svgs.pack", base / "data.json", base / "data.ndjson"]
+    out = []
+    for path in paths:
+        try:
+            out.append(_file_stamp(os.stat(path)))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    """
+    Accept-Encoding as {coding: q}.
+    """
+    weights: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def _pick_encoding(sizes: Dict[str, int], header: str) -> Optional[str]:
+    """
+    The smallest precompressed variant the client accepts (highest q first), or None.
+    """
+    if not header:
+        return None
+    weights = _accepted(header)
+    best = None
+    for encoding, size in sizes.items():
+        if encoding not in ENCODINGS:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0 and (best is None or (-q, size) < best[0]):
+            best = ((-q, size), encoding)
+    return best[1] if best else None
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end exclusive) for a single `bytes=` range, (0, 0) when unsatisfiable,
+    or None when the header should be ignored (malformed or several ranges).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return (0, 0)
+            return (max(0, size - length), size)
+        start = int(first)
+        end = int(last) + 1 if last else size
+    except ValueError:
+        return None
+    if start >= size or end <= start:
+        return (0, 0)
+    return (start, min(end, size))
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as required for If-None-Match
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class DistServer:
+    """
+    Serves `root` (dist/). `cache_bytes` bounds the LRU of bodies; the build
+    stamp is polled every `reload_interval` seconds.
+
+        server = DistServer(DIST_DIR, cache_bytes=64 << 20)
+        asyncio.run(server.serve("127.0.0.1", 8000))
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        cache_bytes: int = 64 << 20,
+        reload_interval: float = 1.0,
+        log: Callable[[str], None] = lambda message: None,
+    ):
+        self.root = root
+        self.cache = LruCache(cache_bytes)
+        self.reload_interval = reload_interval
+        self.log = log
+        self.snapshot = DistSnapshot(root)
+        self._date = (0, "")
+
+    # -- assets ---------------------------------------------------------
+
+    def _load(self, rel: str, encoding: Optional[str]) -> Optional[Asset]:
+        """
+        The bytes of dist path `rel` in `encoding` (None for identity), via the LRU.
+        """
+        key = (rel, encoding)
+        asset = self.cache.get(key)
+        vendor, _, inner = rel.partition("/")
+        pack = self.snapshot.packs.get(vendor)
+        # src/ and its precompressed siblings only change along with svgs.pack,
+        # which the reload stamp covers, so their hits skip the stat
+        if pack is not None and inner.startswith("src/"):
+            if asset is not None:
+                return asset
+            view = pack.get(inner) if encoding is None else None
+            if view is not None:
+                with view:
+                    data = bytes(view)
+                asset = Asset(data, _etag(data), None)
+                self.cache.put(key, asset)
+                return asset
+        path = os.path.join(self.root, rel + (ENCODINGS[encoding] if encoding else ""))
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if asset is not None and asset.stamp == _file_stamp(st):
+            return asset
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        asset = Asset(data, _etag(data), _file_stamp(st))
+        self.cache.put(key, asset)
+        return asset
+
+    # -- HTTP -----------------------------------------------------------
+
+    def _http_date(self) -> str:
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, formatdate(now, usegmt=True))
+        return self._date[1]
+
+    def _route(self, target: str) -> Tuple[Optional[str], bool]:
+        """
+        Map a request target to a dist path; the flag is set when it came from a
+        `data.json` lookup.
+        """
+        url = urlsplit(target)
+        path = posixpath.normpath(unquote(url.path)).lstrip("/")
+        parts = path.split("/")
+        if not path or path == "." or any(part.startswith(".") for part in parts):
+            return None, False
+        if len(parts) == 2 and parts[1] in self.snapshot.lookups.get(parts[0], {}):
+            query = dict(parse_qsl(url.query))
+            return self.snapshot.resolve(parts[0], parts[1], query), True
+        return path, False
+
+    def respond(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, List[Tuple[str, str]], bytes | memoryview]:
+        """
+        Build the response to one request: (status, headers, body).
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD")], b""
+        rel, looked_up = self._route(target)
+        if rel is None:
+            return 404, [("Content-Type", "text/plain")], b"not found\n"
+
+        sizes = self.snapshot.manifest.get(rel, {})
+        range_header = headers.get("range")
+        encoding = None if range_header else _pick_encoding(sizes, headers.get("accept-encoding", ""))
+        asset = self._load(rel, encoding)
+        if asset is None and encoding is not None:
+            encoding = None
+            asset = self._load(rel, None)
+        if asset is None:
+            return 404, [("Content-Type", "text/plain")], b"not found\n"
+
+        out = [("ETag", asset.etag), ("Cache-Control", "no-cache")]
+        if any(encoding in ENCODINGS for encoding in sizes):
+            out.append(("Vary", "Accept-Encoding"))
+        if looked_up:
+            out.append(("Content-Location", "/" + rel))
+        inm = headers.get("if-none-match")
+        if inm is not None and _etag_matches(inm, asset.etag):
+            return 304, out, b""
+
+        ext = os.path.splitext(rel)[1].lower()
+        out.append(("Content-Type", CONTENT_TYPES.get(ext) or mimetypes.guess_type(rel)[0] or "application/octet-stream"))
+        out.append(("Accept-Ranges", "bytes"))
+        if encoding:
+            out.append(("Content-Encoding", encoding))
+
+        size = len(asset.data)
+        if_range = headers.get("if-range")
+        if range_header and (if_range is None or if_range == asset.etag):
+            span = _parse_range(range_header, size)
+            if span == (0, 0):
+                out.append(("Content-Range", f"bytes */{size}"))
+                return 416, out, b""
+            if span is not None:
+                start, end = span
+                out.append(("Content-Range", f"bytes {start}-{end - 1}/{size}"))
+                return 206, out, memoryview(asset.data)[start:end]
+        return 200, out, asset.data
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                request = lines[0].split()
+                if len(request) != 3 or not request[2].startswith("HTTP/1."):
+                    writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                method, target, version = request
+                headers: Dict[str, str] = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                # GET and HEAD carry no body, but skip one if a client sends it
+                length = headers.get("content-length", "0")
+                if length.isdigit() and int(length):
+                    await reader.readexactly(int(length))
+
+                status, out, body = self.respond(method, target, headers)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                if status != 304:
+                    out.append(("Content-Length", str(len(body))))
+                out.append(("Date", self._http_date()))
+                if not keep_alive:
+                    out.append(("Connection", "close"))
+                lines_out = [f"HTTP/1.1 {status} {REASONS[status]}"]
+                lines_out += [f"{name}: {value}" for name, value in out]
+                writer.write(("\r\n".join(lines_out) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD" and body:
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # -- reload ---------------------------------------------------------
+
+    async def _watch(self):
+        """
+        Reload once the build stamp has changed and stayed the same for one interval,
+        so a build in progress is not picked up file by file.
+        """
+        seen = self.snapshot.stamp
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            current = await asyncio.to_thread(stamp, self.root)
+            if current != seen:
+                seen = current
+                continue
+            if current == self.snapshot.stamp:
+                continue
+            start = time.perf_counter()
+            snapshot = await asyncio.to_thread(DistSnapshot, self.root)
+            old, self.snapshot = self.snapshot, snapshot
+            self.cache.clear()
+            old.close()
+            seen = snapshot.stamp
+            self.log(
+                f"Reloaded {self.root} ({len(snapshot.vendors)} vendors) "
+                f"in {(time.perf_counter() - start) * 1e3:.0f} ms"
+            )
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER)
+        address = server.sockets[0].getsockname()
+        self.log(
+            f"Serving {self.root} on http://{address[0]}:{address[1]}/ "
+            f"({len(self.snapshot.vendors)} vendors)"
+        )
+        watcher = asyncio.create_task(self._watch()) if self.reload_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            self.snapshot.close()
@@ -0,0 +1,407 @@
+"""
+Perceptual similarity index over every dist icon, to suggest near-equivalent
+icons across vendors (lucide vs heroicons vs radix "arrow-left", ...).
+
+Icons are rendered from their geometry store (see utils/geometry.py) with NumPy,
+a whole vendor at a time: each icon is scaled so its bounding box fills a
+`RASTER`-pixel canvas (so padding and viewBox size do not matter), filled
+segments are filled with the nonzero rule and stroked segments are drawn with
+a fixed relative width. The canvas is averaged down to `GRID` x `GRID`, and the
+perceptual hash (pHash) is the sign of its 8 x 8 lowest DCT frequencies against
+their median: 64 bits, compared by Hamming distance.
+
+Persisted in dist/:
+
+- `similar.npy`: uint64 `(icons,)` hashes
+- `similar.lsh.npy`: int32 `(BANDS, icons)`, per 8-bit band of the hash the icon
+  rows sorted by that band's value
+- `similar.json`: format, `[vendor, name, file]` per row and the geometry
+  store digest of each vendor; a rebuild reuses the hashes of vendors whose
+  store is unchanged
+
+`SimilarityIndex.similar` is a multi-index (band) LSH lookup: every icon within
+`BANDS - 1` bits of the query shares at least one band value with it, so the
+band buckets (binary searches over the sorted rows) give a candidate set that
+is exact up to that distance. Candidates are ranked by Hamming distance and
+grouped by (vendor, name) like search hits; when fewer than `limit` icons are
+that close, all hashes are scanned instead (one vectorized XOR and popcount).
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.geometry import FILLED, STARTS_SUBPATH, STROKED, GeometryStore, np
+from utils.sync import write_if_changed
+
+FORMAT = "similar-v1"
+
+# Render size, hash input size and hash layout
+RASTER = 64
+GRID = 32
+HASH_SIZE = 8
+BANDS = 8
+# Empty border around the scaled icon, and stroke width, in raster pixels
+MARGIN = 4
+STROKE_WIDTH = 4.5
+# Line segments per cubic when flattening
+FLATTEN = 8
+# Icons rendered per NumPy pass, to bound memory
+CHUNK = 1024
+
+
+def _flatten(segments: "np.ndarray") -> "np.ndarray":
+    """
+    (K, FLATTEN + 1, 2) points along each cubic segment.
+    """
+    t = np.linspace(0, 1, FLATTEN + 1)[None, :, None]
+    p0, p1, p2, p3 = (segments[:, i, None, :] for i in range(4))
+    mt = 1 - t
+    return mt**3 * p0 + 3 * mt**2 * t * p1 + 3 * mt * t**2 * p2 + t**3 * p3
+
+
+def _spread(counts: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    For items repeated `counts` times: the item index and the 0-based repeat
+    number of each repetition.
+    """
+    item = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return item, np.arange(len(item)) - starts[item]
+
+
+def _fill(icons: int, x0, y0, x1, y1, owner) -> "np.ndarray":
+    """
+    Nonzero-rule coverage of pixel centers by the closed edge lists of each icon.
+    """
+    size = RASTER
+    lo, hi = np.minimum(y0, y1), np.maximum(y0, y1)
+    r0 = np.clip(np.ceil(lo - 0.5), 0, size).astype(np.int64)
+    r1 = np.clip(np.ceil(hi - 0.5), 0, size).astype(np.int64)
+    edge, k = _spread(np.maximum(r1 - r0, 0))
+    row = r0[edge] + k
+    yc = row + 0.5
+    xa, ya, xb, yb = x0[edge], y0[edge], x1[edge], y1[edge]
+    x = xa + (yc - ya) * (xb - xa) / (yb - ya)
+    direction = np.where(yb > ya, 1.0, -1.0)
+    # Each crossing flips the winding of every pixel center to its right
+    col = np.clip(np.ceil(x - 0.5), 0, size).astype(np.int64)
+    flat = (owner[edge] * size + row) * (size + 1) + col
+    acc = np.bincount(flat, weights=direction, minlength=icons * size * (size + 1))
+    winding = np.cumsum(acc.reshape(icons, size, size + 1), axis=2)[:, :, :size]
+    return np.abs(winding) > 0.5
+
+
+def _stroke(icons: int, x0, y0, x1, y1, owner) -> "np.ndarray":
+    """
+    Pixels within STROKE_WIDTH / 2 of the edges of each icon.
+    """
+    size = RASTER
+    steps = np.ceil(np.hypot(x1 - x0, y1 - y0) * 2).astype(np.int64) + 1
+    edge, k = _spread(steps)
+    t = k / np.maximum(steps[edge] - 1, 1)
+    px = np.floor(x0[edge] + t * (x1[edge] - x0[edge])).astype(np.int64)
+    py = np.floor(y0[edge] + t * (y1[edge] - y0[edge])).astype(np.int64)
+    inside = (px >= 0) & (px < size) & (py >= 0) & (py < size)
+    flat = (owner[edge] * size + py) * size + px
+    ink = np.bincount(flat[inside], minlength=icons * size * size).reshape(icons, size, size) > 0
+    # Dilate the sampled centerline by a disk of the stroke radius
+    radius = STROKE_WIDTH / 2
+    r = int(radius)
+    padded = np.pad(ink, ((0, 0), (r, r), (r, r)))
+    out = np.zeros_like(ink)
+    for dy in range(-r, r + 1):
+        for dx in range(-r, r + 1):
+            if dx * dx + dy * dy <= radius * radius:
+                out |= padded[:, r + dy : r + dy + size, r + dx : r + dx + size]
+    return out
+
+
+def _render_chunk(segments, kinds, offsets) -> "np.ndarray":
+    """
+    (icons, RASTER, RASTER) coverage of one chunk of a store; offsets start at 0.
+    """
+    icons = len(offsets) - 1
+    counts = np.diff(offsets)
+    if not len(kinds):
+        return np.zeros((icons, RASTER, RASTER), dtype=bool)
+    owner = np.repeat(np.arange(icons), counts)
+    points = _flatten(segments)
+
+    # Scale each icon's point bounds into the canvas, centered
+    drawn = counts > 0
+    starts = offsets[:-1][drawn]
+    lo = np.zeros((icons, 2))
+    hi = np.ones((icons, 2))
+    lo[drawn] = np.minimum.reduceat(points.min(axis=1), starts)
+    hi[drawn] = np.maximum.reduceat(points.max(axis=1), starts)
+    extent = (hi - lo).max(axis=1)
+    scale = (RASTER - 2 * MARGIN) / np.where(extent > 0, extent, 1)
+    center = (lo + hi) / 2
+    points = (points - center[owner, None, :]) * scale[owner, None, None] + RASTER / 2
+
+    a, b = points[:, :-1].reshape(-1, 2), points[:, 1:].reshape(-1, 2)
+    edge_owner = np.repeat(owner, FLATTEN)
+    edge_kinds = np.repeat(kinds, FLATTEN)
+
+    # Filling closes every subpath: add an edge from its last point to its first
+    first = np.flatnonzero(kinds & STARTS_SUBPATH)
+    last = np.r_[first[1:], len(kinds)] - 1
+    fa = np.concatenate([a, points[last, -1]])
+    fb = np.concatenate([b, points[first, 0]])
+    f_owner = np.concatenate([edge_owner, owner[first]])
+    f_kinds = np.concatenate([edge_kinds, kinds[first]])
+    filled = (f_kinds & FILLED) != 0
+    image = _fill(
+        icons, fa[filled, 0], fa[filled, 1], fb[filled, 0], fb[filled, 1], f_owner[filled]
+    )
+    stroked = (edge_kinds & STROKED) != 0
+    image |= _stroke(
+        icons, a[stroked, 0], a[stroked, 1], b[stroked, 0], b[stroked, 1], edge_owner[stroked]
+    )
+    return image
+
+
+def render(store: GeometryStore) -> "np.ndarray":
+    """
+    float32 (icons, GRID, GRID) grayscale renderings of every icon in a store.
+    """
+    offsets = np.asarray(store.offsets)
+    icons = len(offsets) - 1
+    factor = RASTER // GRID
+    out = np.zeros((icons, GRID, GRID), dtype=np.float32)
+    for start in range(0, icons, CHUNK):
+        stop = min(start + CHUNK, icons)
+        lo, hi = offsets[start], offsets[stop]
+        image = _render_chunk(
+            np.asarray(store.segments[lo:hi], dtype=np.float64),
+            np.asarray(store.kinds[lo:hi]),
+            offsets[start : stop + 1] - lo,
+        )
+        # Box filter down to the hash grid (anti-aliasing)
+        out[start:stop] = image.reshape(-1, GRID, factor, GRID, factor).mean(axis=(2, 4))
+    return out
+
+
+def _dct_matrix(n: int) -> "np.ndarray":
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+def phash(images: "np.ndarray") -> "np.ndarray":
+    """
+    uint64 perceptual hash of each (GRID, GRID) image: bit set where the low
+    frequency DCT coefficient exceeds the median of the HASH_SIZE^2 lowest ones.
+    """
+    d = _dct_matrix(images.shape[-1])
+    low = (d @ images @ d.T)[:, :HASH_SIZE, :HASH_SIZE].reshape(len(images), -1)
+    bits = low > np.median(low, axis=1, keepdims=True)
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def _popcount(values: "np.ndarray") -> "np.ndarray":
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    # numpy < 2: count the unpacked bits of each value, keeping the input shape
+    bits = np.unpackbits(np.ascontiguousarray(values).view(np.uint8), axis=-1)
+    return bits.reshape(values.shape + (64,)).sum(axis=-1)
+
+
+def _bands(hashes: "np.ndarray") -> "np.ndarray":
+    """
+    (BANDS, n) uint8 band values of each hash.
+    """
+    shifts = np.arange(BANDS, dtype=np.uint64)[:, None] * np.uint64(64 // BANDS)
+    return ((hashes[None, :] >> shifts) & np.uint64(0xFF)).astype(np.uint8)
+
+
+class SimilarHit(NamedTuple):
+    distance: int
+    vendor: str
+    name: str
+    files: List[str]
+
+
+class SimilarityIndex:
+    """
+    Perceptual hashes of dist icons with a band LSH index.
+
+        index = SimilarityIndex.load(DIST_DIR)
+        index.similar("lucide-icons", "arrow-left", limit=10)
+    """
+
+    def __init__(
+        self,
+        icons: List[List[str]],
+        hashes: "np.ndarray",
+        lsh: "np.ndarray",
+        sources: Optional[Dict[str, str]] = None,
+    ):
+        self.icons = icons
+        self.hashes = hashes
+        # Geometry store digest per vendor the hashes were computed from
+        self.sources = sources or {}
+        # Per band: rows sorted by band value, and those values for searchsorted
+        self.lsh = lsh
+        self._sorted_bands = np.take_along_axis(_bands(hashes), lsh.astype(np.int64), axis=1)
+        self.vendors = sorted({vendor for vendor, _, _ in icons})
+        vendor_ids = {vendor: i for i, vendor in enumerate(self.vendors)}
+        self._vendor_of = np.array([vendor_ids[v] for v, _, _ in icons], dtype=np.int64)
+        self._rows: Optional[Dict[Tuple[str, str], List[int]]] = None
+
+    @classmethod
+    def build(
+        cls,
+        stores: Iterable[Tuple[str, GeometryStore]],
+        previous: Optional["SimilarityIndex"] = None,
+    ) -> "SimilarityIndex":
+        """
+        Hash every icon that has geometry in the (vendor, store) pairs. Vendors
+        whose store digest matches `previous` keep their hashes from it.
+        """
+        icons: List[List[str]] = []
+        parts = []
+        sources = {}
+        for vendor, store in stores:
+            sources[vendor] = store.source
+            if previous is not None and store.source and previous.sources.get(vendor) == store.source:
+                rows = [i for i, icon in enumerate(previous.icons) if icon[0] == vendor]
+                icons.extend(previous.icons[i] for i in rows)
+                parts.append(previous.hashes[rows])
+                continue
+            drawn = np.diff(np.asarray(store.offsets)) > 0
+            parts.append(phash(render(store))[drawn])
+            for file, keep in zip(store.files, drawn.tolist()):
+                if keep:
+                    name = os.path.splitext(file.rpartition("/")[2])[0]
+                    icons.append([vendor, name, file])
+        hashes = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint64)
+        lsh = np.argsort(_bands(hashes), axis=1, kind="stable").astype(np.int32)
+        return cls(icons, hashes, lsh, sources)
+
+    @staticmethod
+    def paths(directory: Path) -> Dict[str, Path]:
+        return {
+            "hashes": directory / "similar.npy",
+            "lsh": directory / "similar.lsh.npy",
+            "index": directory / "similar.json",
+        }
+
+    def save(self, directory: Path) -> bool:
+        """
+        Write the index into directory; only files whose bytes changed are written.
+        """
+        paths = self.paths(directory)
+        changed = False
+        for key in ("hashes", "lsh"):
+            buf = io.BytesIO()
+            np.save(buf, getattr(self, key), allow_pickle=False)
+            changed |= write_if_changed(paths[key], buf.getvalue())
+        index = {
+            "format": FORMAT,
+            "grid": GRID,
+            "bands": BANDS,
+            "sources": self.sources,
+            "icons": self.icons,
+        }
+        changed |= write_if_changed(paths["index"], json.dumps(index) + "\n")
+        return changed
+
+    @classmethod
+    def load(cls, directory: Path) -> "SimilarityIndex":
+        paths = cls.paths(directory)
+        index = json.loads(paths["index"].read_text())
+        if index.get("format") != FORMAT:
+            raise ValueError(f"{paths['index']}: unsupported format {index.get('format')!r}")
+        return cls(
+            index["icons"],
+            np.load(paths["hashes"]),
+            np.load(paths["lsh"]),
+            index.get("sources"),
+        )
+
+    @staticmethod
+    def remove(directory: Path):
+        for path in SimilarityIndex.paths(directory).values():
+            if path.exists():
+                path.unlink()
+
+    def rows(self, vendor: str, key: str) -> List[int]:
+        """
+        Rows of a vendor's icon by name or dist path (all variants sharing the name).
+        """
+        if self._rows is None:
+            self._rows = {}
+            for row, (v, name, file) in enumerate(self.icons):
+                self._rows.setdefault((v, name), []).append(row)
+                self._rows.setdefault((v, file), []).append(row)
+        return self._rows.get((vendor, key), [])
+
+    def _candidates(self, value: "np.ndarray") -> "np.ndarray":
+        """
+        Rows sharing at least one band value with hash `value`.
+        """
+        found = []
+        for band, v in enumerate(_bands(value.reshape(1))[:, 0].tolist()):
+            keys = self._sorted_bands[band]
+            lo = np.searchsorted(keys, v, "left")
+            hi = np.searchsorted(keys, v, "right")
+            found.append(self.lsh[band, lo:hi])
+        return np.concatenate(found)
+
+    def similar(
+        self,
+        vendor: str,
+        key: str,
+        limit: int = 10,
+        vendors: Optional[Iterable[str]] = None,
+    ) -> List[SimilarHit]:
+        """
+        The `limit` icons closest to vendor/key (name or dist path), excluding
+        the query itself, optionally only from `vendors`. Variants sharing a
+        name are one hit at the distance of the closest variant pair.
+        """
+        query = self.rows(vendor, key)
+        if not query:
+            raise KeyError(f"{vendor}/{key}")
+        targets = self.hashes[query]
+        allowed = None
+        if vendors:
+            allowed = np.array([i for i, v in enumerate(self.vendors) if v in set(vendors)])
+
+        def _rank(rows: "np.ndarray") -> List[SimilarHit]:
+            # Distance to the closest query variant, without the query's own rows
+            distance = _popcount(self.hashes[rows][None, :] ^ targets[:, None]).min(axis=0)
+            keep = ~np.isin(rows, query)
+            if allowed is not None:
+                keep &= np.isin(self._vendor_of[rows], allowed)
+            rows, distance = rows[keep], distance[keep]
+            hits: Dict[Tuple[str, str], SimilarHit] = {}
+            # Variants collapse into one hit, so look at a few times `limit` rows
+            # first and only sort everything if those hold fewer groups
+            for head in (limit * 8, len(rows)):
+                if head < len(rows):
+                    part = np.argpartition(distance, head)[:head]
+                else:
+                    part = np.arange(len(rows))
+                order = part[np.lexsort((rows[part], distance[part]))]
+                hits.clear()
+                for row, dist in zip(rows[order].tolist(), distance[order].tolist()):
+                    vendor, name, _ = self.icons[row]
+                    if (vendor, name) not in hits:
+                        files = [self.icons[r][2] for r in self.rows(vendor, name)]
+                        hits[vendor, name] = SimilarHit(dist, vendor, name, files)
+                        if len(hits) == limit:
+                            return list(hits.values())
+            return list(hits.values())
+
+        candidates = np.unique(np.concatenate([self._candidates(h) for h in targets]))
+        hits = _rank(candidates)
+        if len(hits) < limit or hits[-1].distance >= BANDS:
+            # Beyond the LSH guarantee: rank every icon
+            hits = _rank(np.arange(len(self.hashes)))
+        return hits
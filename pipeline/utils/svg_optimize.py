@@ -0,0 +1,455 @@
+"""
+Lossless-in-rendering SVG minification for dist assets.
+
+`optimize_svg` re-serializes a document through expat and:
+
+- drops the XML declaration, DOCTYPE, comments and processing instructions
+- drops `<metadata>`, generator `<desc>` and elements/attributes in editor
+  namespaces (Inkscape, Sodipodi, Sketch, Adobe, Serif, RDF/Dublin Core)
+- drops whitespace-only text and collapses whitespace in attribute values
+  (text content of `<text>`, `<style>`, `<title>`, ... is kept as-is)
+- rounds numbers in path data, `points` and plain numeric geometry
+  attributes to `precision` decimals; transforms and the root element's
+  `viewBox`, `width` and `height` are untouched
+
+The result is parsed again and must keep the root `viewBox`, `width` and
+`height`; otherwise (or when it would not be smaller) the original bytes are kept.
+
+`canonicalize_svg` runs the same pass without rounding, to compare documents
+by content. `optimize_tree` applies `optimize_svg` to a vendor tree in a
+process pool, syncing into dst like `sync_tree` and reporting bytes before and after.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from xml.parsers import expat
+
+from utils.pool import map_batches
+from utils.sync import SourceFile, prune_tree, walk_files, write_if_changed
+
+DEFAULT_PRECISION = 3
+
+# Files per worker task; keeps IPC overhead small next to the parse work
+BATCH_SIZE = 128
+
+_EDITOR_NS_PREFIXES = (
+    "http://sodipodi.sourceforge.net/",
+    "http://www.inkscape.org/namespaces/",
+    "http://www.bohemiancoding.com/sketch/",
+    "http://ns.adobe.com/",
+    "http://www.serif.com/",
+    "http://purl.org/dc/",
+    "http://creativecommons.org/ns",
+    "http://web.resource.org/cc/",
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns",
+)
+_DROP_ELEMENTS = {"metadata"}
+# Text inside these is meaningful and kept verbatim
+_TEXT_ELEMENTS = {"text", "tspan", "textPath", "style", "script", "title", "desc"}
+_NUMERIC_ATTRS = {
+    "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry",
+    "fx", "fy", "width", "height", "stroke-width",
+}
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_SEPARATORS = " \t\r\n,"
+_ARITY = {"m": 2, "l": 2, "t": 2, "h": 1, "v": 1, "c": 6, "s": 4, "q": 4, "a": 7, "z": 0}
+# Root attributes that must survive optimization unchanged
+_ROOT_KEEP = ("viewBox", "width", "height")
+
+OPTIMIZED, UNCHANGED, INVALID = "optimized", "unchanged", "invalid"
+
+
+def format_number(value: float, precision: Optional[int]) -> str:
+    """
+    Shortest decimal for value rounded to precision: no trailing zeros,
+    no leading zero (`0.5` -> `.5`, `-0.25` -> `-.25`).
+    A precision of None keeps the value exactly (shortest round-trip repr).
+    """
+    if precision is None:
+        text = repr(value)
+        if text.endswith(".0"):
+            text = text[:-2]
+    else:
+        text = f"{value:.{precision}f}"
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def _join_numbers(parts: List[str], flags: frozenset = frozenset()) -> str:
+    """
+    Join numbers, omitting the separator when the next one cannot be read as part
+    of the previous one. `flags` holds indexes of arc flags, which are always a
+    single character, so nothing after them needs a separator.
+    """
+    out: List[str] = []
+    prev: Optional[str] = None
+    for i, part in enumerate(parts):
+        if prev is not None and i - 1 not in flags and not part.startswith("-"):
+            if part[0] != "." or not ("." in prev or "e" in prev or "E" in prev):
+                out.append(" ")
+        out.append(part)
+        prev = part
+    return "".join(out)
+
+
+def optimize_path(d: str, precision: Optional[int]) -> str:
+    """
+    Round and compact path data. Raises ValueError on malformed data.
+    Arc flags are read as single characters, so `a1 1 0 011 1` parses correctly.
+    """
+    out: List[str] = []
+    numbers: List[str] = []
+    flags: set = set()
+    pos, end = 0, len(d)
+    cmd: Optional[str] = None
+    index = 0
+    while True:
+        while pos < end and d[pos] in _SEPARATORS:
+            pos += 1
+        if pos >= end:
+            break
+        char = d[pos]
+        if char.lower() in _ARITY:
+            if numbers:
+                out.append(_join_numbers(numbers, frozenset(flags)))
+                numbers, flags = [], set()
+            cmd, index = char.lower(), 0
+            out.append(char)
+            pos += 1
+            continue
+        if cmd is None or cmd == "z":
+            raise ValueError(f"unexpected {char!r} at {pos} in path data")
+        arity = _ARITY[cmd]
+        if cmd == "a" and index % arity in (3, 4):
+            if char not in "01":
+                raise ValueError(f"bad arc flag {char!r} at {pos} in path data")
+            flags.add(len(numbers))
+            numbers.append(char)
+            pos += 1
+        else:
+            match = _NUMBER.match(d, pos)
+            if not match:
+                raise ValueError(f"unexpected {char!r} at {pos} in path data")
+            numbers.append(format_number(float(match.group()), precision))
+            pos = match.end()
+        index += 1
+    if numbers:
+        out.append(_join_numbers(numbers, frozenset(flags)))
+    if cmd is not None and cmd != "z" and index % _ARITY[cmd]:
+        raise ValueError("truncated path data")
+    return "".join(out)
+
+
+def _round_list(value: str, precision: Optional[int]) -> str:
+    parts = value.replace(",", " ").split()
+    if not all(_NUMBER.fullmatch(p) for p in parts):
+        return " ".join(parts)
+    return _join_numbers([format_number(float(p), precision) for p in parts])
+
+
+def _escape_attr(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;")
+
+
+def _escape_text(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _is_editor_ns(uri: str) -> bool:
+    return uri.startswith(_EDITOR_NS_PREFIXES)
+
+
+class _Minifier:
+    def __init__(self, precision: Optional[int]):
+        self.precision = precision
+        self.out: List[str] = []
+        self.root_attrs: Optional[Dict[str, str]] = None
+        # Per open element: [name, kept, has_content, start index in out]
+        self.stack: List[List] = []
+        self.prefixes: List[Dict[str, str]] = [{}]
+        self.skip_depth = 0
+        self.desc_text: List[str] = []
+
+    def _editor_prefix(self, qname: str) -> bool:
+        prefix, sep, _ = qname.partition(":")
+        if not sep or prefix in ("xml", "xmlns"):
+            return False
+        return _is_editor_ns(self.prefixes[-1].get(prefix, ""))
+
+    def _attr_value(self, name: str, value: str, root: bool) -> str:
+        if name == "d":
+            try:
+                return optimize_path(value, self.precision)
+            except ValueError:
+                return " ".join(value.split())
+        if name == "points":
+            return _round_list(value, self.precision)
+        value = " ".join(value.split())
+        if name in _NUMERIC_ATTRS and not root and _NUMBER.fullmatch(value):
+            return format_number(float(value), self.precision)
+        return value
+
+    def _open_parent(self):
+        if self.stack and not self.stack[-1][2]:
+            self.stack[-1][2] = True
+            if self.stack[-1][1]:
+                self.out.append(">")
+
+    def start(self, name: str, attrs: List[str]):
+        pairs = list(zip(attrs[::2], attrs[1::2]))
+        scope = dict(self.prefixes[-1])
+        for key, value in pairs:
+            if key.startswith("xmlns:"):
+                scope[key[6:]] = value
+        self.prefixes.append(scope)
+        root = self.root_attrs is None
+        if root:
+            self.root_attrs = dict(pairs)
+
+        drop = (
+            self.skip_depth > 0
+            or name in _DROP_ELEMENTS
+            or self._editor_prefix(name)
+        )
+        if drop:
+            self.skip_depth += 1
+            self.stack.append([name, False, True])
+            return
+        self._open_parent()
+        parts = [f"<{name}"]
+        for key, value in pairs:
+            if key.startswith("xmlns:") and _is_editor_ns(value):
+                continue
+            if self._editor_prefix(key):
+                continue
+            parts.append(f' {key}="{_escape_attr(self._attr_value(key, value, root))}"')
+        self.stack.append([name, True, False, len(self.out)])
+        self.out.append("".join(parts))
+
+    def end(self, name: str):
+        entry = self.stack.pop()
+        self.prefixes.pop()
+        if not entry[1]:
+            self.skip_depth -= 1
+            return
+        if name == "desc" and "".join(self.desc_text).strip().startswith("Created with"):
+            # Generator banner (Sketch, Illustrator): drop the element entirely
+            del self.out[entry[3]:]
+            self.desc_text = []
+            return
+        self.desc_text = []
+        self.out.append(f"</{name}>" if entry[2] else "/>")
+
+    def text(self, data: str):
+        if self.skip_depth or not self.stack:
+            return
+        name = self.stack[-1][0]
+        if name not in _TEXT_ELEMENTS:
+            data = data.strip()
+            if not data:
+                return
+        if name == "desc":
+            self.desc_text.append(data)
+        self._open_parent()
+        self.out.append(_escape_text(data))
+
+    def run(self, data: bytes) -> str:
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.text
+        parser.Parse(data, True)
+        return "".join(self.out)
+
+
+def _root_keep(attrs: Dict[str, str]) -> List[Optional[List[str]]]:
+    return [
+        attrs[key].replace(",", " ").split() if key in attrs else None
+        for key in _ROOT_KEEP
+    ]
+
+
+def _root_attrs(data: bytes) -> Dict[str, str]:
+    found: List[Dict[str, str]] = []
+
+    def _start(name: str, attrs: Dict[str, str]):
+        if not found:
+            found.append(attrs)
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = _start
+    parser.Parse(data, True)
+    if not found:
+        raise ValueError("no root element")
+    return found[0]
+
+
+def _minify(data: bytes, precision: Optional[int]) -> Optional[bytes]:
+    """
+    Minified data, or None when the input does not parse or the output fails validation.
+    """
+    try:
+        minifier = _Minifier(precision)
+        result = minifier.run(data).encode()
+        if _root_keep(_root_attrs(result)) != _root_keep(minifier.root_attrs or {}):
+            return None
+    except (expat.ExpatError, ValueError):
+        return None
+    return result
+
+
+def optimize_svg(data: bytes, precision: int = DEFAULT_PRECISION) -> Tuple[bytes, str]:
+    """
+    Minify one SVG document. Returns (bytes, status):
+
+    - `OPTIMIZED`: the minified document
+    - `UNCHANGED`: data as-is, minifying did not make it smaller
+    - `INVALID`: data as-is, the input did not parse or the output failed
+      validation (must parse and keep the root viewBox, width and height)
+    """
+    result = _minify(data, precision)
+    if result is None:
+        return data, INVALID
+    if len(result) >= len(data):
+        return data, UNCHANGED
+    return result, OPTIMIZED
+
+
+def canonicalize_svg(data: bytes) -> bytes:
+    """
+    Canonical form for content addressing: minified without rounding, so documents
+    differing only in formatting, comments or editor metadata share one form.
+    Returns data as-is when it cannot be minified safely.
+    """
+    result = _minify(data, None)
+    return data if result is None else result
+
+
+@dataclass
+class OptimizeStats:
+    files: int = 0
+    written: int = 0
+    removed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    unchanged: int = 0
+    invalid: List[str] = field(default_factory=list)
+    # Minified bytes per relative path, when `optimize_tree` was asked to keep them
+    outputs: Dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def report(self, precision: int) -> Dict:
+        return {
+            "precision": precision,
+            "files": self.files,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "saved": self.bytes_before - self.bytes_after,
+            # Already minimal: minifying did not make them smaller
+            "unchanged": self.unchanged,
+            # Kept as-is: did not parse, or the output failed validation
+            "invalid": sorted(self.invalid),
+        }
+
+    def __str__(self) -> str:
+        saved = self.bytes_before - self.bytes_after
+        pct = 100 * saved / self.bytes_before if self.bytes_before else 0
+        return (
+            f"{self.written} written, {self.removed} removed, "
+            f"{self.bytes_before} -> {self.bytes_after} bytes (-{pct:.1f}%)"
+        )
+
+
+def _optimize_batch(
+    batch: List[Tuple[str, Union[str, bytes], str]],
+    precision: int,
+    canonical: bool = False,
+    keep_outputs: bool = False,
+) -> List[Tuple[str, int, int, str, bool, Optional[bytes]]]:
+    """
+    Worker: optimize (rel, src path or bytes, dst) files and write the ones whose
+    output changed. Returns (rel, bytes before, bytes after, status, written,
+    output if `keep_outputs`) per file.
+    """
+    results = []
+    for rel, src, dst in batch:
+        if isinstance(src, bytes):
+            data = src
+        else:
+            with open(src, "rb") as f:
+                data = f.read()
+        result, status = optimize_svg(data, precision)
+        if canonical:
+            result = canonicalize_svg(result)
+        written = write_if_changed(Path(dst), result)
+        output = result if keep_outputs else None
+        results.append((rel, len(data), len(result), status, written, output))
+    return results
+
+
+def optimize_tree(
+    src: Path,
+    dst: Path,
+    precision: int = DEFAULT_PRECISION,
+    jobs: int = 1,
+    suffix: str = ".svg",
+    canonical: bool = False,
+    files: Optional[List[SourceFile]] = None,
+    keep_outputs: bool = False,
+) -> OptimizeStats:
+    """
+    Mirror the `suffix` files under src into dst, minified with `optimize_svg`.
+    Like `sync_tree`, only changed outputs are written and removed files are deleted.
+    With `canonical`, outputs are passed through `canonicalize_svg` as well, so they
+    equal their blob (utils/blob_store.py) byte for byte.
+    Pass `files` from `scan_tree(src, suffix)` to minify those buffers instead of
+    reading src, and `keep_outputs` to get the minified bytes in `stats.outputs`
+    instead of reading dst back.
+    """
+    stats = OptimizeStats()
+    sources: Dict[str, Union[str, bytes]]
+    if files is not None:
+        sources = {file.rel: file.data for file in files}
+    else:
+        sources = {
+            rel: path
+            for rel, path in walk_files(src).items()
+            if rel.lower().endswith(suffix)
+        }
+    tasks = [(rel, sources[rel], os.path.join(str(dst), rel)) for rel in sorted(sources)]
+    results = map_batches(
+        _optimize_batch, tasks, BATCH_SIZE, jobs, precision, canonical, keep_outputs
+    )
+
+    for batch in results:
+        for rel, before, after, status, written, output in batch:
+            if output is not None:
+                stats.outputs[rel] = output
+            stats.files += 1
+            stats.bytes_before += before
+            stats.bytes_after += after
+            stats.written += written
+            if status == UNCHANGED:
+                stats.unchanged += 1
+            elif status == INVALID:
+                stats.invalid.append(rel)
+
+    existing = {
+        rel: path
+        for rel, path in walk_files(dst).items()
+        if rel.lower().endswith(suffix)
+    }
+    stats.removed = prune_tree(dst, existing, sources)
+    return stats
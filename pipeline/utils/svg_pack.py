@@ -0,0 +1,158 @@
+"""
+Packed SVG bundle per vendor (`dist/<vendor>/svgs.pack`): every SVG of the
+vendor in one file, addressed by its dist path (`src/...`, as in data.json).
+
+Layout (little-endian):
+
+- header (40 bytes): magic, version, file count and section offsets (`_HEADER`)
+- names: string table of the sorted file paths (see `pack_string_table`)
+- entries: per file, in name order, (u64 offset into the blob, u32 length)
+- blob: the SVG bytes, concatenated in name order; files with identical bytes
+  are stored once and their entries share the offset
+
+`SvgPack` maps the file and binary-searches the name table, so opening costs
+one mmap and `get` returns a `memoryview` into the mapping without copying.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.binary_catalog import pack_string_table
+from utils.sync import walk_files
+
+MAGIC = b"ICNPACK\x01"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQQ")
+_ENTRY = struct.Struct("<QI")
+_SPAN = struct.Struct("<II")
+
+
+def build_pack(files: Iterable[Tuple[str, bytes]]) -> bytes:
+    """
+    Serialize (dist path, SVG bytes) pairs into the pack format.
+    """
+    items = sorted(files)
+    names = pack_string_table([name for name, _ in items])
+    entries = bytearray()
+    bodies: List[bytes] = []
+    offsets: Dict[bytes, int] = {}
+    offset = 0
+    for _, data in items:
+        if data not in offsets:
+            offsets[data] = offset
+            bodies.append(data)
+            offset += len(data)
+        entries += _ENTRY.pack(offsets[data], len(data))
+    names_offset = _HEADER.size
+    entries_offset = names_offset + len(names)
+    blob_offset = entries_offset + len(entries)
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(items), names_offset, entries_offset, blob_offset
+    )
+    return b"".join([header, names, bytes(entries), *bodies])
+
+
+def pack_tree(src: Path, prefix: str = "src/", suffix: str = ".svg") -> bytes:
+    """
+    Pack every `suffix` file under src, named `prefix + relative path`.
+    """
+    files = []
+    for rel, path in walk_files(src).items():
+        if rel.lower().endswith(suffix):
+            with open(path, "rb") as f:
+                files.append((prefix + rel, f.read()))
+    return build_pack(files)
+
+
+class SvgPack:
+    """
+    Read-only view of an `svgs.pack` backed by mmap.
+
+        with SvgPack(DIST_DIR / "heroicons" / "svgs.pack") as pack:
+            body = pack.get("src/24/solid/x-mark.svg")  # memoryview or None
+
+    Views returned by `get` point into the mapping: release them before `close`.
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} SVG pack")
+        (
+            magic,
+            version,
+            self.count,
+            self._names_offset,
+            self._entries_offset,
+            self._blob_offset,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} SVG pack")
+        self._names_blob = self._names_offset + 4 * (self.count + 1)
+
+    def _name_bytes(self, index: int) -> bytes:
+        start, end = _SPAN.unpack_from(self._mm, self._names_offset + 4 * index)
+        return self._mm[self._names_blob + start : self._names_blob + end]
+
+    def name(self, index: int) -> str:
+        return self._name_bytes(index).decode()
+
+    def _find(self, name: str) -> int:
+        key = name.encode()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            # Names are sorted as str; UTF-8 byte order is the same order
+            if self._name_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._name_bytes(lo) == key:
+            return lo
+        return -1
+
+    def _slice(self, index: int) -> memoryview:
+        offset, length = _ENTRY.unpack_from(
+            self._mm, self._entries_offset + index * _ENTRY.size
+        )
+        start = self._blob_offset + offset
+        return self._view[start : start + length]
+
+    def get(self, name: str) -> Optional[memoryview]:
+        """
+        Return the bytes of the file at dist path `name` as a zero-copy view, or None.
+        """
+        index = self._find(name)
+        return self._slice(index) if index >= 0 else None
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(name) >= 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.count):
+            yield self.name(index)
+
+    def items(self) -> Iterator[Tuple[str, memoryview]]:
+        for index in range(self.count):
+            yield self.name(index), self._slice(index)
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "SvgPack":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,38 +1,87 @@
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Union
 
+# Bytes fed to the incremental parser per step; the root start tag almost always fits in one.
+PROBE_CHUNK = 512
 
-def parse_svg_basic(path: Path) -> Dict[str, Any]:
+
+class _RootFound(Exception):
+    pass
+
+
+def _as_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _probe_root_attrib(chunks: Iterable[bytes]) -> Optional[Dict[str, str]]:
+    """
+    Feed chunks to an expat parser only until the root start tag is seen and return
+    its attributes. Returns None when no root element is found (empty or truncated input).
+    """
+    parser = expat.ParserCreate()
+    found: list = []
+
+    def _start(name: str, attrs: Dict[str, str]):
+        found.append(attrs)
+        raise _RootFound
+
+    parser.StartElementHandler = _start
+    try:
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+    except _RootFound:
+        return found[0]
+    return None
+
+
+def _read_root_attrib(source: Union[Path, bytes]) -> Dict[str, str]:
+    try:
+        if isinstance(source, Path):
+            with open(source, "rb") as f:
+                attrib = _probe_root_attrib(iter(lambda: f.read(PROBE_CHUNK), b""))
+        else:
+            view = memoryview(source)
+            attrib = _probe_root_attrib(
+                view[i : i + PROBE_CHUNK] for i in range(0, len(view), PROBE_CHUNK)
+            )
+    except expat.ExpatError:
+        attrib = None
+    if attrib is not None:
+        return attrib
+    # Odd files the probe could not handle: fall back to a full parse
+    if isinstance(source, Path):
+        return dict(ET.parse(source).getroot().attrib)
+    return dict(ET.fromstring(source).attrib)
+
+
+def parse_svg_basic(source: Union[Path, bytes]) -> Dict[str, Any]:
     """
     Parse basic SVG attributes: viewBox, width, height.
     Falls back to viewBox values when width/height are not present or not numeric.
+
+    `source` is a path or the file's bytes. Only the root start tag is parsed;
+    a full parse is used as a fallback when the probe cannot find it.
     """
     result: Dict[str, Any] = {
         "viewBox": None,
         "width": None,
         "height": None,
     }
-    if not path.exists():
-        return result
-
     try:
-        tree = ET.parse(path)
-        root = tree.getroot()
-        view_box = root.attrib.get("viewBox")
-        width = root.attrib.get("width")
-        height = root.attrib.get("height")
+        attrib = _read_root_attrib(source)
+        view_box = attrib.get("viewBox")
+        width = attrib.get("width")
+        height = attrib.get("height")
 
         result["viewBox"] = view_box
 
-        def _as_number(value: Optional[str]) -> Optional[float]:
-            if value is None:
-                return None
-            try:
-                return float(value)
-            except ValueError:
-                return None
-
         width_num = _as_number(width)
         height_num = _as_number(height)
 
@@ -48,7 +97,7 @@ def parse_svg_basic(path: Path) -> Dict[str, Any]:
         result["width"] = width_num
         result["height"] = height_num
     except Exception:
-        # If parsing fails, return whatever was collected (mostly None)
+        # Missing file or parse failure: return whatever was collected (mostly None)
         return result
 
     return result
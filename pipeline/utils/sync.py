@@ -0,0 +1,371 @@
+import errno
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux FICLONE ioctl: share extents copy-on-write (btrfs, xfs, bcachefs)
+_FICLONE = 0x40049409
+
+LINK_MODES = ("auto", "copy", "hardlink", "reflink")
+
+
+@dataclass
+class SyncStats:
+    copied: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.copied} copied, {self.removed} removed, {self.unchanged} unchanged"
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    # Asking for one byte more than expected gets the whole file and the EOF
+    # in a single read() in the common case
+    data = os.read(fd, size + 1)
+    if len(data) <= size:
+        return data
+    chunks = [data]
+    while chunk := os.read(fd, 1 << 16):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _read(path: str | Path, size: int) -> bytes:
+    """
+    Read a file whose size is already known from a stat.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return _read_fd(fd, size)
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class SourceFile:
+    """
+    A file listed and read once by `scan_tree`; later stages use `data` instead
+    of opening the file again.
+    """
+
+    rel: str
+    path: str
+    data: bytes
+    st: os.stat_result
+
+
+def _same_content(src: str | Path, dst: str | Path) -> bool:
+    """
+    Compare two files by size, then inode (hardlinks), then bytes.
+    """
+    try:
+        s_st = os.stat(src)
+        d_st = os.stat(dst)
+    except OSError:
+        return False
+    if s_st.st_size != d_st.st_size:
+        return False
+    if (s_st.st_dev, s_st.st_ino) == (d_st.st_dev, d_st.st_ino):
+        return True
+    return _read(src, s_st.st_size) == _read(dst, d_st.st_size)
+
+
+def _same_as(file: SourceFile, dst: str) -> bool:
+    """
+    `_same_content` for a scanned source: only dst is stat'ed and read.
+    """
+    try:
+        d_st = os.stat(dst)
+    except OSError:
+        return False
+    if len(file.data) != d_st.st_size:
+        return False
+    if (file.st.st_dev, file.st.st_ino) == (d_st.st_dev, d_st.st_ino):
+        return True
+    return _read(dst, d_st.st_size) == file.data
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    if fcntl is None:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _materialize(src: Path, tmp: Path, mode: str, data: Optional[bytes] = None):
+    if mode == "hardlink":
+        try:
+            os.link(src, tmp)
+            return
+        except OSError as e:
+            # Cross-device or unsupported filesystem: fall back to a copy
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK):
+                raise
+    elif mode in ("auto", "reflink"):
+        if _reflink(src, tmp):
+            return
+    if data is None:
+        shutil.copy2(src, tmp)
+    else:
+        # Contents already in memory: write them instead of reading src again
+        with open(tmp, "wb") as f:
+            f.write(data)
+        shutil.copystat(src, tmp)
+
+
+class IfChangedWriter:
+    """
+    Stream text to path, leaving path untouched when the result equals what it
+    already holds. Each write is compared with the existing file; only at the
+    first difference is `.<name>.tmp` created next to path (with the matching
+    prefix copied in), and it is renamed over path when the block exits cleanly.
+    A no-op write therefore creates no file and changes no directory mtime.
+
+        with IfChangedWriter(path) as f:
+            f.write(text)
+        f.changed  # True when path was written
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.changed = False
+        self._tmp = path.with_name(f".{path.name}.tmp")
+        self._old: Optional[BinaryIO] = None
+        self._new: Optional[BinaryIO] = None
+        # Bytes written so far that match the start of the existing file
+        self._same = 0
+        try:
+            self._old = open(path, "rb")
+        except OSError:
+            pass
+
+    def write(self, text: str):
+        data = text.encode()
+        if self._new is None:
+            if self._old is not None and self._old.read(len(data)) == data:
+                self._same += len(data)
+                return
+            self._diverge()
+        self._new.write(data)
+
+    def _diverge(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._new = open(self._tmp, "wb")
+        if self._old is not None:
+            self._old.seek(0)
+            remaining = self._same
+            while remaining:
+                chunk = self._old.read(min(remaining, 1 << 20))
+                self._new.write(chunk)
+                remaining -= len(chunk)
+
+    def close(self):
+        # No file yet, or the existing one is longer than what was written
+        if self._new is None and (self._old is None or self._old.read(1)):
+            self._diverge()
+        if self._old is not None:
+            self._old.close()
+        if self._new is not None:
+            self._new.close()
+            os.replace(self._tmp, self.path)
+            self.changed = True
+
+    def discard(self):
+        """
+        Drop what was written, leaving path as it was.
+        """
+        if self._old is not None:
+            self._old.close()
+        if self._new is not None:
+            self._new.close()
+            os.unlink(self._tmp)
+
+    def __enter__(self) -> "IfChangedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def sync_file(src: Path, dst: Path, mode: str = "auto") -> bool:
+    """
+    Make dst a copy of src, touching dst only when the content differs.
+    The new file is staged next to dst and renamed into place.
+    Returns True when dst was written.
+    """
+    if _same_content(src, dst):
+        return False
+    _replace(src, dst, mode)
+    return True
+
+
+def link_file(src: Path, dst: Path) -> bool:
+    """
+    Make dst a hardlink of src. Where the filesystem has no hardlinks, dst is
+    a copy instead, rewritten only when its bytes differ.
+    Returns True when dst was written.
+    """
+    try:
+        s_st, d_st = os.stat(src), os.stat(dst)
+        if (s_st.st_dev, s_st.st_ino) == (d_st.st_dev, d_st.st_ino):
+            return False
+    except OSError:
+        pass
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK):
+            raise
+        if _same_content(src, dst):
+            return False
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return True
+
+
+def _replace(src: Path, dst: Path, mode: str, data: Optional[bytes] = None):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    _materialize(src, tmp, mode, data)
+    os.replace(tmp, dst)
+
+
+def write_if_changed(path: Path, data: bytes | str) -> bool:
+    """
+    Write data to path only when the bytes differ from what is already there.
+    Returns True when the file was written.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def walk_files(root: Path) -> dict[str, str]:
+    """
+    Map every file under root to its absolute path, keyed by "/"-joined relative path.
+    Uses os.walk on plain strings; pathlib is slow enough to dominate a no-op sync.
+    """
+    files: dict[str, str] = {}
+    base = str(root)
+    for dirpath, _, filenames in os.walk(base):
+        rel_dir = os.path.relpath(dirpath, base).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        for fname in filenames:
+            files[prefix + fname] = os.path.join(dirpath, fname)
+    return files
+
+
+def scan_tree(root: Path, suffix: Optional[str] = ".svg") -> List[SourceFile]:
+    """
+    List the files under root (optionally only those with `suffix`) and read each
+    one once. Sorted by path components, the order `sorted(root.rglob(...))` gives.
+    """
+    files = []
+    for rel, path in walk_files(root).items():
+        if suffix and not rel.lower().endswith(suffix):
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            st = os.fstat(fd)
+            data = _read_fd(fd, st.st_size)
+        finally:
+            os.close(fd)
+        files.append(SourceFile(rel, path, data, st))
+    files.sort(key=lambda file: file.rel.split("/"))
+    return files
+
+
+def sync_tree(
+    src: Path,
+    dst: Path,
+    suffix: Optional[str] = ".svg",
+    mode: str = "auto",
+    files: Optional[List[SourceFile]] = None,
+) -> SyncStats:
+    """
+    Mirror files under src (optionally only those with `suffix`) into dst.
+    New or changed files are copied, files no longer in src are removed,
+    and unchanged files are left alone. Pass `files` from `scan_tree(src, suffix)`
+    to compare and copy from those buffers instead of walking and reading src.
+    """
+    stats = SyncStats()
+    if files is not None:
+        scanned = {file.rel: file for file in files}
+        wanted = {rel: file.path for rel, file in scanned.items()}
+    else:
+        scanned = {}
+        wanted = {
+            rel: path
+            for rel, path in walk_files(src).items()
+            if not suffix or rel.lower().endswith(suffix)
+        }
+    # Other files under dst (e.g. precompressed siblings) are not ours to prune
+    existing = {
+        rel: path
+        for rel, path in walk_files(dst).items()
+        if not suffix or rel.lower().endswith(suffix)
+    }
+
+    for rel, path in sorted(wanted.items()):
+        target = existing.get(rel)
+        file = scanned.get(rel)
+        if target is not None and (
+            _same_as(file, target) if file else _same_content(path, target)
+        ):
+            stats.unchanged += 1
+        else:
+            _replace(Path(path), dst / rel, mode, file.data if file else None)
+            stats.copied += 1
+
+    stats.removed = prune_tree(dst, existing, wanted)
+    return stats
+
+
+def prune_tree(dst: Path, existing: dict[str, str], wanted: Iterable[str]) -> int:
+    """
+    Delete files under dst (as listed by `walk_files`) whose relative path is
+    not in wanted, then drop directories left empty. Returns the number removed.
+    """
+    wanted = set(wanted)
+    removed = 0
+    for rel, path in existing.items():
+        if rel not in wanted:
+            os.unlink(path)
+            removed += 1
+    if dst.exists():
+        # Drop directories left empty by removals, deepest first
+        for dirpath, _, _ in sorted(os.walk(str(dst)), reverse=True):
+            if not os.listdir(dirpath) and (dirpath != str(dst) or not wanted):
+                os.rmdir(dirpath)
+    return removed
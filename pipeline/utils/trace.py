@@ -0,0 +1,188 @@
+"""
+Stage spans in Chrome trace-event format, viewable in Perfetto or chrome://tracing.
+
+Tracing is off unless `start()` was called; `span()` is then a no-op, so stages
+can be wrapped unconditionally:
+
+    with trace.span("copy_svgs heroicons", vendor="heroicons") as args:
+        stats = sync_tree(...)
+        args["copied"] = stats.copied
+
+Each span records wall time and, where `/proc/self/io` exists (Linux), the bytes
+this process read and wrote during it and the number of read/write syscalls.
+With `memory=True`, the `tracemalloc` peak within each span is recorded too
+(nested spans roll up into their parents).
+Work done in worker processes is not included in the parent's byte counts;
+vendor processors running in a pool return their own events instead (`extend`).
+"""
+
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def _now_us() -> int:
+    # Monotonic clock is system-wide, so timestamps line up across worker processes
+    return time.monotonic_ns() // 1000
+
+
+def _io_counters() -> Optional[Tuple[int, int, int, int]]:
+    """
+    (bytes read, bytes written, read calls, write calls) through read/write
+    syscalls so far, or None.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ", 1) for line in f.read().splitlines())
+        return (
+            int(fields["rchar"]),
+            int(fields["wchar"]),
+            int(fields["syscr"]),
+            int(fields["syscw"]),
+        )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class Tracer:
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = []
+        # Open spans, innermost last: (args, running tracemalloc peak)
+        self._stack: List[List[Any]] = []
+        # Imported only when memory is traced; the CLI does not load it otherwise
+        self._tracemalloc = None
+        if memory:
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "stage", **args: Any) -> Iterator[Dict[str, Any]]:
+        tracemalloc = self._tracemalloc
+        if tracemalloc:
+            if self._stack:
+                # reset_peak below would lose the parent's peak so far
+                self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = [args, 0]
+        self._stack.append(frame)
+        io_start = _io_counters()
+        start = _now_us()
+        try:
+            yield args
+        finally:
+            end = _now_us()
+            io_end = _io_counters()
+            self._stack.pop()
+            if io_start and io_end:
+                args["bytes_read"] = io_end[0] - io_start[0]
+                args["bytes_written"] = io_end[1] - io_start[1]
+                args["read_calls"] = io_end[2] - io_start[2]
+                args["write_calls"] = io_end[3] - io_start[3]
+            if tracemalloc:
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                args["tracemalloc_peak_bytes"] = peak
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": end - start,
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+
+    def count(self, key: str, n: int = 1):
+        """
+        Add n to `key` on the innermost open span.
+        """
+        if self._stack:
+            args = self._stack[-1][0]
+            args[key] = args.get(key, 0) + n
+
+    def dump(self, path: Path):
+        pids = sorted({e["pid"] for e in self.events} | {os.getpid()})
+        meta = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": "pipeline" if pid == os.getpid() else f"worker {pid}"},
+            }
+            for pid in pids
+        ]
+        events = sorted(self.events, key=lambda e: (e["ts"], -e["dur"]))
+        path.write_text(
+            json.dumps({"traceEvents": meta + events, "displayTimeUnit": "ms"}, indent=1)
+        )
+
+
+_active: Optional[Tracer] = None
+
+
+def start(memory: bool = False) -> Tracer:
+    global _active
+    _active = Tracer(memory)
+    return _active
+
+
+def stop() -> Optional[Tracer]:
+    """
+    Stop tracing and return the tracer that was active (if any).
+    """
+    global _active
+    tracer, _active = _active, None
+    if tracer and tracer.memory:
+        tracer._tracemalloc.stop()
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    """
+    The tracer started in this process, if any. A forked worker inherits its
+    parent's tracer but does not record into it.
+    """
+    if _active is not None and _active.pid == os.getpid():
+        return _active
+    return None
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "stage", **args: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Record a span on the active tracer; yields the args dict to fill in counts.
+    """
+    tracer = active()
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, cat, **args) as span_args:
+        yield span_args
+
+
+def count(key: str, n: int = 1):
+    tracer = active()
+    if tracer is not None:
+        tracer.count(key, n)
+
+
+def extend(events: List[Dict[str, Any]]):
+    """
+    Add events recorded by another process (e.g. a pool worker).
+    """
+    tracer = active()
+    if tracer is not None:
+        tracer.events.extend(events)
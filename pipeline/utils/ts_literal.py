@@ -0,0 +1,258 @@
+"""
+Parser for the TypeScript literal subset used by vendor data files such as
+phosphor `src/icons.ts` and svgl `src/data/svgs.ts`:
+
+    export const icons = <const>[
+      { name: "acorn", alias: { name: "acorn-old" }, categories: [IconCategory.NATURE], },
+    ];
+
+Supported: object and array literals (trailing commas allowed), single-, double-
+and back-quoted strings (no `${...}` substitutions), numbers, `true` / `false` /
+`null` / `undefined`, dotted identifiers such as enum members (returned as
+`Identifier`), `<const>`-style casts, and `//` / `/* */` comments.
+
+One precompiled regex splits the text into tokens in a single C-level pass
+(`findall`), skipping whitespace and comments; the parser then walks the token
+list once. Malformed input raises `TsSyntaxError` with the line and column of
+the offending token.
+"""
+
+import re
+from typing import Any, List
+
+# Skips whitespace and comments, then captures one token. An identifier directly
+# followed by `:` is one token (an object key), which saves a token per property.
+# The final `\S` alternative captures any stray character so it can be reported.
+_TOKEN = re.compile(
+    r"""
+    \s*(?:(?://[^\n]*|/\*.*?\*/)\s*)*
+    (
+        [{}\[\](),:]
+      | [A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*(?:\s*:)?
+      | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+      | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+      | `(?:[^`\\$]|\\.|\$(?!\{))*`
+      | [-+]?(?:0[xX][0-9a-fA-F]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+      | <\s*[A-Za-z_$][\w$.]*\s*>
+      | \S
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_END = ""
+
+_ESCAPE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL)
+_SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+    "\n": "",
+    "\r\n": "",
+}
+
+_CONSTANTS = {"true": True, "false": False, "null": None, "undefined": None}
+
+
+class Identifier(str):
+    """
+    A bare (possibly dotted) identifier used as a value, e.g. `IconCategory.ARROWS`.
+    """
+
+    __slots__ = ()
+
+
+class TsSyntaxError(ValueError):
+    def __init__(self, message: str, text: str, pos: int):
+        self.line = text.count("\n", 0, pos) + 1
+        self.column = pos - (text.rfind("\n", 0, pos) + 1) + 1
+        self.message = message
+        super().__init__(f"line {self.line}, column {self.column}: {message}")
+
+
+def _unescape(match: re.Match) -> str:
+    seq = match.group(1)
+    if seq[0] in "ux" and len(seq) > 1:
+        return chr(int(seq[1:].strip("{}"), 16))
+    return _SIMPLE_ESCAPES.get(seq, seq)
+
+
+def _string(token: str) -> str:
+    body = token[1:-1]
+    if "\\" not in body:
+        return body
+    value = _ESCAPE.sub(_unescape, body)
+    if any("\ud800" <= ch <= "\udfff" for ch in value):
+        # \uXXXX surrogate pairs: recombine into a single code point
+        value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+    return value
+
+
+def _number(token: str) -> int | float:
+    digits = token.lstrip("+-")
+    if digits[:2] in ("0x", "0X"):
+        value = int(digits, 16)
+        return -value if token.startswith("-") else value
+    if digits.isdigit():
+        return int(token)
+    return float(token)
+
+
+_QUOTES = frozenset("\"'`")
+_NUMBER_START = frozenset("0123456789+-.")
+_IDENT_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$")
+_IDENT_CHARS = _IDENT_START | frozenset("0123456789")
+
+
+class _Parser:
+    """
+    Iterative parse of the token list with an explicit stack of open containers;
+    token positions are only recomputed for errors.
+    """
+
+    def __init__(self, text: str, pos: int):
+        self.text = text
+        self.start = pos
+        # Tokens up to the end of the text; a value usually spans all of it
+        self.tokens = _TOKEN.findall(text, pos)
+        self.tokens.append(_END)
+
+    def error(self, message: str, index: int) -> TsSyntaxError:
+        pos = len(self.text)
+        if index < len(self.tokens) - 1:
+            for n, match in enumerate(_TOKEN.finditer(self.text, self.start)):
+                if n == index:
+                    pos = match.start(1)
+                    break
+        return TsSyntaxError(message, self.text, pos)
+
+    def unexpected(self, expected: str, index: int) -> TsSyntaxError:
+        token = self.tokens[index]
+        found = repr(token) if token else "end of input"
+        return self.error(f"expected {expected}, found {found}", index)
+
+    def key(self, i: int) -> tuple[str, int]:
+        """
+        The property name at token i and the index of the token after its `:`.
+        """
+        token = self.tokens[i]
+        first = token[:1]
+        if token[-1:] == ":" and first in _IDENT_START:
+            key = token[:-1].rstrip()
+            if "." in key:
+                raise self.unexpected("a property name", i)
+            return key, i + 1
+        if first in _QUOTES:
+            key = _string(token)
+        elif (first in _IDENT_START or first.isdigit()) and "." not in token:
+            key = token
+        else:
+            raise self.unexpected("a property name", i)
+        if self.tokens[i + 1] != ":":
+            raise self.unexpected(f"':' after {key!r}", i + 1)
+        return key, i + 2
+
+    def parse(self) -> Any:
+        tokens = self.tokens
+        i = 0
+        # Open containers as (container, key in it); key is None for lists
+        stack: List[tuple] = []
+        container: Any = None
+        key: str | None = None
+        while True:
+            # Expect a value at tokens[i]
+            token = tokens[i]
+            first = token[:1]
+            i += 1
+            if first == '"' and "\\" not in token:
+                value = token[1:-1]
+            elif first in _QUOTES:
+                value = _string(token)
+            elif first == "{":
+                if tokens[i] == "}":
+                    i += 1
+                    value = {}
+                else:
+                    stack.append((container, key))
+                    container = {}
+                    key = tokens[i]
+                    if key[-1:] == ":" and key[-2:-1] in _IDENT_CHARS and "." not in key:
+                        # Fast path: a plain `name:` token
+                        key = key[:-1]
+                        i += 1
+                    else:
+                        key, i = self.key(i)
+                    continue
+            elif first == "[":
+                if tokens[i] == "]":
+                    i += 1
+                    value = []
+                else:
+                    stack.append((container, key))
+                    container, key = [], None
+                    continue
+            elif first in _IDENT_START and token[-1] != ":":
+                value = _CONSTANTS[token] if token in _CONSTANTS else Identifier(token)
+            elif token.isdigit():
+                value = int(token)
+            elif first.isdigit() or (first in _NUMBER_START and len(token) > 1):
+                value = _number(token)
+            elif first == "<" and len(token) > 1:
+                # Type assertion such as <const>: the value follows
+                continue
+            else:
+                raise self.unexpected("a value", i - 1)
+
+            # Store the value, then close every container that ends here
+            while True:
+                if container is None:
+                    return value
+                if key is None:
+                    container.append(value)
+                    token = tokens[i]
+                    i += 1
+                    if token == ",":
+                        if tokens[i] != "]":
+                            break
+                        i += 1
+                    elif token != "]":
+                        raise self.unexpected("',' or ']'", i - 1)
+                else:
+                    container[key] = value
+                    token = tokens[i]
+                    i += 1
+                    if token == ",":
+                        key = tokens[i]
+                        if key[-1:] == ":" and key[-2:-1] in _IDENT_CHARS and "." not in key:
+                            key = key[:-1]
+                            i += 1
+                            break
+                        if key != "}":
+                            key, i = self.key(i)
+                            break
+                        i += 1
+                    elif token != "}":
+                        raise self.unexpected("',' or '}'", i - 1)
+                value = container
+                container, key = stack.pop()
+
+
+def parse_value(text: str, pos: int = 0) -> Any:
+    """
+    Parse the literal starting at pos (after optional whitespace, comments and
+    casts). Anything after it is ignored.
+    """
+    return _Parser(text, pos).parse()
+
+
+def parse_export(text: str, name: str) -> Any:
+    """
+    Parse the initializer of `export const <name>[: Type] = ...` in text.
+    """
+    match = re.search(rf"\bexport\s+const\s+{re.escape(name)}\b[^=]*=", text)
+    if match is None:
+        raise TsSyntaxError(f"'export const {name}' not found", text, 0)
+    return parse_value(text, match.end())
@@ -0,0 +1,96 @@
+"""
+Programmatic access to the vendor processors (vendor_*.py).
+
+Each processor module exposes `iter_metadata(base_dir=..., cache=None, log=None)`,
+a generator of its metadata records (the dicts `cache <vendor>` writes to
+`metadata.json`, typed per vendor as a `TypedDict`). Records are produced one
+at a time, so a consumer that does not keep them runs in constant memory:
+
+    from utils.vendors import vendor_metadata
+
+    index = SearchIndexBuilder()
+    for record in vendor_metadata("heroicons"):
+        index.add_record("heroicons", record)
+
+A vendor checkout that no longer has the expected layout raises
+`VendorStructureError` instead of exiting. Without a `cache`, the generator
+loads the vendor's file cache (utils/file_cache.py) and saves it once the last
+record has been produced; a consumer that stops early leaves it untouched.
+The click commands are thin wrappers that write the records and turn the
+error into the usual PANIC message.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+import click
+
+from utils.records import RecordWriter, open_records
+
+VENDOR_DIR = Path(__file__).parent.parent.parent / "vendor"
+
+# Vendor processor modules, imported only when their records are asked for
+VENDOR_MODULES = {
+    "radix-ui-icons": "vendor_radix_ui_icons",
+    "heroicons": "vendor_heroicons",
+    "lucide-icons": "vendor_lucide_icons",
+    "phosphor-icons": "vendor_phosphor_icons",
+    "octicons": "vendor_octicons",
+    "svgl": "vendor_svgl",
+}
+
+# Progress messages ("Found N SVG files in ..."); `click.echo` from the commands
+Log = Optional[Callable[[str], Any]]
+
+_END = object()
+
+
+class VendorStructureError(Exception):
+    """
+    The vendor checkout does not have the layout its processor expects.
+    """
+
+
+def require_dir(path: Path) -> Path:
+    if not path.exists():
+        raise VendorStructureError(
+            f"Required directory {path} does not exist. Vendor structure may have changed."
+        )
+    return path
+
+
+def vendor_metadata(vendor: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    The metadata records of `vendor`; keyword arguments go to its `iter_metadata`.
+    """
+    return importlib.import_module(VENDOR_MODULES[vendor]).iter_metadata(**kwargs)
+
+
+def write_records(
+    records: Iterable[Dict[str, Any]], out: Path, stem: str, fmt: str
+) -> RecordWriter:
+    """
+    Stream records to `<out>/<stem>.<fmt>` and return the closed writer.
+    Processors check their vendor structure before the first record, which is
+    produced before any file is created; a failure after that discards the
+    partial file (see `RecordWriter`). Either way an existing file is kept.
+    """
+    records = iter(records)
+    first = next(records, _END)
+    out.mkdir(parents=True, exist_ok=True)
+    with open_records(out, stem, fmt) as writer:
+        if first is not _END:
+            writer.write(first)
+            for record in records:
+                writer.write(record)
+    return writer
+
+
+def panic(error: Exception):
+    """
+    Report a processor failure the way the CLI always has, and exit 1.
+    """
+    click.echo(f"PANIC: {error}", err=True)
+    sys.exit(1)
@@ -1,74 +1,86 @@
-import json
-import sys
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TypedDict
 
 import click
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
 
+# Heroicons has multiple variants in src/
+VARIANTS = ["16/solid", "20/solid", "24/solid", "24/outline"]
 
-@click.command()
-@click.option(
-    "--out",
-    type=click.Path(path_type=Path),
-    default=Path(".cache/heroicons"),
-    help="Output directory for vendor-native metadata.",
-)
-def process(out: Path):
-    """
-    Process Heroicons.
-    """
-    click.echo("Processing Heroicons...")
 
-    base_dir = Path(__file__).parent.parent / "vendor" / "heroicons"
-    src_dir = base_dir / "src"
+class HeroiconsRecord(TypedDict):
+    name: str
+    size: str
+    style: str
+    dist_path: str
+    properties: Dict[str, str]
+    path: str
+    svg: Dict[str, Any]
 
-    if not src_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {src_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
 
-    out.mkdir(parents=True, exist_ok=True)
-
-    # Heroicons has multiple variants in src/
-    variants = ["16/solid", "20/solid", "24/solid", "24/outline"]
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "heroicons",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[HeroiconsRecord]:
+    """
+    Yield one record per Heroicons SVG, variant by variant (see utils/vendors.py).
+    """
+    src_dir = require_dir(base_dir / "src")
+    # Check every variant before the first record is written
+    variant_dirs = [require_dir(src_dir / variant) for variant in VARIANTS]
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("heroicons")
 
     total_found = 0
-    records = []
-
-    for variant in variants:
-        target_dir = src_dir / variant
-        if not target_dir.exists():
-            click.echo(
-                f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-                err=True,
-            )
-            sys.exit(1)
 
+    for variant, target_dir in zip(VARIANTS, variant_dirs):
         svg_files = list(target_dir.glob("*.svg"))
         count = len(svg_files)
         total_found += count
-        click.echo(f"Found {count} SVG files in {target_dir}")
+        if log:
+            log(f"Found {count} SVG files in {target_dir}")
 
         size, style = variant.split("/")
         for svg_file in svg_files:
             stem = svg_file.stem
-            svg_meta = parse_svg_basic(svg_file)
-            records.append(
-                {
-                    "name": stem,
-                    "size": size,
-                    "style": style,
-                    "dist_path": str(svg_file.relative_to(base_dir)),
-                    "properties": {"size": size, "style": style},
-                    "path": str(svg_file.relative_to(base_dir)),
-                    "svg": svg_meta,
-                }
-            )
+            svg_meta = cache.get(svg_file, "svg", parse_svg_basic, from_bytes=True)
+            yield {
+                "name": stem,
+                "size": size,
+                "style": style,
+                "dist_path": str(svg_file.relative_to(base_dir)),
+                "properties": {"size": size, "style": style},
+                "path": str(svg_file.relative_to(base_dir)),
+                "svg": svg_meta,
+            }
+
+    if own_cache:
+        cache.save()
+    if log:
+        log(f"Total Heroicons found: {total_found}")
 
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
-    click.echo(f"Total Heroicons found: {total_found}")
-    click.echo(f"Wrote {len(records)} records to {out_file}")
+
+@click.command()
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path(".cache/heroicons"),
+    help="Output directory for vendor-native metadata.",
+)
+@format_option
+def process(out: Path, fmt: str = "json"):
+    """
+    Process Heroicons.
+    """
+    click.echo("Processing Heroicons...")
+    try:
+        records = write_records(iter_metadata(log=click.echo), out, "metadata", fmt)
+    except VendorStructureError as e:
+        panic(e)
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
@@ -1,21 +1,122 @@
 import json
-import sys
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TypedDict
 
 import click
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
+
+# Icons per task and concurrent loads: enough to hide per-file latency on
+# network filesystems and cold caches without flooding them
+BATCH_SIZE = 64
+MAX_WORKERS = 8
+
+
+class LucideRecord(TypedDict):
+    name: str
+    path: str
+    dist_path: str
+    svg: Dict[str, Any]
+    meta: Dict[str, Any]
+    properties: Dict[str, str]
 
 
 def _load_icon_metadata(json_path: Path) -> dict:
-    if not json_path.exists():
-        return {}
     try:
         return json.loads(json_path.read_text())
     except Exception:
         return {}
 
 
+def _inventory(target_dir: Path) -> tuple[list[str], set[str]]:
+    """
+    One scandir pass over icons/: sorted SVG stems and the stems with a .json sidecar.
+    """
+    svgs: list[str] = []
+    sidecars: set[str] = set()
+    with os.scandir(target_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext == ".svg":
+                svgs.append(stem)
+            elif ext == ".json":
+                sidecars.add(stem)
+    svgs.sort()
+    return svgs, sidecars
+
+
+def _load_batch(
+    cache: FileCache, target_dir: Path, stems: list[str], sidecars: set[str]
+) -> list[tuple[dict, dict]]:
+    """
+    Worker: (icon metadata, SVG metadata) for each stem, through the file cache.
+    """
+    results = []
+    for stem in stems:
+        icon_meta = (
+            cache.get(target_dir / f"{stem}.json", "meta", _load_icon_metadata)
+            if stem in sidecars
+            else {}
+        )
+        svg_meta = cache.get(target_dir / f"{stem}.svg", "svg", parse_svg_basic, from_bytes=True)
+        results.append((icon_meta, svg_meta))
+    return results
+
+
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "lucide-icons",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[LucideRecord]:
+    """
+    Yield one record per Lucide icon, in sorted order, with its .json sidecar
+    as `meta` (see utils/vendors.py). A thread pool loads batches ahead of the
+    consumer, at most 2 * MAX_WORKERS of them however slowly records are taken.
+    """
+    target_dir = require_dir(base_dir / "icons")
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("lucide-icons")
+
+    stems, sidecars = _inventory(target_dir)
+    if log:
+        log(f"Found {len(stems)} SVG files in {target_dir}")
+
+    def _records(batch, future):
+        for stem, (icon_meta, svg_meta) in zip(batch, future.result()):
+            svg_file = target_dir / f"{stem}.svg"
+            yield {
+                "name": stem,
+                "path": str(svg_file.relative_to(base_dir)),
+                "dist_path": str(Path("src") / svg_file.name),
+                "svg": svg_meta,
+                "meta": icon_meta,
+                "properties": {},
+            }
+
+    batches = [stems[i : i + BATCH_SIZE] for i in range(0, len(stems), BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # Batches are consumed in submission order, so records keep the sorted order
+        pending: deque = deque()
+        for batch in batches:
+            pending.append((batch, pool.submit(_load_batch, cache, target_dir, batch, sidecars)))
+            if len(pending) >= 2 * MAX_WORKERS:
+                yield from _records(*pending.popleft())
+        while pending:
+            yield from _records(*pending.popleft())
+
+    if own_cache:
+        cache.save()
+
+
 @click.command()
 @click.option(
     "--out",
@@ -23,43 +124,14 @@ def _load_icon_metadata(json_path: Path) -> dict:
     default=Path(".cache/lucide-icons"),
     help="Output directory for vendor-native metadata.",
 )
-def process(out: Path):
+@format_option
+def process(out: Path, fmt: str = "json"):
     """
     Process Lucide Icons and emit vendor-native metadata.
     """
     click.echo("Processing Lucide Icons...")
-
-    base_dir = Path(__file__).parent.parent / "vendor" / "lucide-icons"
-    target_dir = base_dir / "icons"
-
-    if not target_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
-
-    out.mkdir(parents=True, exist_ok=True)
-
-    svg_files = list(target_dir.glob("*.svg"))
-    click.echo(f"Found {len(svg_files)} SVG files in {target_dir}")
-
-    records = []
-    for svg_file in svg_files:
-        stem = svg_file.stem
-        meta_json_path = target_dir / f"{stem}.json"
-        icon_meta = _load_icon_metadata(meta_json_path)
-        svg_meta = parse_svg_basic(svg_file)
-        record = {
-            "name": stem,
-            "path": str(svg_file.relative_to(base_dir)),
-            "dist_path": str(Path("src") / svg_file.name),
-            "svg": svg_meta,
-            "meta": icon_meta,
-            "properties": {},
-        }
-        records.append(record)
-
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
-    click.echo(f"Wrote {len(records)} records to {out_file}")
+    try:
+        records = write_records(iter_metadata(log=click.echo), out, "metadata", fmt)
+    except VendorStructureError as e:
+        panic(e)
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
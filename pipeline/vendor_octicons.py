@@ -1,14 +1,28 @@
 import json
-import sys
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TypedDict
 
 import click
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
 
 
-def _load_keywords(base_dir: Path) -> dict:
-    keywords_path = base_dir / "keywords.json"
+class OcticonsRecord(TypedDict):
+    name: str
+    file: str
+    dist_path: str
+    path: str
+    keywords: List[str]
+    size: Optional[str]
+    inset: bool
+    properties: Dict[str, str]
+    svg: Dict[str, Any]
+
+
+def _load_keywords(keywords_path: Path) -> dict:
     if not keywords_path.exists():
         return {}
     try:
@@ -41,58 +55,63 @@ def _extract_size_and_inset(stem: str) -> tuple[str | None, bool]:
     return size, inset
 
 
-@click.command()
-@click.option(
-    "--out",
-    type=click.Path(path_type=Path),
-    default=Path(".cache/octicons"),
-    help="Output directory for vendor-native metadata.",
-)
-def process(out: Path):
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "octicons",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[OcticonsRecord]:
     """
-    Process Octicons and emit vendor-native metadata.
+    Yield one record per Octicons SVG (one per size of each icon; see utils/vendors.py).
     """
-    click.echo("Processing Octicons...")
-
-    base_dir = Path(__file__).parent.parent / "vendor" / "octicons"
-    target_dir = base_dir / "icons"
-
-    if not target_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
-
-    out.mkdir(parents=True, exist_ok=True)
+    target_dir = require_dir(base_dir / "icons")
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("octicons")
 
-    keywords_map = _load_keywords(base_dir)
+    keywords_map = cache.get(base_dir / "keywords.json", "keywords", _load_keywords)
     svg_files = list(target_dir.glob("*.svg"))
 
-    click.echo(f"Found {len(svg_files)} SVG files in {target_dir}")
+    if log:
+        log(f"Found {len(svg_files)} SVG files in {target_dir}")
 
-    records = []
     for svg_file in svg_files:
         stem = svg_file.stem
         base_name = _base_icon_name(stem)
         size, inset = _extract_size_and_inset(stem)
-        svg_meta = parse_svg_basic(svg_file)
+        svg_meta = cache.get(svg_file, "svg", parse_svg_basic, from_bytes=True)
         dist_rel = Path("src") / svg_file.name
         variables = {"size": size} if size else {}
-        records.append(
-            {
-                "name": base_name,
-                "file": stem,
-                "dist_path": str(dist_rel),
-                "path": str(svg_file.relative_to(base_dir)),
-                "keywords": keywords_map.get(base_name, []),
-                "size": size,
-                "inset": inset,
-                "properties": variables,
-                "svg": svg_meta,
-            }
-        )
-
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
-    click.echo(f"Wrote {len(records)} records to {out_file}")
+        yield {
+            "name": base_name,
+            "file": stem,
+            "dist_path": str(dist_rel),
+            "path": str(svg_file.relative_to(base_dir)),
+            "keywords": keywords_map.get(base_name, []),
+            "size": size,
+            "inset": inset,
+            "properties": variables,
+            "svg": svg_meta,
+        }
+
+    if own_cache:
+        cache.save()
+
+
+@click.command()
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path(".cache/octicons"),
+    help="Output directory for vendor-native metadata.",
+)
+@format_option
+def process(out: Path, fmt: str = "json"):
+    """
+    Process Octicons and emit vendor-native metadata.
+    """
+    click.echo("Processing Octicons...")
+    try:
+        records = write_records(iter_metadata(log=click.echo), out, "metadata", fmt)
+    except VendorStructureError as e:
+        panic(e)
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
@@ -1,139 +1,140 @@
-import json
-import re
-import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, Optional, TypedDict
 
 import click
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.ts_literal import Identifier, TsSyntaxError, parse_export
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
+
+WEIGHTS = ["bold", "duotone", "fill", "light", "regular", "thin"]
+
+
+class PhosphorRecord(TypedDict):
+    name: str
+    weight: str
+    dist_path: str
+    properties: Dict[str, str]
+    path: str
+    svg: Dict[str, Any]
+    meta: Dict[str, Any]
+
+
+def _icon_record(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep the fields we use from one parsed icons.ts entry: name, categories (enum
+    names), tags, codepoint, alias, published_in, updated_in.
+    """
+    record: Dict[str, Any] = {"name": entry["name"]}
+    tags = entry.get("tags")
+    if isinstance(tags, list):
+        record["tags"] = [t for t in tags if isinstance(t, str) and t]
+    categories = entry.get("categories")
+    if isinstance(categories, list):
+        record["categories"] = [
+            c.removeprefix("IconCategory.").lower()
+            for c in categories
+            if isinstance(c, Identifier) and c.startswith("IconCategory.")
+        ]
+    alias = entry.get("alias")
+    if isinstance(alias, dict) and isinstance(alias.get("name"), str):
+        record["alias"] = alias["name"]
+    if isinstance(entry.get("codepoint"), int):
+        record["codepoint"] = entry["codepoint"]
+    for key in ("published_in", "updated_in"):
+        if isinstance(entry.get(key), (int, float)):
+            record[key] = float(entry[key])
+    return record
 
 
 def _parse_icons_ts(ts_path: Path) -> Dict[str, Dict]:
     """
-    Lightweight parser for phosphor src/icons.ts.
-    Extracts name, categories (enum names), tags, codepoint, alias, published_in, updated_in.
+    Parse phosphor src/icons.ts (see utils/ts_literal.py) into records by icon name.
+    Raises TsSyntaxError when the icons array is missing or malformed.
     """
     if not ts_path.exists():
         return {}
-    text = ts_path.read_text()
-    # Narrow to the icons array
-    start = text.find("export const icons =")
-    if start == -1:
-        return {}
-    segment = text[start:]
+    icons = parse_export(ts_path.read_text(), "icons")
     entries: Dict[str, Dict] = {}
-    # Regex to capture blocks { ... }
-    pattern = re.compile(r"\{\s*name:\s*\"(?P<name>[^\"]+)\".*?\}", re.DOTALL)
-    for match in pattern.finditer(segment):
-        block = match.group(0)
-        name = match.group("name")
-        record: Dict[str, any] = {"name": name}
-        # tags
-        tags_match = re.search(r"tags:\s*\[([^\]]*)\]", block, re.DOTALL)
-        if tags_match:
-            tags_raw = tags_match.group(1)
-            tags = [
-                t.strip().strip('"')
-                for t in tags_raw.split(",")
-                if t.strip().strip('"')
-            ]
-            record["tags"] = tags
-        # categories
-        cat_match = re.search(r"categories:\s*\[([^\]]*)\]", block, re.DOTALL)
-        if cat_match:
-            cats_raw = cat_match.group(1)
-            cats = []
-            for c in cats_raw.split(","):
-                c = c.strip()
-                if c.startswith("IconCategory."):
-                    cats.append(c.replace("IconCategory.", "").lower())
-            record["categories"] = cats
-        # alias
-        alias_match = re.search(r"alias:\s*\{\s*name:\s*\"([^\"]+)\"", block)
-        if alias_match:
-            record["alias"] = alias_match.group(1)
-        # codepoint
-        code_match = re.search(r"codepoint:\s*([0-9]+)", block)
-        if code_match:
-            record["codepoint"] = int(code_match.group(1))
-        # published_in
-        pub_match = re.search(r"published_in:\s*([0-9.]+)", block)
-        if pub_match:
-            record["published_in"] = float(pub_match.group(1))
-        # updated_in
-        upd_match = re.search(r"updated_in:\s*([0-9.]+)", block)
-        if upd_match:
-            record["updated_in"] = float(upd_match.group(1))
-        entries[name] = record
+    for entry in icons if isinstance(icons, list) else []:
+        if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+            entries[entry["name"]] = _icon_record(entry)
     return entries
 
 
-@click.command()
-@click.option(
-    "--out",
-    type=click.Path(path_type=Path),
-    default=Path(".cache/phosphor-icons"),
-    help="Output directory for vendor-native metadata.",
-)
-def process(out: Path):
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "phosphor-icons",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[PhosphorRecord]:
     """
-    Process Phosphor Icons and emit vendor-native metadata.
+    Yield one record per Phosphor SVG, weight by weight, with the icons.ts
+    entry of its icon as `meta` (see utils/vendors.py).
     """
-    click.echo("Processing Phosphor Icons...")
-
-    base_dir = Path(__file__).parent.parent / "vendor" / "phosphor-icons"
-    assets_dir = base_dir / "assets"
+    assets_dir = require_dir(base_dir / "assets")
+    # Check every weight before the first record is written
+    weight_dirs = [require_dir(assets_dir / weight) for weight in WEIGHTS]
     icons_ts = base_dir / "src" / "icons.ts"
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("phosphor-icons")
 
-    if not assets_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {assets_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
-
-    out.mkdir(parents=True, exist_ok=True)
-
-    meta_map = _parse_icons_ts(icons_ts)
-    weights = ["bold", "duotone", "fill", "light", "regular", "thin"]
+    try:
+        # Versioned kind: entries cached by the old regex parser are not reused
+        meta_map = cache.get(icons_ts, "icons_ts:2", _parse_icons_ts)
+    except TsSyntaxError as e:
+        raise VendorStructureError(
+            f"Could not parse {icons_ts}: {e}. Vendor structure may have changed."
+        ) from e
 
     total_found = 0
-    records: List[Dict] = []
-
-    for weight in weights:
-        target_dir = assets_dir / weight
-        if not target_dir.exists():
-            click.echo(
-                f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-                err=True,
-            )
-            sys.exit(1)
 
+    for weight, target_dir in zip(WEIGHTS, weight_dirs):
         svg_files = list(target_dir.glob("*.svg"))
         count = len(svg_files)
         total_found += count
-        click.echo(f"Found {count} SVG files in {target_dir}")
+        if log:
+            log(f"Found {count} SVG files in {target_dir}")
 
         for svg_file in svg_files:
             stem = svg_file.stem  # includes weight suffix for non-regular
             base_name = stem if weight == "regular" else stem.removesuffix(f"-{weight}")
             meta = meta_map.get(base_name, {})
-            svg_meta = parse_svg_basic(svg_file)
+            svg_meta = cache.get(svg_file, "svg", parse_svg_basic, from_bytes=True)
             dist_rel = Path("src") / weight / svg_file.name
-            records.append(
-                {
-                    "name": base_name,
-                    "weight": weight,
-                    "dist_path": str(dist_rel),
-                    "properties": {"weight": weight},
-                    "path": str(svg_file.relative_to(base_dir)),
-                    "svg": svg_meta,
-                    "meta": meta,
-                }
-            )
-
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
-    click.echo(f"Total Phosphor Icons found: {total_found}")
-    click.echo(f"Wrote {len(records)} records to {out_file}")
+            yield {
+                "name": base_name,
+                "weight": weight,
+                "dist_path": str(dist_rel),
+                "properties": {"weight": weight},
+                "path": str(svg_file.relative_to(base_dir)),
+                "svg": svg_meta,
+                "meta": meta,
+            }
+
+    if own_cache:
+        cache.save()
+    if log:
+        log(f"Total Phosphor Icons found: {total_found}")
+
+
+@click.command()
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path(".cache/phosphor-icons"),
+    help="Output directory for vendor-native metadata.",
+)
+@format_option
+def process(out: Path, fmt: str = "json"):
+    """
+    Process Phosphor Icons and emit vendor-native metadata.
+    """
+    click.echo("Processing Phosphor Icons...")
+    try:
+        records = write_records(iter_metadata(log=click.echo), out, "metadata", fmt)
+    except VendorStructureError as e:
+        panic(e)
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
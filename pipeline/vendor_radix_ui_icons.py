@@ -1,37 +1,37 @@
 import json
-import sys
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TypedDict
 
 import click
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
 
 
-@click.command()
-@click.option(
-    "--out",
-    type=click.Path(path_type=Path),
-    default=Path(".cache/radix-ui-icons"),
-    help="Output directory for vendor-native metadata.",
-)
-def process(out: Path):
+class RadixRecord(TypedDict):
+    name: str
+    path: str
+    dist_path: str
+    svg: Dict[str, Any]
+    properties: Dict[str, str]
+    manifest_path: Any
+
+
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "radix-ui-icons",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[RadixRecord]:
     """
-    Process Radix UI Icons.
+    Yield one record per Radix UI icon (see utils/vendors.py).
     """
-    click.echo("Processing Radix UI Icons...")
-
-    base_dir = Path(__file__).parent.parent / "vendor" / "radix-ui-icons"
-    target_dir = base_dir / "packages" / "radix-icons" / "icons"
+    target_dir = require_dir(base_dir / "packages" / "radix-icons" / "icons")
     manifest_path = base_dir / "packages" / "radix-icons" / "manifest.json"
-
-    if not target_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
-
-    out.mkdir(parents=True, exist_ok=True)
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("radix-ui-icons")
 
     manifest = {}
     if manifest_path.exists():
@@ -42,23 +42,40 @@ def process(out: Path):
 
     svg_files = list(target_dir.glob("*.svg"))
 
-    click.echo(f"Found {len(svg_files)} SVG files in {target_dir}")
+    if log:
+        log(f"Found {len(svg_files)} SVG files in {target_dir}")
 
-    records = []
     for svg_file in svg_files:
         stem = svg_file.stem
-        svg_meta = parse_svg_basic(svg_file)
-        records.append(
-            {
-                "name": stem,
-                "path": str(svg_file.relative_to(base_dir)),
-                "dist_path": str(Path("src") / svg_file.name),
-                "svg": svg_meta,
-                "properties": {},
-                "manifest_path": manifest.get("icons", {}).get(":15", {}).get(stem),
-            }
-        )
+        svg_meta = cache.get(svg_file, "svg", parse_svg_basic, from_bytes=True)
+        yield {
+            "name": stem,
+            "path": str(svg_file.relative_to(base_dir)),
+            "dist_path": str(Path("src") / svg_file.name),
+            "svg": svg_meta,
+            "properties": {},
+            "manifest_path": manifest.get("icons", {}).get(":15", {}).get(stem),
+        }
 
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
-    click.echo(f"Wrote {len(records)} records to {out_file}")
+    if own_cache:
+        cache.save()
+
+
+@click.command()
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path(".cache/radix-ui-icons"),
+    help="Output directory for vendor-native metadata.",
+)
+@format_option
+def process(out: Path, fmt: str = "json"):
+    """
+    Process Radix UI Icons.
+    """
+    click.echo("Processing Radix UI Icons...")
+    try:
+        records = write_records(iter_metadata(log=click.echo), out, "metadata", fmt)
+    except VendorStructureError as e:
+        panic(e)
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
@@ -1,38 +1,40 @@
-import json
 import re
-import sys
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TypedDict
 
 import click
-import json5
 
+from utils.file_cache import FileCache, load_file_cache
+from utils.records import format_option
 from utils.svg_utils import parse_svg_basic
+from utils.ts_literal import TsSyntaxError, parse_export
+from utils.vendors import VENDOR_DIR, Log, VendorStructureError, panic, require_dir, write_records
+
+
+class SvglRecord(TypedDict):
+    file: str
+    path: str
+    dist_path: str
+    theme: str
+    kind: str
+    properties: Dict[str, str]
+    svg: Dict[str, Any]
+    meta: Optional[Dict[str, Any]]
 
 
 def _parse_svgs_ts(ts_path: Path) -> list:
     """
-    Parse svgl src/data/svgs.ts into Python objects using json5.
+    Parse svgl src/data/svgs.ts into Python objects (see utils/ts_literal.py).
     Keeps vendor-native fields: title, category, route, wordmark, url, brandUrl, shadcnCommand.
+    Raises TsSyntaxError when the svgs array is missing or malformed.
     """
     if not ts_path.exists():
         return []
     text = ts_path.read_text()
-    # Drop import lines
-    lines = [ln for ln in text.splitlines() if not ln.strip().startswith("import ")]
-    cleaned = "\n".join(lines)
-    anchor = cleaned.find("export const svgs")
-    if anchor == -1:
-        return []
-    eq = cleaned.find("=", anchor)
-    start = cleaned.find("[", eq if eq != -1 else anchor)
-    end = cleaned.rfind("]")
-    if start == -1 or end == -1:
-        return []
-    array_text = cleaned[start : end + 1]
-    try:
-        return json5.loads(array_text)
-    except Exception:
-        return []
+    svgs = parse_export(text, "svgs")
+    if not isinstance(svgs, list):
+        raise TsSyntaxError("'svgs' is not an array", text, text.find("export const svgs"))
+    return svgs
 
 
 def _infer_theme_kind(stem: str) -> tuple[str | None, str]:
@@ -104,45 +106,54 @@ def _build_asset_maps(
     return record_by_asset_path, properties_by_asset_path
 
 
-@click.command()
-@click.option(
-    "--out",
-    type=click.Path(path_type=Path),
-    default=Path(".cache/svgl"),
-    help="Output directory for vendor-native metadata.",
-)
-def process(out: Path):
+def load_data(
+    base_dir: Path = VENDOR_DIR / "svgl", cache: Optional[FileCache] = None
+) -> List[Dict[str, Any]]:
     """
-    Process SVGL and emit vendor-native metadata.
+    The parsed svgs.ts array (vendor-native; written as `data.json` by `cache svgl`).
+    Raises VendorStructureError when it cannot be parsed.
     """
-    click.echo("Processing SVGL...")
-
-    base_dir = Path(__file__).parent.parent / "vendor" / "svgl"
-    target_dir = base_dir / "static" / "library"
     data_ts = base_dir / "src" / "data" / "svgs.ts"
+    if cache is None:
+        cache = load_file_cache("svgl")
+    try:
+        # Parsed once per content of svgs.ts; the versioned kind drops results
+        # cached by the json5 parser, which stored [] on any parse error
+        return cache.get(data_ts, "svgs_ts:2", _parse_svgs_ts)
+    except TsSyntaxError as e:
+        raise VendorStructureError(
+            f"Could not parse {data_ts}: {e}. Vendor structure may have changed."
+        ) from e
+
+
+def iter_metadata(
+    base_dir: Path = VENDOR_DIR / "svgl",
+    cache: Optional[FileCache] = None,
+    log: Log = None,
+) -> Iterator[SvglRecord]:
+    """
+    Yield one record per SVGL asset, with its svgs.ts entry (or None) as `meta`
+    (see utils/vendors.py).
+    """
+    target_dir = require_dir(base_dir / "static" / "library")
+    own_cache = cache is None
+    if own_cache:
+        cache = load_file_cache("svgl")
 
-    if not target_dir.exists():
-        click.echo(
-            f"PANIC: Required directory {target_dir} does not exist. Vendor structure may have changed.",
-            err=True,
-        )
-        sys.exit(1)
-
-    out.mkdir(parents=True, exist_ok=True)
-
-    data_records = _parse_svgs_ts(data_ts)
-    record_by_asset_path, properties_by_asset_path = _build_asset_maps(data_records)
+    record_by_asset_path, properties_by_asset_path = _build_asset_maps(
+        load_data(base_dir, cache)
+    )
 
     svg_files = list(target_dir.glob("*.svg"))
 
-    click.echo(f"Found {len(svg_files)} SVG files in {target_dir}")
+    if log:
+        log(f"Found {len(svg_files)} SVG files in {target_dir}")
 
-    records = []
     for svg_file in svg_files:
         # svgs.ts uses "/library/<file>.svg" while files live at "static/library/<file>.svg"
         asset_key = f"library/{svg_file.name}"
         matched = record_by_asset_path.get(asset_key)
-        svg_meta = parse_svg_basic(svg_file)
+        svg_meta = cache.get(svg_file, "svg", parse_svg_basic, from_bytes=True)
         props = properties_by_asset_path.get(asset_key)
         if not props:
             theme, kind = _infer_theme_kind(svg_file.stem)
@@ -151,26 +162,46 @@ def process(out: Path):
             theme = props.get("theme", "light")
             kind = props.get("kind", "symbol")
         dist_rel = Path("src") / svg_file.name
-        records.append(
-            {
-                "file": svg_file.name,
-                "path": str(svg_file.relative_to(base_dir)),
-                "dist_path": str(dist_rel),
-                "theme": theme,
-                "kind": kind,
-                "properties": props,
-                "svg": svg_meta,
-                "meta": matched,
-            }
-        )
+        yield {
+            "file": svg_file.name,
+            "path": str(svg_file.relative_to(base_dir)),
+            "dist_path": str(dist_rel),
+            "theme": theme,
+            "kind": kind,
+            "properties": props,
+            "svg": svg_meta,
+            "meta": matched,
+        }
+
+    if own_cache:
+        cache.save()
 
-    # Write detailed records keyed by file
-    out_file = out / "metadata.json"
-    out_file.write_text(json.dumps(records, indent=2))
+
+@click.command()
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path(".cache/svgl"),
+    help="Output directory for vendor-native metadata.",
+)
+@format_option
+def process(out: Path, fmt: str = "json"):
+    """
+    Process SVGL and emit vendor-native metadata.
+    """
+    click.echo("Processing SVGL...")
+    cache = load_file_cache("svgl")
+    try:
+        records = write_records(
+            iter_metadata(cache=cache, log=click.echo), out, "metadata", fmt
+        )
+        data_records = load_data(cache=cache)
+    except VendorStructureError as e:
+        panic(e)
+    cache.save()
 
     # Also write the raw parsed data array (vendor-native)
-    data_file = out / "data.json"
-    data_file.write_text(json.dumps(data_records, indent=2))
+    data_file = write_records(data_records, out, "data", fmt)
 
-    click.echo(f"Wrote {len(records)} records to {out_file}")
-    click.echo(f"Wrote parsed svgs.ts data to {data_file}")
+    click.echo(f"Wrote {records.count} records to {records.final_path}")
+    click.echo(f"Wrote parsed svgs.ts data to {data_file.final_path}")